@@ -0,0 +1,391 @@
+import datetime
+import math
+import random
+import threading
+import time
+from collections import Counter, defaultdict
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+
+import boto3
+from botocore import xform_name
+from botocore.awsrequest import AWSResponse
+from botocore.exceptions import ClientError
+
+# 시뮬레이션에 사용할 리전 이름 (요청한 리전 수가 더 많으면 가상 이름을 만듦)
+KNOWN_REGIONS = [
+    'us-east-1', 'us-east-2', 'us-west-1', 'us-west-2', 'ap-northeast-1', 'ap-northeast-2', 'ap-northeast-3',
+    'ap-southeast-1', 'ap-southeast-2', 'ap-south-1', 'ca-central-1', 'eu-central-1', 'eu-west-1', 'eu-west-2',
+    'eu-west-3', 'eu-north-1', 'sa-east-1',
+]
+SIMULATED_TYPES = ('eips', 'enis', 'volumes', 'snapshots', 'nat_gateways', 'load_balancers', 'security_groups')
+
+# describe_* Filters 이름 → 항목 값
+FILTER_FIELDS: Dict[str, Callable[[Dict[str, Any]], Any]] = {
+    'status': lambda item: item.get('Status', item.get('State')),
+    'state': lambda item: item.get('State'),
+    'domain': lambda item: item.get('Domain'),
+    'requester-managed': lambda item: str(item.get('RequesterManaged', False)).lower(),
+    'opt-in-status': lambda item: item.get('OptInStatus'),
+    'network-interface-id': lambda item: item.get('NetworkInterfaceId'),
+    'allocation-id': lambda item: item.get('AllocationId'),
+    'volume-id': lambda item: item.get('VolumeId'),
+    'snapshot-id': lambda item: item.get('SnapshotId'),
+    'nat-gateway-id': lambda item: item.get('NatGatewayId'),
+    'group-id': lambda item: item.get('GroupId'),
+    'route.nat-gateway-id': lambda item: [route.get('NatGatewayId') for route in item.get('Routes', [])],
+}
+
+# 페이지네이션 API: 결과 키, 입력 크기·토큰 파라미터, 출력 토큰 키
+PAGINATED = {
+    'describe_network_interfaces': ('NetworkInterfaces', 'MaxResults', 'NextToken', 'NextToken'),
+    'describe_volumes': ('Volumes', 'MaxResults', 'NextToken', 'NextToken'),
+    'describe_snapshots': ('Snapshots', 'MaxResults', 'NextToken', 'NextToken'),
+    'describe_nat_gateways': ('NatGateways', 'MaxResults', 'NextToken', 'NextToken'),
+    'describe_route_tables': ('RouteTables', 'MaxResults', 'NextToken', 'NextToken'),
+    'describe_security_groups': ('SecurityGroups', 'MaxResults', 'NextToken', 'NextToken'),
+    'describe_launch_templates': ('LaunchTemplates', 'MaxResults', 'NextToken', 'NextToken'),
+    'describe_launch_template_versions': ('LaunchTemplateVersions', 'MaxResults', 'NextToken', 'NextToken'),
+    'describe_launch_configurations': ('LaunchConfigurations', 'MaxRecords', 'NextToken', 'NextToken'),
+    'describe_load_balancers': ('LoadBalancers', 'PageSize', 'Marker', 'NextMarker'),
+    'describe_listeners': ('Listeners', 'PageSize', 'Marker', 'NextMarker'),
+    'describe_target_groups': ('TargetGroups', 'PageSize', 'Marker', 'NextMarker'),
+}
+
+# 삭제 API → (리소스 타입, ID 파라미터, 없을 때 오류 코드)
+DELETES = {
+    'delete_network_interface': ('enis', 'NetworkInterfaceId', 'InvalidNetworkInterfaceID.NotFound'),
+    'release_address': ('eips', 'AllocationId', 'InvalidAllocationID.NotFound'),
+    'delete_volume': ('volumes', 'VolumeId', 'InvalidVolume.NotFound'),
+    'delete_snapshot': ('snapshots', 'SnapshotId', 'InvalidSnapshot.NotFound'),
+    'delete_nat_gateway': ('nat_gateways', 'NatGatewayId', 'NatGatewayNotFound'),
+    'delete_security_group': ('security_groups', 'GroupId', 'InvalidGroup.NotFound'),
+    'delete_load_balancer': ('load_balancers', 'LoadBalancerArn', 'LoadBalancerNotFound'),
+}
+
+
+def percentile(values: List[float], pct: float) -> float:
+    """정렬되지 않은 값 목록의 백분위수 (최근접 순위 방식). 비어 있으면 0."""
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    return ordered[max(1, math.ceil(pct / 100 * len(ordered))) - 1]
+
+
+class SimulatedAWS:
+    """
+    실제 계정 없이 탐지·삭제 경로를 돌려 보기 위한 메모리 내 EC2/ELBv2 백엔드.
+
+    boto3 클라이언트는 그대로 만들고 botocore 의 before-call 이벤트에서 HTTP 요청 대신
+    메모리 상태로 응답하므로(botocore Stubber 와 같은 방식) 파라미터 검증, 페이지네이터,
+    util.throttle 의 재시도·토큰 버킷은 실제와 같은 코드로 실행됩니다.
+
+    Args:
+        regions: 리전 수
+        per_region: 리전·리소스 타입별 리소스 수
+        types: 만들 리소스 타입
+        used_ratio: 사용 중인(탐지되지 않아야 하는) 리소스 비율
+        protected_ratio: 보호 규칙(keep=true 태그, Lambda ENI)에 걸리는 미사용 리소스 비율
+        latency_ms / jitter_ms: API 호출당 지연 시간과 편차(밀리초)
+        throttle_rate: 호출이 RequestLimitExceeded 로 실패할 확률 (0 ~ 1)
+        max_page_size: 페이지 크기 상한 (요청한 MaxResults 와 중 작은 값을 사용)
+        seed: 난수 시드
+    """
+
+    def __init__(self, regions: int = 4, per_region: int = 200, types: Iterable[str] = ('eips', 'enis'),
+                 used_ratio: float = 0.5, protected_ratio: float = 0.05,
+                 latency_ms: float = 20.0, jitter_ms: float = 5.0, throttle_rate: float = 0.0,
+                 max_page_size: int = 1000, seed: int = 0):
+        self.region_names = (KNOWN_REGIONS + [f"sim-region-{i}" for i in range(max(0, regions - len(KNOWN_REGIONS)))])[:regions]
+        self.types = [resource_type for resource_type in types if resource_type in SIMULATED_TYPES]
+        self.latency = latency_ms / 1000
+        self.jitter = jitter_ms / 1000
+        self.throttle_rate = throttle_rate
+        self.max_page_size = max_page_size
+        self._random = random.Random(seed)
+        self._lock = threading.Lock()
+
+        self.calls: Counter = Counter()        # (서비스, API) → 호출 수
+        self.throttles: Counter = Counter()    # (서비스, API) → 스로틀링 수
+        self.latencies: Dict[Tuple[str, str], List[float]] = defaultdict(list)  # (서비스, API) → 응답 시간(초)
+
+        # 리전 → 리소스 타입 → {ID: 항목}
+        self.state: Dict[str, Dict[str, Dict[str, Dict[str, Any]]]] = {}
+        self.unused: Counter = Counter()       # 리소스 타입 → 탐지되어야 하는 리소스 수
+        for index, region in enumerate(self.region_names):
+            self.state[region] = self._populate(index, region, per_region, used_ratio, protected_ratio)
+
+        self.session = boto3.session.Session(
+            aws_access_key_id='bench', aws_secret_access_key='bench', region_name='us-east-1'
+        )
+        self.session.events.register('before-parameter-build', self._capture_params)
+        self.session.events.register('before-call', self._handle)
+
+    # --- 상태 생성 ---------------------------------------------------------
+
+    def _populate(self, index: int, region: str, count: int, used_ratio: float,
+                  protected_ratio: float) -> Dict[str, Dict[str, Dict[str, Any]]]:
+        now = datetime.datetime.now(datetime.timezone.utc)
+        old = now - datetime.timedelta(days=200)
+        vpc_id = f"vpc-{index:08x}"
+        subnet_id = f"subnet-{index:08x}"
+        state: Dict[str, Dict[str, Dict[str, Any]]] = {name: {} for name in SIMULATED_TYPES}
+        state['images'] = {}
+        state['route_tables'] = {}
+        state['target_groups'] = {}
+        state['launch_templates'] = {}
+        state['launch_configurations'] = {}
+        state['security_groups'][f"sg-{index:04x}default"] = {
+            'GroupId': f"sg-{index:04x}default", 'GroupName': 'default', 'VpcId': vpc_id, 'Description': 'default',
+            'IpPermissions': [], 'IpPermissionsEgress': []
+        }
+
+        for resource_type in self.types:
+            for i in range(count):
+                used = i < count * used_ratio
+                protected = not used and self._random.random() < protected_ratio
+                suffix = f"{index:04x}{i:08x}"
+                tags = [{'Key': 'keep', 'Value': 'true'}] if protected else [{'Key': 'Name', 'Value': f"bench-{i}"}]
+                if not used and not protected:
+                    self.unused[resource_type] += 1
+
+                if resource_type == 'enis':
+                    state['enis'][f"eni-{suffix}"] = {
+                        'NetworkInterfaceId': f"eni-{suffix}", 'Status': 'in-use' if used else 'available',
+                        'Description': f"bench eni {i}", 'RequesterManaged': False,
+                        'InterfaceType': 'interface', 'TagSet': tags, 'SubnetId': subnet_id, 'VpcId': vpc_id,
+                        'Groups': []
+                    }
+                elif resource_type == 'eips':
+                    address = {
+                        'AllocationId': f"eipalloc-{suffix}", 'PublicIp': f"198.51.{index % 256}.{i % 256}",
+                        'Domain': 'vpc', 'Tags': tags
+                    }
+                    if used:
+                        address['NetworkInterfaceId'] = f"eni-used{suffix}"
+                    state['eips'][address['AllocationId']] = address
+                elif resource_type == 'volumes':
+                    state['volumes'][f"vol-{suffix}"] = {
+                        'VolumeId': f"vol-{suffix}", 'Size': 8 + i % 100, 'State': 'in-use' if used else 'available',
+                        'CreateTime': old, 'Tags': tags,
+                        'Attachments': [{'AttachTime': old, 'InstanceId': f"i-{suffix}"}] if used else []
+                    }
+                elif resource_type == 'snapshots':
+                    state['snapshots'][f"snap-{suffix}"] = {
+                        'SnapshotId': f"snap-{suffix}", 'VolumeSize': 8 + i % 100, 'State': 'completed',
+                        'StartTime': old, 'Description': f"bench snapshot {i}", 'Tags': tags
+                    }
+                    if used:
+                        state['images'][f"ami-{suffix}"] = {
+                            'ImageId': f"ami-{suffix}",
+                            'BlockDeviceMappings': [{'Ebs': {'SnapshotId': f"snap-{suffix}"}}]
+                        }
+                elif resource_type == 'nat_gateways':
+                    state['nat_gateways'][f"nat-{suffix}"] = {
+                        'NatGatewayId': f"nat-{suffix}", 'State': 'available', 'SubnetId': subnet_id, 'VpcId': vpc_id,
+                        'CreateTime': old, 'Tags': tags,
+                        'NatGatewayAddresses': [{'PublicIp': f"203.0.{index % 256}.{i % 256}"}]
+                    }
+                    if used:
+                        state['route_tables'][f"rtb-{suffix}"] = {
+                            'RouteTableId': f"rtb-{suffix}", 'Routes': [{'NatGatewayId': f"nat-{suffix}"}]
+                        }
+                elif resource_type == 'security_groups':
+                    state['security_groups'][f"sg-{suffix}"] = {
+                        'GroupId': f"sg-{suffix}", 'GroupName': f"bench-{i}", 'VpcId': vpc_id,
+                        'Description': f"bench group {i}", 'Tags': tags,
+                        'IpPermissions': [], 'IpPermissionsEgress': []
+                    }
+                    if used and i % 3 == 0:
+                        # 기본 보안 그룹의 규칙이 참조하는 그룹은 사용 중
+                        state['security_groups'][f"sg-{index:04x}default"]['IpPermissions'].append(
+                            {'IpProtocol': '-1', 'UserIdGroupPairs': [{'GroupId': f"sg-{suffix}"}]}
+                        )
+                    elif used and i % 3 == 1:
+                        # 시작 템플릿이 참조하는 그룹도 사용 중
+                        state['launch_templates'][f"lt-{suffix}"] = {
+                            'LaunchTemplateId': f"lt-{suffix}", 'LaunchTemplateName': f"bench-{i}",
+                            'Versions': [{'LaunchTemplateData': {'SecurityGroupIds': [f"sg-{suffix}"]}}]
+                        }
+                    elif used:
+                        # 시작 구성은 이름으로도 참조할 수 있음
+                        state['launch_configurations'][f"bench-{i}"] = {
+                            'LaunchConfigurationName': f"bench-{i}", 'SecurityGroups': [f"bench-{i}"]
+                        }
+                elif resource_type == 'load_balancers':
+                    arn = f"arn:aws:elasticloadbalancing:{region}:000000000000:loadbalancer/app/bench-{i}/{suffix}"
+                    state['load_balancers'][arn] = {
+                        'LoadBalancerArn': arn, 'LoadBalancerName': f"bench-{i}", 'State': {'Code': 'active'},
+                        'Type': 'application', 'CreatedTime': old, 'DNSName': f"bench-{i}.{region}.elb.example",
+                        'VpcId': vpc_id, 'AvailabilityZones': [{'ZoneName': f"{region}a", 'SubnetId': subnet_id}],
+                        'Tags': tags
+                    }
+                    state['target_groups'][f"{arn}/tg"] = {
+                        'TargetGroupArn': f"{arn}/tg", 'LoadBalancerArns': [arn],
+                        'Targets': [{'Target': {'Id': f"i-{suffix}"}}] if used else []
+                    }
+
+        # 보호 규칙이 서버 측 필터로 제외해야 하는 관리형 ENI
+        if 'enis' in self.types:
+            for i in range(max(1, int(count * protected_ratio))):
+                eni_id = f"eni-{index:04x}lambda{i:04x}"
+                state['enis'][eni_id] = {
+                    'NetworkInterfaceId': eni_id, 'Status': 'available', 'Description': 'AWS Lambda VPC ENI',
+                    'RequesterManaged': True, 'InterfaceType': 'lambda', 'TagSet': [],
+                    'SubnetId': subnet_id, 'VpcId': vpc_id, 'Groups': []
+                }
+        return state
+
+    # --- botocore 이벤트 처리 ------------------------------------------------
+
+    @staticmethod
+    def _capture_params(params, context, **kwargs):
+        # before-call 에서는 직렬화된 요청만 보이므로 원래 파라미터를 context 에 보관
+        context['bench_params'] = dict(params)
+
+    def _handle(self, model, context, **kwargs):
+        service = model.service_model.service_name
+        operation = xform_name(model.name)
+        params = context.get('bench_params', {})
+        region = context.get('client_region') or 'us-east-1'
+        started = time.perf_counter()
+
+        delay = max(0.0, self.latency + self._random.uniform(-self.jitter, self.jitter))
+        if delay:
+            time.sleep(delay)
+        with self._lock:
+            self.calls[(service, operation)] += 1
+            throttled = self.throttle_rate and self._random.random() < self.throttle_rate
+            if throttled:
+                self.throttles[(service, operation)] += 1
+        try:
+            if throttled:
+                raise ClientError(
+                    {'Error': {'Code': 'RequestLimitExceeded', 'Message': 'Request limit exceeded.'}}, model.name
+                )
+            response = self._respond(region, operation, params)
+        finally:
+            elapsed = time.perf_counter() - started
+            with self._lock:
+                self.latencies[(service, operation)].append(elapsed)
+        response.setdefault('ResponseMetadata', {'HTTPStatusCode': 200, 'RequestId': 'bench'})
+        return AWSResponse(None, 200, {}, None), response
+
+    def _respond(self, region: str, operation: str, params: Dict[str, Any]) -> Dict[str, Any]:
+        if operation == 'describe_regions':
+            return {'Regions': [{'RegionName': name, 'OptInStatus': 'opt-in-not-required'} for name in self.region_names]}
+
+        state = self.state.get(region)
+        if state is None:
+            raise ClientError({'Error': {'Code': 'UnauthorizedOperation', 'Message': f"unknown region {region}"}}, operation)
+
+        if operation in DELETES:
+            resource_type, id_param, not_found = DELETES[operation]
+            with self._lock:
+                if state[resource_type].pop(params[id_param], None) is None:
+                    raise ClientError({'Error': {'Code': not_found, 'Message': params[id_param]}}, operation)
+            return {}
+
+        with self._lock:
+            if operation == 'describe_network_interfaces':
+                items = list(state['enis'].values())
+            elif operation == 'describe_addresses':
+                return {'Addresses': self._filter(state['eips'].values(), params)}
+            elif operation == 'describe_volumes':
+                items = list(state['volumes'].values())
+            elif operation == 'describe_snapshots':
+                items = list(state['snapshots'].values())
+            elif operation == 'describe_images':
+                return {'Images': list(state['images'].values())}
+            elif operation == 'describe_nat_gateways':
+                items = list(state['nat_gateways'].values())
+            elif operation == 'describe_route_tables':
+                items = list(state['route_tables'].values())
+            elif operation == 'describe_security_groups':
+                items = list(state['security_groups'].values())
+            elif operation == 'describe_launch_templates':
+                items = [
+                    {key: value for key, value in template.items() if key != 'Versions'}
+                    for template in state['launch_templates'].values()
+                ]
+            elif operation == 'describe_launch_template_versions':
+                items = state['launch_templates'][params['LaunchTemplateId']]['Versions']
+            elif operation == 'describe_launch_configurations':
+                items = list(state['launch_configurations'].values())
+            elif operation == 'describe_load_balancers':
+                arns = params.get('LoadBalancerArns')
+                if arns and any(arn not in state['load_balancers'] for arn in arns):
+                    raise ClientError({'Error': {'Code': 'LoadBalancerNotFound', 'Message': str(arns)}}, operation)
+                items = [state['load_balancers'][arn] for arn in arns] if arns else list(state['load_balancers'].values())
+                items = [{key: value for key, value in item.items() if key != 'Tags'} for item in items]
+            elif operation == 'describe_listeners':
+                items = []
+            elif operation == 'describe_target_groups':
+                arn = params.get('LoadBalancerArn')
+                groups = [group for group in state['target_groups'].values() if arn in group['LoadBalancerArns']]
+                if not groups:
+                    raise ClientError({'Error': {'Code': 'TargetGroupNotFound', 'Message': arn}}, operation)
+                items = [{'TargetGroupArn': group['TargetGroupArn']} for group in groups]
+            elif operation == 'describe_target_health':
+                group = state['target_groups'].get(params['TargetGroupArn'], {})
+                return {'TargetHealthDescriptions': group.get('Targets', [])}
+            elif operation == 'describe_tags':
+                return {'TagDescriptions': [
+                    {'ResourceArn': arn, 'Tags': state['load_balancers'][arn].get('Tags', [])}
+                    for arn in params['ResourceArns'] if arn in state['load_balancers']
+                ]}
+            else:
+                raise NotImplementedError(f"시뮬레이션하지 않는 API: {operation}")
+
+        items = self._filter(items, params)
+        return self._page(operation, items, params)
+
+    @staticmethod
+    def _filter(items: Iterable[Dict[str, Any]], params: Dict[str, Any]) -> List[Dict[str, Any]]:
+        filters = params.get('Filters') or params.get('Filter') or []
+        result = []
+        for item in items:
+            for item_filter in filters:
+                if item_filter['Name'] not in FILTER_FIELDS:
+                    raise NotImplementedError(f"시뮬레이션하지 않는 필터: {item_filter['Name']}")
+                value = FILTER_FIELDS[item_filter['Name']](item)
+                values = value if isinstance(value, list) else [value]
+                if not any(value in item_filter['Values'] for value in values):
+                    break
+            else:
+                result.append(item)
+        return result
+
+    def _page(self, operation: str, items: List[Dict[str, Any]], params: Dict[str, Any]) -> Dict[str, Any]:
+        result_key, size_param, token_param, next_key = PAGINATED[operation]
+        size = min(self.max_page_size, params.get(size_param) or self.max_page_size)
+        start = int(params.get(token_param) or 0)
+        response: Dict[str, Any] = {result_key: items[start:start + size]}
+        if start + size < len(items):
+            response[next_key] = str(start + size)
+        return response
+
+    # --- 결과 ---------------------------------------------------------------
+
+    def remaining(self, resource_type: str) -> int:
+        """남아 있는 리소스 수 (모든 리전 합계)."""
+        return sum(len(state[resource_type]) for state in self.state.values())
+
+    def reset_counters(self) -> None:
+        with self._lock:
+            self.calls.clear()
+            self.throttles.clear()
+            self.latencies.clear()
+
+    def call_stats(self) -> Dict[str, Dict[str, Any]]:
+        """API 별 호출 수, 스로틀링 수, 응답 시간 백분위수(밀리초)."""
+        with self._lock:
+            return {
+                f"{service}.{operation}": {
+                    'calls': self.calls[(service, operation)],
+                    'throttled': self.throttles[(service, operation)],
+                    'p50_ms': round(percentile(latencies, 50) * 1000, 2),
+                    'p95_ms': round(percentile(latencies, 95) * 1000, 2),
+                    'p99_ms': round(percentile(latencies, 99) * 1000, 2),
+                }
+                for (service, operation), latencies in sorted(self.latencies.items())
+            }
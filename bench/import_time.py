@@ -0,0 +1,187 @@
+"""
+콜드 스타트 벤치마크: 새 프로세스에서 lambda_function 을 import 하는 시간과
+슬래시 커맨드·삭제 버튼 클릭에 응답하기까지의 시간(import 포함)을 잽니다.
+
+    python bench/import_time.py
+    python bench/import_time.py --repeat 10 --top 20 --max-ack-ms 1500   # 넘으면 종료 코드 1
+
+Lambda 자기 호출(invoke)은 botocore before-call 이벤트로 가로채 네트워크 없이 202 를 반환하므로,
+측정값에는 import, boto3 세션·클라이언트 생성, 이벤트 파싱, 응답 생성만 포함됩니다.
+import lambda_function 직후 무거운 모듈(boto3, 탐지·삭제 엔진)이 로드되어 있으면 종료 코드 1 을 반환합니다.
+"""
+import argparse
+import json
+import os
+import subprocess
+import sys
+import urllib.parse
+from typing import Any, Dict, List, Tuple
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, REPO_ROOT)
+
+# import lambda_function 만으로는 로드되면 안 되는 모듈
+LAZY_MODULES = ('boto3', 'botocore', 'handler.detect_handler', 'handler.delete_handler', 'util.resource_types')
+
+# 자식 프로세스에서 실행: import 후 이벤트 하나를 처리하고 측정값을 JSON 으로 출력
+CHILD_SCRIPT = r'''
+import json, sys, time
+started = time.perf_counter()
+import lambda_function
+imported = time.perf_counter()
+loaded = [name for name in LAZY_MODULES if name in sys.modules]
+
+import util.aws
+_get_session = util.aws.get_session
+def _get_stubbed_session():
+    session = _get_session()
+    if not getattr(session, '_bench_stubbed', False):
+        from botocore.awsrequest import AWSResponse
+        session.events.register(
+            'before-call.lambda.Invoke',
+            lambda **kwargs: (AWSResponse(None, 202, {}, None), {'StatusCode': 202})
+        )
+        session._bench_stubbed = True
+    return session
+util.aws.get_session = _get_stubbed_session
+
+response = lambda_function.lambda_handler(json.loads(sys.argv[1]), None)
+finished = time.perf_counter()
+print(json.dumps({
+    'import_ms': (imported - started) * 1000,
+    'ack_ms': (finished - started) * 1000,
+    'status': response.get('statusCode'),
+    'loaded_after_import': loaded,
+}))
+'''
+
+
+def parse_args(argv=None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="lambda_function 콜드 스타트 import·응답 시간 벤치마크")
+    parser.add_argument('--repeat', type=int, default=5, help="이벤트별 반복 횟수 (매번 새 프로세스)")
+    parser.add_argument('--top', type=int, default=15, help="import 시간이 긴 모듈을 몇 개까지 표시할지")
+    parser.add_argument('--max-import-ms', type=float, help="import lambda_function p50 상한 (넘으면 종료 코드 1)")
+    parser.add_argument('--max-ack-ms', type=float, help="응답 시간 p50 상한 (넘으면 종료 코드 1)")
+    parser.add_argument('--json', dest='json_path', help="결과를 JSON 파일로 저장")
+    return parser.parse_args(argv)
+
+
+def child_env() -> Dict[str, str]:
+    env = dict(os.environ)
+    env.update({
+        'PYTHONPATH': REPO_ROOT,
+        'AWS_DEFAULT_REGION': env.get('AWS_DEFAULT_REGION', 'us-east-1'),
+        'AWS_ACCESS_KEY_ID': 'bench',
+        'AWS_SECRET_ACCESS_KEY': 'bench',
+        'AWS_LAMBDA_FUNCTION_NAME': 'bench',
+        'LOG_LEVEL': 'WARNING',
+        'METRICS_ENABLED': 'false',
+        'PYTHONDONTWRITEBYTECODE': '1',
+    })
+    return env
+
+
+def sample_events() -> Dict[str, Dict[str, Any]]:
+    """Slack 이 API Gateway 로 보내는 것과 같은 형식의 슬래시 커맨드·버튼 클릭 이벤트."""
+    headers = {'content-type': 'application/x-www-form-urlencoded'}
+    command = urllib.parse.urlencode({
+        'command': '/cleanup-unattach', 'response_url': 'https://hooks.slack.com/commands/T0/1/x', 'channel_id': 'C0'
+    })
+    button = urllib.parse.urlencode({'payload': json.dumps({
+        'type': 'block_actions',
+        'response_url': 'https://hooks.slack.com/actions/T0/1/x',
+        'channel': {'id': 'C0'},
+        'actions': [{'action_id': 'delete', 'value': json.dumps({'scan_id': 'bench'})}],
+    })})
+    return {
+        'slash_command': {'body': command, 'headers': headers},
+        'delete_button': {'body': button, 'headers': headers},
+    }
+
+
+def run_child(event: Dict[str, Any]) -> Dict[str, Any]:
+    script = f"LAZY_MODULES = {LAZY_MODULES!r}\n{CHILD_SCRIPT}"
+    completed = subprocess.run(
+        [sys.executable, '-c', script, json.dumps(event)],
+        cwd=REPO_ROOT, env=child_env(), capture_output=True, text=True, check=True
+    )
+    return json.loads(completed.stdout.strip().splitlines()[-1])
+
+
+def import_profile() -> List[Tuple[str, int, int]]:
+    """
+    python -X importtime 결과 중 lambda_function 과 그 하위 import 를
+    (모듈, 자체 시간 us, 누적 시간 us) 목록으로 반환합니다 (인터프리터 시작 시 import 는 제외).
+    """
+    completed = subprocess.run(
+        [sys.executable, '-X', 'importtime', '-c', 'import lambda_function'],
+        cwd=REPO_ROOT, env=child_env(), capture_output=True, text=True, check=True
+    )
+    entries = []
+    for line in completed.stderr.splitlines():
+        if not line.startswith('import time:') or 'self [us]' in line:
+            continue
+        self_us, cumulative_us, raw_name = line[len('import time:'):].split('|')
+        # 하위 import 는 부모보다 먼저, 깊이만큼 들여쓰기되어 출력됨
+        depth = (len(raw_name) - len(raw_name.lstrip()) - 1) // 2
+        entries.append((raw_name.strip(), int(self_us), int(cumulative_us), depth))
+
+    top = next(i for i, entry in enumerate(entries) if entry[0] == 'lambda_function' and entry[3] == 0)
+    start = top
+    while start > 0 and entries[start - 1][3] > 0:
+        start -= 1
+    return [(name, self_us, cumulative_us) for name, self_us, cumulative_us, _ in entries[start:top + 1]]
+
+
+def main(argv=None) -> int:
+    from bench.aws_stub import percentile
+
+    args = parse_args(argv)
+    summary: Dict[str, Any] = {'events': {}}
+    loaded = set()
+    for name, event in sample_events().items():
+        runs = [run_child(event) for _ in range(max(1, args.repeat))]
+        for run in runs:
+            loaded.update(run['loaded_after_import'])
+        summary['events'][name] = {
+            'import_p50_ms': round(percentile([run['import_ms'] for run in runs], 50), 1),
+            'ack_p50_ms': round(percentile([run['ack_ms'] for run in runs], 50), 1),
+            'ack_p95_ms': round(percentile([run['ack_ms'] for run in runs], 95), 1),
+            'status': runs[-1]['status'],
+        }
+    profile = import_profile()
+    summary['loaded_after_import'] = sorted(loaded)
+    summary['top_imports'] = [
+        {'module': module, 'self_ms': round(self_us / 1000, 1), 'cumulative_ms': round(cumulative_us / 1000, 1)}
+        for module, self_us, cumulative_us in sorted(profile, key=lambda item: -item[2])[:args.top]
+    ]
+
+    print(f"=== 콜드 스타트 (반복 {args.repeat}회, 매번 새 프로세스) ===")
+    print(f"{'이벤트':<16}{'import p50':>12}{'응답 p50':>12}{'응답 p95':>12}{'상태':>6}")
+    for name, stats in summary['events'].items():
+        print(f"{name:<16}{stats['import_p50_ms']:>10.1f}ms{stats['ack_p50_ms']:>10.1f}ms"
+              f"{stats['ack_p95_ms']:>10.1f}ms{stats['status']:>6}")
+    print(f"\nimport lambda_function 이 누적 시간 기준으로 오래 걸린 모듈 (상위 {args.top}개)")
+    for item in summary['top_imports']:
+        print(f"  {item['cumulative_ms']:>8.1f}ms  (자체 {item['self_ms']:>6.1f}ms)  {item['module']}")
+
+    if args.json_path:
+        with open(args.json_path, 'w', encoding='utf-8') as f:
+            json.dump(summary, f, ensure_ascii=False, indent=2)
+
+    failures = []
+    if loaded:
+        failures.append(f"import lambda_function 만으로 로드된 모듈: {', '.join(sorted(loaded))}")
+    for name, stats in summary['events'].items():
+        if args.max_import_ms is not None and stats['import_p50_ms'] > args.max_import_ms:
+            failures.append(f"{name} import p50 {stats['import_p50_ms']}ms > {args.max_import_ms}ms")
+        if args.max_ack_ms is not None and stats['ack_p50_ms'] > args.max_ack_ms:
+            failures.append(f"{name} 응답 p50 {stats['ack_p50_ms']}ms > {args.max_ack_ms}ms")
+    if failures:
+        print("\n⚠️ " + "\n⚠️ ".join(failures))
+        return 1
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,240 @@
+"""
+오프라인 벤치마크: 시뮬레이션한 멀티 리전 EC2 백엔드와 로컬 Slack 싱크로
+탐지(find_unused_resources) → Slack 블록 생성 → 전송 → 삭제(delete_resources) 를 실행하고
+단계별 소요 시간, API 호출 수, 스로틀링 수, 메모리 사용량을 보고합니다.
+
+    python bench/run_bench.py --regions 8 --per-region 500 --types eips,enis --latency-ms 30
+    python bench/run_bench.py --repeat 5 --json /tmp/bench.json
+    python bench/run_bench.py --baseline /tmp/bench.json --tolerance 0.2   # 느려지면 종료 코드 1
+"""
+import argparse
+import json
+import os
+import resource
+import sys
+import time
+import tracemalloc
+from typing import Any, Dict, List
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+PHASES = ('scan', 'render', 'deliver', 'delete')
+
+
+def parse_args(argv=None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="미사용 리소스 탐지·삭제 오프라인 벤치마크")
+    parser.add_argument('--regions', type=int, default=4, help="리전 수")
+    parser.add_argument('--per-region', type=int, default=200, help="리전·리소스 타입별 리소스 수")
+    parser.add_argument('--types', default='eips,enis', help="리소스 타입 (쉼표 구분, 'all' 이면 전체)")
+    parser.add_argument('--used-ratio', type=float, default=0.5, help="사용 중인 리소스 비율")
+    parser.add_argument('--protected-ratio', type=float, default=0.05, help="보호 규칙에 걸리는 리소스 비율")
+    parser.add_argument('--page-size', type=int, default=1000, help="시뮬레이션 백엔드의 최대 페이지 크기")
+    parser.add_argument('--latency-ms', type=float, default=20.0, help="API 호출당 지연 시간(밀리초)")
+    parser.add_argument('--jitter-ms', type=float, default=5.0, help="지연 시간 편차(밀리초)")
+    parser.add_argument('--throttle-rate', type=float, default=0.0, help="RequestLimitExceeded 발생 확률 (0 ~ 1)")
+    parser.add_argument('--slack-latency-ms', type=float, default=0.0, help="Slack 싱크 응답 지연(밀리초)")
+    parser.add_argument('--repeat', type=int, default=3, help="반복 횟수")
+    parser.add_argument('--memory', action='store_true', help="tracemalloc 으로 단계별 최대 할당량 측정 (느려짐)")
+    parser.add_argument('--no-delete', action='store_true', help="삭제 단계를 건너뜀")
+    parser.add_argument('--env', action='append', default=[], metavar='KEY=VALUE', help="추가 환경 변수 (여러 번 지정 가능)")
+    parser.add_argument('--json', dest='json_path', help="결과를 JSON 파일로 저장")
+    parser.add_argument('--baseline', help="비교할 이전 결과 JSON 파일")
+    parser.add_argument('--tolerance', type=float, default=0.2, help="기준 대비 허용 지연 비율 (0.2 = 20%%)")
+    parser.add_argument('--seed', type=int, default=0)
+    return parser.parse_args(argv)
+
+
+def configure_environment(args: argparse.Namespace) -> None:
+    """모듈이 import 시점에 환경 변수를 읽으므로 import 전에 벤치마크용 설정을 적용합니다."""
+    from bench.aws_stub import SIMULATED_TYPES
+    types = ','.join(SIMULATED_TYPES) if args.types == 'all' else args.types
+    args.types = types
+    os.environ.update({
+        'AWS_DEFAULT_REGION': 'us-east-1',
+        'AWS_ACCESS_KEY_ID': 'bench',
+        'AWS_SECRET_ACCESS_KEY': 'bench',
+        'ENABLED_RESOURCE_TYPES': types,
+        'SNAPSHOT_BACKEND': 'none',
+        'RESOURCE_STORE_BACKEND': 'none',
+        'JOURNAL_BACKEND': 'none',
+        'PROGRESSIVE_RESULTS': 'false',
+        'REGION_CACHE_FILE': '',
+        'LOG_LEVEL': 'WARNING',
+        'METRICS_ENABLED': 'false',
+    })
+    for name in ('INCLUDE_REGIONS', 'EXCLUDE_REGIONS', 'TARGET_ROLE_ARNS', 'SLACK_BOT_TOKEN', 'AWS_LAMBDA_FUNCTION_NAME'):
+        os.environ.pop(name, None)
+    for item in args.env:
+        key, _, value = item.partition('=')
+        os.environ[key] = value
+
+
+def install_backend(args: argparse.Namespace):
+    """새 시뮬레이션 백엔드를 만들고 util.aws 가 그 세션으로 클라이언트를 만들도록 합니다."""
+    import util.aws
+    import util.regions
+    import util.throttle
+    from bench.aws_stub import SimulatedAWS
+
+    simulated = SimulatedAWS(
+        regions=args.regions, per_region=args.per_region, types=args.types.split(','),
+        used_ratio=args.used_ratio, protected_ratio=args.protected_ratio,
+        latency_ms=args.latency_ms, jitter_ms=args.jitter_ms, throttle_rate=args.throttle_rate,
+        max_page_size=args.page_size, seed=args.seed
+    )
+    util.aws.clear_clients()
+    util.aws._session = simulated.session
+    # 반복마다 같은 조건에서 시작하도록 토큰 버킷과 리전 캐시를 비움
+    with util.throttle._buckets_lock:
+        util.throttle._buckets.clear()
+    util.regions._cache.clear()
+    return simulated
+
+
+class PhaseTimer:
+    """단계 하나의 소요 시간과 (선택) tracemalloc 최대 할당량을 잽니다."""
+
+    def __init__(self, trace_memory: bool):
+        self.trace_memory = trace_memory
+        self.wall = 0.0
+        self.peak_bytes = 0
+
+    def __enter__(self):
+        if self.trace_memory:
+            tracemalloc.start()
+        self._started = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        self.wall = time.perf_counter() - self._started
+        if self.trace_memory:
+            self.peak_bytes = tracemalloc.get_traced_memory()[1]
+            tracemalloc.stop()
+        return False
+
+
+def run_once(args: argparse.Namespace, sink) -> Dict[str, Any]:
+    from handler.delete_handler import delete_resources
+    from handler.detect_handler import find_unused_resources
+    from util.slack import send_slack_block_messages
+    from util.slack_block import create_resource_detect_messages
+
+    simulated = install_backend(args)
+    sink.reset()
+    run: Dict[str, Any] = {'phases': {}}
+
+    with PhaseTimer(args.memory) as timer:
+        resources = find_unused_resources()
+    found = sum(len(ids) for regions in resources.values() for ids in regions.values())
+    run['phases']['scan'] = {'wall': timer.wall, 'peak_bytes': timer.peak_bytes}
+    run['found'] = found
+    run['expected'] = sum(simulated.unused.values())
+    run['scan_api'] = simulated.call_stats()
+    simulated.reset_counters()
+
+    with PhaseTimer(args.memory) as timer:
+        messages, omitted = create_resource_detect_messages(resources)
+    run['phases']['render'] = {'wall': timer.wall, 'peak_bytes': timer.peak_bytes}
+    run['messages'] = len(messages)
+    run['omitted_blocks'] = omitted
+
+    with PhaseTimer(args.memory) as timer:
+        send_slack_block_messages(sink.url, messages)
+    run['phases']['deliver'] = {'wall': timer.wall, 'peak_bytes': timer.peak_bytes}
+    run['slack_bytes'] = sink.bytes_received
+
+    if not args.no_delete:
+        with PhaseTimer(args.memory) as timer:
+            results = delete_resources(resources, sink.url)
+        run['phases']['delete'] = {'wall': timer.wall, 'peak_bytes': timer.peak_bytes}
+        run['deleted'] = len(results['success'])
+        run['delete_failed'] = len(results['failed'])
+        run['delete_api'] = simulated.call_stats()
+    return run
+
+
+def summarize(runs: List[Dict[str, Any]]) -> Dict[str, Any]:
+    from bench.aws_stub import percentile
+    summary: Dict[str, Any] = {'phases': {}}
+    for phase in PHASES:
+        walls = [run['phases'][phase]['wall'] for run in runs if phase in run['phases']]
+        if not walls:
+            continue
+        summary['phases'][phase] = {
+            'p50_s': round(percentile(walls, 50), 4),
+            'p95_s': round(percentile(walls, 95), 4),
+            'max_s': round(max(walls), 4),
+            'peak_alloc_mb': round(max(run['phases'][phase]['peak_bytes'] for run in runs) / 2 ** 20, 2),
+        }
+    last = runs[-1]
+    for key in ('found', 'expected', 'messages', 'omitted_blocks', 'slack_bytes', 'deleted', 'delete_failed',
+                'scan_api', 'delete_api'):
+        if key in last:
+            summary[key] = last[key]
+    # ru_maxrss 는 Linux 에서 KB 단위
+    summary['peak_rss_mb'] = round(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024, 1)
+    return summary
+
+
+def print_report(args: argparse.Namespace, summary: Dict[str, Any]) -> None:
+    print(f"\n=== 벤치마크: 리전 {args.regions}개 × 타입별 {args.per_region}개 ({args.types}), "
+          f"지연 {args.latency_ms}ms, 스로틀링 {args.throttle_rate:.0%}, 반복 {args.repeat}회 ===")
+    print(f"{'단계':<10}{'p50(s)':>10}{'p95(s)':>10}{'max(s)':>10}{'할당(MB)':>12}")
+    for phase, stats in summary['phases'].items():
+        peak = f"{stats['peak_alloc_mb']:.2f}" if args.memory else "-"
+        print(f"{phase:<10}{stats['p50_s']:>10.3f}{stats['p95_s']:>10.3f}{stats['max_s']:>10.3f}{peak:>12}")
+    print(f"탐지 {summary['found']}개 (기대 {summary['expected']}개), 메시지 {summary['messages']}개 "
+          f"(생략 블록 {summary['omitted_blocks']}개, {summary['slack_bytes']} bytes)")
+    if 'deleted' in summary:
+        print(f"삭제 성공 {summary['deleted']}개, 실패 {summary['delete_failed']}개")
+    print(f"최대 RSS {summary['peak_rss_mb']} MB")
+    for label, key in (('탐지', 'scan_api'), ('삭제', 'delete_api')):
+        if key not in summary:
+            continue
+        print(f"\n[{label} API] {'API':<40}{'호출':>8}{'스로틀':>8}{'p50(ms)':>10}{'p99(ms)':>10}")
+        for name, stats in summary[key].items():
+            print(f"       {name:<40}{stats['calls']:>8}{stats['throttled']:>8}{stats['p50_ms']:>10.1f}{stats['p99_ms']:>10.1f}")
+
+
+def compare_baseline(summary: Dict[str, Any], baseline_path: str, tolerance: float) -> List[str]:
+    """기준 결과보다 p50 이 tolerance 이상 느려진 단계 목록을 반환합니다."""
+    with open(baseline_path, 'r', encoding='utf-8') as f:
+        baseline = json.load(f)['summary']
+    regressions = []
+    for phase, stats in summary['phases'].items():
+        previous = baseline.get('phases', {}).get(phase)
+        if previous and stats['p50_s'] > previous['p50_s'] * (1 + tolerance):
+            regressions.append(f"{phase}: {previous['p50_s']:.3f}s → {stats['p50_s']:.3f}s")
+    return regressions
+
+
+def main(argv=None) -> int:
+    args = parse_args(argv)
+    configure_environment(args)
+    from bench.slack_sink import SlackSink
+
+    sink = SlackSink(latency_ms=args.slack_latency_ms).start()
+    try:
+        runs = [run_once(args, sink) for _ in range(max(1, args.repeat))]
+    finally:
+        sink.stop()
+
+    summary = summarize(runs)
+    print_report(args, summary)
+    if args.json_path:
+        with open(args.json_path, 'w', encoding='utf-8') as f:
+            json.dump({'args': vars(args), 'summary': summary, 'runs': runs}, f, ensure_ascii=False, indent=2)
+
+    if summary['found'] != summary['expected']:
+        print(f"\n⚠️ 탐지 결과({summary['found']})가 기대값({summary['expected']})과 다릅니다.")
+        return 1
+    if args.baseline:
+        regressions = compare_baseline(summary, args.baseline, args.tolerance)
+        if regressions:
+            print("\n⚠️ 기준보다 느려진 단계:\n  " + "\n  ".join(regressions))
+            return 1
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,57 @@
+import http.server
+import json
+import threading
+import time
+from typing import Any, Dict, List
+
+
+class SlackSink:
+    """
+    Slack response_url 을 대신하는 로컬 HTTP 서버.
+    받은 메시지와 크기를 기록하고 항상 200 OK 를 반환합니다.
+    """
+
+    def __init__(self, latency_ms: float = 0.0):
+        self.messages: List[Dict[str, Any]] = []
+        self.bytes_received = 0
+        self.latency = latency_ms / 1000
+        self._lock = threading.Lock()
+        sink = self
+
+        class Handler(http.server.BaseHTTPRequestHandler):
+            protocol_version = 'HTTP/1.1'
+
+            def do_POST(self):
+                body = self.rfile.read(int(self.headers.get('Content-Length', 0)))
+                if sink.latency:
+                    time.sleep(sink.latency)
+                with sink._lock:
+                    sink.messages.append(json.loads(body or b'{}'))
+                    sink.bytes_received += len(body)
+                self.send_response(200)
+                self.send_header('Content-Length', '2')
+                self.end_headers()
+                self.wfile.write(b'ok')
+
+            def log_message(self, *args):
+                pass
+
+        self._server = http.server.ThreadingHTTPServer(('127.0.0.1', 0), Handler)
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+
+    @property
+    def url(self) -> str:
+        return f"http://127.0.0.1:{self._server.server_address[1]}/response"
+
+    def start(self) -> 'SlackSink':
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        self._server.shutdown()
+        self._server.server_close()
+
+    def reset(self) -> None:
+        with self._lock:
+            self.messages.clear()
+            self.bytes_received = 0
@@ -0,0 +1,25 @@
+from util.log import get_logger
+from util.throttle import call_with_retry
+
+log = get_logger('ebs.delete')
+
+def delete_volume(ec2_client, volume_id):
+    """
+    EBS 볼륨을 삭제합니다.
+    스로틀링·일시적 오류는 util.throttle 에서 백오프 후 재시도합니다.
+
+    Args:
+        ec2_client: boto3 EC2 클라이언트
+        volume_id: 삭제할 볼륨의 ID (예: 'vol-12345')
+
+    Raises:
+        Exception: 볼륨 삭제 중 오류가 발생한 경우
+    """
+    try:
+        call_with_retry(ec2_client, 'delete_volume', VolumeId=volume_id)
+        log.debug("✅ EBS 볼륨 %s 삭제 성공", volume_id)
+        return True
+    except Exception as e:
+        log.debug("❌ EBS 볼륨 %s 삭제 실패: %s", volume_id, e)
+        # 예외를 다시 발생시켜 상위 함수에서 처리하도록 함
+        raise
@@ -0,0 +1,60 @@
+from typing import Any, Dict, Iterator, List, Optional
+from util.records import ResourceRecord, describe_records, epoch, tags_from
+from util.throttle import paginate_with_retry
+
+# describe_volumes 의 MaxResults 허용 범위 (5 ~ 500)
+MIN_PAGE_SIZE = 5
+MAX_PAGE_SIZE = 500
+
+def volume_record(volume: Dict[str, Any]) -> ResourceRecord:
+    """describe_volumes 응답 항목에서 레코드를 만듭니다."""
+    attach_times = [attachment['AttachTime'] for attachment in volume.get('Attachments', []) if attachment.get('AttachTime')]
+    return ResourceRecord(
+        id=volume['VolumeId'],
+        created_at=epoch(volume.get('CreateTime')),
+        attached_at=epoch(max(attach_times)) if attach_times else None,
+        tags=tags_from(volume.get('Tags')),
+        size=volume['Size']
+    )
+
+def detect_volumes(ec2_client, page_size: int = MAX_PAGE_SIZE, limit: Optional[int] = None,
+                   records: Optional[Dict[str, ResourceRecord]] = None) -> Iterator[str]:
+    """
+    어떤 인스턴스에도 연결되지 않은(available 상태) EBS 볼륨 ID를 페이지 단위로 스트리밍합니다.
+
+    Args:
+        ec2_client: boto3 EC2 클라이언트
+        page_size: 페이지당 요청할 볼륨 수 (5 ~ 500)
+        limit: 최대 반환 개수 (None이면 전체)
+        records: 주어지면 볼륨 ID별 메타데이터(크기 포함)를 채웁니다
+
+    Yields:
+        미사용 볼륨의 ID (예: 'vol-12345')
+    """
+    if limit is not None and limit <= 0:
+        return
+
+    page_size = max(MIN_PAGE_SIZE, min(MAX_PAGE_SIZE, page_size))
+    pages = paginate_with_retry(
+        ec2_client,
+        'describe_volumes',
+        Filters=[{'Name': 'status', 'Values': ['available']}],
+        PaginationConfig={'PageSize': page_size}
+    )
+
+    count = 0
+    for page in pages:
+        for volume in page.get('Volumes', []):
+            if records is not None:
+                records[volume['VolumeId']] = volume_record(volume)
+            yield volume['VolumeId']
+            count += 1
+            if limit is not None and count >= limit:
+                return
+
+def describe_volumes(ec2_client, volume_ids: List[str]) -> Dict[str, ResourceRecord]:
+    """볼륨을 ID로 다시 조회해 {ID: 레코드} 를 반환합니다. 삭제 중이거나 이미 삭제된 볼륨은 포함되지 않습니다."""
+    return describe_records(
+        ec2_client, 'describe_volumes', 'Volumes', 'volume-id', volume_ids, volume_record,
+        filters=[{'Name': 'status', 'Values': ['creating', 'available', 'in-use', 'error']}]
+    )
@@ -0,0 +1,25 @@
+from util.log import get_logger
+from util.throttle import call_with_retry
+
+log = get_logger('ebs_snapshot.delete')
+
+def delete_snapshot(ec2_client, snapshot_id):
+    """
+    EBS 스냅샷을 삭제합니다.
+    스로틀링·일시적 오류는 util.throttle 에서 백오프 후 재시도합니다.
+
+    Args:
+        ec2_client: boto3 EC2 클라이언트
+        snapshot_id: 삭제할 스냅샷의 ID (예: 'snap-12345')
+
+    Raises:
+        Exception: 스냅샷 삭제 중 오류가 발생한 경우
+    """
+    try:
+        call_with_retry(ec2_client, 'delete_snapshot', SnapshotId=snapshot_id)
+        log.debug("✅ 스냅샷 %s 삭제 성공", snapshot_id)
+        return True
+    except Exception as e:
+        log.debug("❌ 스냅샷 %s 삭제 실패: %s", snapshot_id, e)
+        # 예외를 다시 발생시켜 상위 함수에서 처리하도록 함
+        raise
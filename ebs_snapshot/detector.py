@@ -0,0 +1,83 @@
+import datetime
+import os
+from typing import Any, Dict, Iterator, List, Optional
+from util.records import ResourceRecord, describe_records, epoch, tags_from
+from util.throttle import call_with_retry, paginate_with_retry
+
+# 이 기간(일)보다 오래된 스냅샷을 정리 대상으로 봅니다.
+OLD_SNAPSHOT_DAYS = int(os.environ.get('OLD_SNAPSHOT_DAYS', '90'))
+
+# describe_snapshots 의 MaxResults 허용 범위 (5 ~ 1000)
+MIN_PAGE_SIZE = 5
+MAX_PAGE_SIZE = 1000
+
+def _image_snapshot_ids(ec2_client) -> set:
+    """계정이 소유한 AMI 가 사용 중인 스냅샷 ID 집합 (AMI 를 지우기 전에는 삭제할 수 없음)."""
+    images = call_with_retry(ec2_client, 'describe_images', Owners=['self'])['Images']
+    return {
+        mapping['Ebs']['SnapshotId']
+        for image in images
+        for mapping in image.get('BlockDeviceMappings', [])
+        if mapping.get('Ebs', {}).get('SnapshotId')
+    }
+
+def snapshot_record(snapshot: Dict[str, Any]) -> ResourceRecord:
+    """
+    describe_snapshots 응답 항목에서 레코드를 만듭니다.
+    size 는 원본 볼륨 크기이며, 스냅샷은 변경된 블록만 과금되므로 비용 추정의 상한값입니다.
+    """
+    return ResourceRecord(
+        id=snapshot['SnapshotId'],
+        created_at=epoch(snapshot.get('StartTime')),
+        description=snapshot.get('Description') or None,
+        tags=tags_from(snapshot.get('Tags')),
+        size=snapshot['VolumeSize']
+    )
+
+def detect_old_snapshots(ec2_client, page_size: int = MAX_PAGE_SIZE, limit: Optional[int] = None,
+                         min_age_days: int = OLD_SNAPSHOT_DAYS,
+                         records: Optional[Dict[str, ResourceRecord]] = None) -> Iterator[str]:
+    """
+    계정이 소유한 스냅샷 중 min_age_days 보다 오래되었고 AMI 에서 사용하지 않는 스냅샷 ID를 스트리밍합니다.
+
+    Args:
+        ec2_client: boto3 EC2 클라이언트
+        page_size: 페이지당 요청할 스냅샷 수 (5 ~ 1000)
+        limit: 최대 반환 개수 (None이면 전체)
+        min_age_days: 정리 대상으로 볼 최소 경과 일수
+        records: 주어지면 리소스 ID별 메타데이터(ResourceRecord)를 채웁니다
+
+    Yields:
+        오래된 스냅샷의 ID (예: 'snap-12345')
+    """
+    if limit is not None and limit <= 0:
+        return
+
+    cutoff = datetime.datetime.now(datetime.timezone.utc) - datetime.timedelta(days=min_age_days)
+    in_use = _image_snapshot_ids(ec2_client)
+    page_size = max(MIN_PAGE_SIZE, min(MAX_PAGE_SIZE, page_size))
+    pages = paginate_with_retry(
+        ec2_client,
+        'describe_snapshots',
+        OwnerIds=['self'],
+        Filters=[{'Name': 'status', 'Values': ['completed']}],
+        PaginationConfig={'PageSize': page_size}
+    )
+
+    count = 0
+    for page in pages:
+        for snapshot in page.get('Snapshots', []):
+            if snapshot['StartTime'] >= cutoff or snapshot['SnapshotId'] in in_use:
+                continue
+            if records is not None:
+                records[snapshot['SnapshotId']] = snapshot_record(snapshot)
+            yield snapshot['SnapshotId']
+            count += 1
+            if limit is not None and count >= limit:
+                return
+
+def describe_snapshots(ec2_client, snapshot_ids: List[str]) -> Dict[str, ResourceRecord]:
+    """스냅샷을 ID로 다시 조회해 {ID: 레코드} 를 반환합니다. 이미 삭제된 스냅샷은 포함되지 않습니다."""
+    return describe_records(
+        ec2_client, 'describe_snapshots', 'Snapshots', 'snapshot-id', snapshot_ids, snapshot_record, OwnerIds=['self']
+    )
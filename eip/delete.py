@@ -1,8 +1,12 @@
-import boto3
+from util.log import get_logger
+from util.throttle import call_with_retry
+
+log = get_logger('eip.delete')
 
 def delete_eip(ec2_client, eip_id):
     """
     EIP(Elastic IP)를 해제합니다.
+    스로틀링·일시적 오류는 util.throttle 에서 백오프 후 재시도합니다.
     
     Args:
         ec2_client: boto3 EC2 클라이언트
@@ -13,10 +17,10 @@ def delete_eip(ec2_client, eip_id):
     """
     try:
         # EIP 해제
-        ec2_client.release_address(AllocationId=eip_id)
-        print(f"✅ EIP {eip_id} 해제 성공")
+        call_with_retry(ec2_client, 'release_address', AllocationId=eip_id)
+        log.debug("✅ EIP %s 해제 성공", eip_id)
         return True
     except Exception as e:
-        print(f"❌ EIP {eip_id} 해제 실패: {str(e)}")
+        log.debug("❌ EIP %s 해제 실패: %s", eip_id, e)
         # 예외를 다시 발생시켜 상위 함수에서 처리하도록 함
         raise
\ No newline at end of file
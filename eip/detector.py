@@ -1,8 +1,53 @@
-def detect_eips(ec2_client):
-    unused_eips = []
-    addresses = ec2_client.describe_addresses()['Addresses']
+from typing import Any, Dict, Iterator, List, Optional
+from util.records import ResourceRecord, describe_records, tags_from
+from util.throttle import call_with_retry
+
+def eip_record(address: Dict[str, Any]) -> ResourceRecord:
+    """describe_addresses 응답 항목에서 레코드를 만듭니다 (EIP 는 생성 시각을 제공하지 않음)."""
+    return ResourceRecord(
+        id=address['AllocationId'],
+        tags=tags_from(address.get('Tags')),
+        public_ip=address.get('PublicIp')
+    )
+
+def detect_eips(ec2_client, limit: Optional[int] = None,
+                records: Optional[Dict[str, ResourceRecord]] = None) -> Iterator[str]:
+    """
+    인스턴스나 ENI에 연결되지 않은 EIP의 AllocationId를 스트리밍합니다.
+
+    describe_addresses 는 페이지네이션을 지원하지 않아 한 번의 호출로 전체 목록을 받습니다.
+    응답에서 미사용 EIP만 골라 하나씩 yield 합니다.
+
+    Args:
+        ec2_client: boto3 EC2 클라이언트
+        limit: 최대 반환 개수 (None이면 전체)
+        records: 주어지면 리소스 ID별 메타데이터(ResourceRecord)를 채웁니다
+
+    Yields:
+        미사용 EIP의 AllocationId (예: 'eipalloc-12345')
+    """
+    if limit is not None and limit <= 0:
+        return
+
+    # VPC 도메인의 EIP만 AllocationId를 가지므로 서버 측에서 필터링
+    addresses = call_with_retry(
+        ec2_client,
+        'describe_addresses',
+        Filters=[{'Name': 'domain', 'Values': ['vpc']}]
+    )['Addresses']
+
+    count = 0
     for address in addresses:
-            if 'InstanceId' not in address and 'NetworkInterfaceId' not in address:
-                eip_id = address['AllocationId']
-                unused_eips.append(eip_id)
-    return unused_eips
\ No newline at end of file
+        if not address.get('InstanceId') and not address.get('NetworkInterfaceId'):
+            if records is not None:
+                records[address['AllocationId']] = eip_record(address)
+            yield address['AllocationId']
+            count += 1
+            if limit is not None and count >= limit:
+                return
+
+def describe_eips(ec2_client, allocation_ids: List[str]) -> Dict[str, ResourceRecord]:
+    """EIP 를 AllocationId 로 다시 조회해 {ID: 레코드} 를 반환합니다. 이미 해제된 EIP 는 포함되지 않습니다."""
+    return describe_records(
+        ec2_client, 'describe_addresses', 'Addresses', 'allocation-id', allocation_ids, eip_record, paginate=False
+    )
@@ -0,0 +1,31 @@
+from elb.detector import is_unused_load_balancer
+from util.log import get_logger
+from util.throttle import call_with_retry
+
+log = get_logger('elb.delete')
+
+def delete_load_balancer(elbv2_client, load_balancer_arn):
+    """
+    ELBv2 로드 밸런서를 삭제합니다. 대상 그룹은 남으며 로드 밸런서와의 연결만 해제됩니다.
+    스로틀링·일시적 오류는 util.throttle 에서 백오프 후 재시도합니다.
+
+    AWS 는 사용 중인 로드 밸런서도 삭제하므로, 탐지 이후 대상이 등록되었거나 규칙이 바뀌었는지
+    삭제 직전에 미사용 여부를 다시 확인합니다.
+
+    Args:
+        elbv2_client: boto3 ELBv2 클라이언트
+        load_balancer_arn: 삭제할 로드 밸런서의 ARN
+
+    Raises:
+        Exception: 로드 밸런서가 다시 사용 중이거나 삭제 중 오류가 발생한 경우
+    """
+    try:
+        if not is_unused_load_balancer(elbv2_client, load_balancer_arn):
+            raise RuntimeError(f"로드 밸런서 {load_balancer_arn}가 트래픽을 처리하고 있어 삭제하지 않습니다.")
+        call_with_retry(elbv2_client, 'delete_load_balancer', LoadBalancerArn=load_balancer_arn)
+        log.debug("✅ 로드 밸런서 %s 삭제 성공", load_balancer_arn)
+        return True
+    except Exception as e:
+        log.debug("❌ 로드 밸런서 %s 삭제 실패: %s", load_balancer_arn, e)
+        # 예외를 다시 발생시켜 상위 함수에서 처리하도록 함
+        raise
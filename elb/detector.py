@@ -0,0 +1,173 @@
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+from util.records import ResourceRecord, epoch, tags_from
+from util.throttle import call_with_retry, get_error_code, paginate_with_retry
+
+# describe_load_balancers 의 PageSize 허용 범위 (1 ~ 400)
+MIN_PAGE_SIZE = 1
+MAX_PAGE_SIZE = 400
+
+# describe_load_balancers(LoadBalancerArns) / describe_tags(ResourceArns) 의 최대 ARN 수
+DESCRIBE_BATCH_SIZE = 20
+
+# 대상 없이도 트래픽을 처리하는 리스너·규칙 동작
+SELF_SERVING_ACTIONS = {'redirect', 'fixed-response'}
+# 리스너 규칙이 있는 프로토콜 (ALB 리스너)
+RULE_PROTOCOLS = {'HTTP', 'HTTPS'}
+
+def _listener_actions(elbv2_client, listener: Dict[str, Any]) -> Iterator[Dict[str, Any]]:
+    """리스너 기본 동작과 모든 리스너 규칙의 동작."""
+    yield from listener.get('DefaultActions', [])
+    if listener.get('Protocol') not in RULE_PROTOCOLS:
+        return
+    for page in paginate_with_retry(elbv2_client, 'describe_rules', ListenerArn=listener['ListenerArn']):
+        for rule in page.get('Rules', []):
+            yield from rule.get('Actions', [])
+
+def _forward_target_groups(action: Dict[str, Any]) -> Iterator[str]:
+    """forward 동작이 가리키는 대상 그룹 ARN (단일 대상 그룹 또는 가중치 대상 그룹 목록)."""
+    if action.get('TargetGroupArn'):
+        yield action['TargetGroupArn']
+    for target_group in (action.get('ForwardConfig') or {}).get('TargetGroups', []):
+        yield target_group['TargetGroupArn']
+
+def _attached_target_groups(elbv2_client, load_balancer_arn: str) -> List[str]:
+    """로드 밸런서에 연결된 대상 그룹 ARN 목록."""
+    try:
+        return [
+            target_group['TargetGroupArn']
+            for page in paginate_with_retry(elbv2_client, 'describe_target_groups', LoadBalancerArn=load_balancer_arn)
+            for target_group in page.get('TargetGroups', [])
+        ]
+    except Exception as e:
+        # 연결된 대상 그룹이 없으면 TargetGroupNotFound 를 반환하는 경우가 있음
+        if get_error_code(e) != 'TargetGroupNotFound':
+            raise
+        return []
+
+def is_unused_load_balancer(elbv2_client, load_balancer_arn: str) -> bool:
+    """
+    트래픽을 처리하지 않는 로드 밸런서인지 확인합니다.
+
+    리스너 기본 동작이나 리스너 규칙 중 하나라도 리다이렉트·고정 응답이면 사용 중이며,
+    연결된 대상 그룹과 규칙이 forward 하는 대상 그룹 중 하나라도 등록된 대상이 있으면 사용 중입니다.
+    """
+    target_group_arns = set()
+    for page in paginate_with_retry(elbv2_client, 'describe_listeners', LoadBalancerArn=load_balancer_arn):
+        for listener in page.get('Listeners', []):
+            for action in _listener_actions(elbv2_client, listener):
+                if action['Type'] in SELF_SERVING_ACTIONS:
+                    return False
+                target_group_arns.update(_forward_target_groups(action))
+    target_group_arns.update(_attached_target_groups(elbv2_client, load_balancer_arn))
+
+    for target_group_arn in sorted(target_group_arns):
+        health = call_with_retry(elbv2_client, 'describe_target_health', TargetGroupArn=target_group_arn)
+        if health['TargetHealthDescriptions']:
+            return False
+    return True
+
+def load_balancer_record(load_balancer: Dict[str, Any], tags: Tuple[Tuple[str, str], ...] = ()) -> ResourceRecord:
+    """describe_load_balancers 응답 항목과 태그에서 레코드를 만듭니다."""
+    zones = load_balancer.get('AvailabilityZones', [])
+    return ResourceRecord(
+        id=load_balancer['LoadBalancerArn'],
+        created_at=epoch(load_balancer.get('CreatedTime')),
+        description=load_balancer.get('DNSName'),
+        interface_type=load_balancer.get('Type'),
+        tags=tags,
+        subnet_id=zones[0].get('SubnetId') if zones else None,
+        vpc_id=load_balancer.get('VpcId')
+    )
+
+def detect_unused_load_balancers(elbv2_client, page_size: int = MAX_PAGE_SIZE,
+                                 limit: Optional[int] = None,
+                                 records: Optional[Dict[str, ResourceRecord]] = None) -> Iterator[str]:
+    """
+    트래픽을 처리하지 않는(is_unused_load_balancer) ELBv2(ALB/NLB/GWLB) 로드 밸런서 ARN을 스트리밍합니다.
+
+    Args:
+        elbv2_client: boto3 ELBv2 클라이언트
+        page_size: 페이지당 요청할 로드 밸런서 수 (1 ~ 400)
+        limit: 최대 반환 개수 (None이면 전체)
+        records: 주어지면 리소스 ID별 메타데이터(ResourceRecord)를 채웁니다
+
+    Yields:
+        미사용 로드 밸런서의 ARN
+    """
+    if limit is not None and limit <= 0:
+        return
+
+    page_size = max(MIN_PAGE_SIZE, min(MAX_PAGE_SIZE, page_size))
+    pages = paginate_with_retry(
+        elbv2_client,
+        'describe_load_balancers',
+        PaginationConfig={'PageSize': page_size}
+    )
+
+    count = 0
+    for page in pages:
+        unused = []
+        for load_balancer in page.get('LoadBalancers', []):
+            if limit is not None and count + len(unused) >= limit:
+                break
+            if load_balancer['State']['Code'] != 'active':
+                continue
+            if is_unused_load_balancer(elbv2_client, load_balancer['LoadBalancerArn']):
+                unused.append(load_balancer)
+        # describe_load_balancers 응답에는 태그가 없으므로 페이지마다 한 번에 묶어서 조회
+        if records is not None and unused:
+            tags = _tags_by_arn(elbv2_client, [load_balancer['LoadBalancerArn'] for load_balancer in unused])
+            for load_balancer in unused:
+                records[load_balancer['LoadBalancerArn']] = load_balancer_record(
+                    load_balancer, tags.get(load_balancer['LoadBalancerArn'], ())
+                )
+        for load_balancer in unused:
+            yield load_balancer['LoadBalancerArn']
+            count += 1
+        if limit is not None and count >= limit:
+            return
+
+def _tags_by_arn(elbv2_client, load_balancer_arns: List[str]) -> Dict[str, Tuple[Tuple[str, str], ...]]:
+    """여러 로드 밸런서의 태그를 describe_tags 한 번(최대 20개)씩 묶어서 조회합니다."""
+    tags = {}
+    for start in range(0, len(load_balancer_arns), DESCRIBE_BATCH_SIZE):
+        descriptions = call_with_retry(
+            elbv2_client, 'describe_tags', ResourceArns=load_balancer_arns[start:start + DESCRIBE_BATCH_SIZE]
+        )['TagDescriptions']
+        for description in descriptions:
+            tags[description['ResourceArn']] = tags_from(description.get('Tags'))
+    return tags
+
+def _describe_existing(elbv2_client, load_balancer_arns: List[str]) -> List[Dict[str, Any]]:
+    """
+    ARN 목록의 로드 밸런서를 조회합니다. describe_load_balancers 는 없는 ARN 이 하나라도 있으면
+    LoadBalancerNotFound 로 실패하므로, 그때만 하나씩 다시 조회해 이미 삭제된 것을 건너뜁니다.
+    """
+    try:
+        return call_with_retry(elbv2_client, 'describe_load_balancers', LoadBalancerArns=load_balancer_arns)['LoadBalancers']
+    except Exception as e:
+        if get_error_code(e) != 'LoadBalancerNotFound':
+            raise
+        if len(load_balancer_arns) == 1:
+            return []
+    return [
+        load_balancer
+        for load_balancer_arn in load_balancer_arns
+        for load_balancer in _describe_existing(elbv2_client, [load_balancer_arn])
+    ]
+
+def describe_load_balancers(elbv2_client, load_balancer_arns: List[str]) -> Dict[str, ResourceRecord]:
+    """
+    로드 밸런서를 ARN 으로 다시 조회해 {ARN: 레코드} 를 반환합니다. 이미 삭제된 로드 밸런서는 포함되지 않습니다.
+    describe_load_balancers 는 필터를 지원하지 않으므로 ARN 을 20개씩 묶어 조회합니다.
+    """
+    load_balancers = [
+        load_balancer
+        for start in range(0, len(load_balancer_arns), DESCRIBE_BATCH_SIZE)
+        for load_balancer in _describe_existing(elbv2_client, load_balancer_arns[start:start + DESCRIBE_BATCH_SIZE])
+    ]
+    tags = _tags_by_arn(elbv2_client, [load_balancer['LoadBalancerArn'] for load_balancer in load_balancers])
+    return {
+        load_balancer['LoadBalancerArn']: load_balancer_record(load_balancer, tags.get(load_balancer['LoadBalancerArn'], ()))
+        for load_balancer in load_balancers
+    }
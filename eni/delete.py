@@ -1,8 +1,12 @@
-import boto3
+from util.log import get_logger
+from util.throttle import call_with_retry
+
+log = get_logger('eni.delete')
 
 def delete_eni(ec2_client, eni_id):
     """
     ENI(Elastic Network Interface)를 삭제합니다.
+    스로틀링·일시적 오류는 util.throttle 에서 백오프 후 재시도합니다.
     
     Args:
         ec2_client: boto3 EC2 클라이언트
@@ -13,10 +17,10 @@ def delete_eni(ec2_client, eni_id):
     """
     try:
         # ENI 삭제
-        ec2_client.delete_network_interface(NetworkInterfaceId=eni_id)
-        print(f"✅ ENI {eni_id} 삭제 성공")
+        call_with_retry(ec2_client, 'delete_network_interface', NetworkInterfaceId=eni_id)
+        log.debug("✅ ENI %s 삭제 성공", eni_id)
         return True
     except Exception as e:
-        print(f"❌ ENI {eni_id} 삭제 실패: {str(e)}")
+        log.debug("❌ ENI %s 삭제 실패: %s", eni_id, e)
         # 예외를 다시 발생시켜 상위 함수에서 처리하도록 함
         raise
\ No newline at end of file
@@ -1,16 +1,69 @@
-import json
+from typing import Any, Dict, Iterator, List, Optional
+from util.records import ResourceRecord, describe_records, epoch, tags_from
+from util.throttle import paginate_with_retry
 
-def detect_enis(ec2_client):
-    unused_enis = []
-    enis = ec2_client.describe_network_interfaces(
-            Filters=[{'Name': 'status', 'Values': ['available']}]
-        )['NetworkInterfaces']
-        
-    for eni in enis:
-        eni_id = eni['NetworkInterfaceId']
-        unused_enis.append(eni_id)
-    
-    return unused_enis
+# describe_network_interfaces 의 MaxResults 허용 범위 (5 ~ 1000)
+MIN_PAGE_SIZE = 5
+MAX_PAGE_SIZE = 1000
 
+def eni_record(eni: Dict[str, Any]) -> ResourceRecord:
+    """describe_network_interfaces 응답 항목에서 레코드를 만듭니다."""
+    return ResourceRecord(
+        id=eni['NetworkInterfaceId'],
+        attached_at=epoch(eni.get('Attachment', {}).get('AttachTime')),
+        description=eni.get('Description') or None,
+        requester=eni.get('RequesterId'),
+        requester_managed=eni.get('RequesterManaged', False),
+        interface_type=eni.get('InterfaceType'),
+        tags=tags_from(eni.get('TagSet')),
+        public_ip=eni.get('Association', {}).get('PublicIp'),
+        subnet_id=eni.get('SubnetId'),
+        vpc_id=eni.get('VpcId')
+    )
 
+def detect_enis(ec2_client, page_size: int = MAX_PAGE_SIZE, limit: Optional[int] = None,
+                records: Optional[Dict[str, ResourceRecord]] = None,
+                filters: Optional[List[Dict[str, Any]]] = None) -> Iterator[str]:
+    """
+    연결되지 않은(available 상태) ENI ID를 페이지 단위로 스트리밍합니다.
 
+    status 필터는 서버 측에서 적용되므로 사용 중인 ENI는 응답에 포함되지 않으며,
+    페이지를 하나씩 받아 ID만 yield 하므로 리전 규모와 관계없이 메모리 사용량이 일정합니다.
+
+    Args:
+        ec2_client: boto3 EC2 클라이언트
+        page_size: 페이지당 요청할 ENI 수 (5 ~ 1000)
+        limit: 최대 반환 개수 (None이면 전체)
+        records: 주어지면 리소스 ID별 메타데이터(ResourceRecord)를 채웁니다
+        filters: status 필터에 더할 서버 측 필터 (보호 규칙에서 생성, 예: requester-managed)
+
+    Yields:
+        미사용 ENI의 ID (예: 'eni-12345')
+    """
+    if limit is not None and limit <= 0:
+        return
+
+    page_size = max(MIN_PAGE_SIZE, min(MAX_PAGE_SIZE, page_size))
+    pages = paginate_with_retry(
+        ec2_client,
+        'describe_network_interfaces',
+        Filters=[{'Name': 'status', 'Values': ['available']}] + (filters or []),
+        PaginationConfig={'PageSize': page_size}
+    )
+
+    count = 0
+    for page in pages:
+        for eni in page.get('NetworkInterfaces', []):
+            if records is not None:
+                records[eni['NetworkInterfaceId']] = eni_record(eni)
+            yield eni['NetworkInterfaceId']
+            count += 1
+            if limit is not None and count >= limit:
+                # 조기 종료: 남은 페이지는 요청하지 않음
+                return
+
+def describe_enis(ec2_client, eni_ids: List[str]) -> Dict[str, ResourceRecord]:
+    """ENI 를 ID로 다시 조회해 {ID: 레코드} 를 반환합니다. 이미 삭제된 ENI 는 포함되지 않습니다."""
+    return describe_records(
+        ec2_client, 'describe_network_interfaces', 'NetworkInterfaces', 'network-interface-id', eni_ids, eni_record
+    )
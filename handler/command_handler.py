@@ -1,32 +1,108 @@
 import json
 import os
+from util.invoker import get_invoker
+from util.log import get_logger
 from util.slack import return_slack_response
 
-def command_handler(command_payload, lambda_client):
+log = get_logger('command_handler')
+
+# Slack 은 3초 안에 응답을 받아야 하므로 이 모듈의 핸들러는 탐지·삭제 엔진을 import 하지 않고
+# 자기 자신을 비동기 호출한 뒤 바로 응답합니다. Lambda 클라이언트는 util.aws 에서 처음 사용할 때 만들어 공유합니다.
+
+def command_handler(command_payload):
     """
     Slack 슬래시 커맨드 '/cleanup-unattach'를 처리합니다.
     """
-    print("슬래시 커맨드 '/cleanup-unattach' 감지됨")
+    log.info("슬래시 커맨드 '/cleanup-unattach' 감지됨")
     # 응답 URL 저장
     response_url = command_payload.get('response_url', '')
-    print(f"response_url: {response_url}")
+    log.debug("response_url: %s", response_url)
     # 현재 Lambda 함수 이름 가져오기
     function_name = os.environ.get('AWS_LAMBDA_FUNCTION_NAME')
     
     if function_name:
         # 자기 자신을 비동기적으로 호출 (detect 작업 실행)
-        lambda_client.invoke(
+        get_invoker().invoke(
             FunctionName=function_name,
             InvocationType='Event',  # 비동기 호출
             Payload=json.dumps({
                 'source': 'lambda',
                 'action': 'detect',
-                'response_url': response_url
+                'response_url': response_url,
+                'channel_id': command_payload.get('channel_id', '')
             })
         )
         
-        print(f"Lambda 함수 '{function_name}' 비동기 호출 성공 (detect)")
+        log.info("Lambda 함수 '%s' 비동기 호출 성공 (detect)", function_name)
         return return_slack_response("리소스 탐색을 시작합니다...")
     else:
-        print("Lambda 함수 이름을 가져올 수 없습니다.")
-        return return_slack_response("Lambda 함수 이름을 가져올 수 없습니다.") 
\ No newline at end of file
+        log.error("Lambda 함수 이름을 가져올 수 없습니다.")
+        return return_slack_response("Lambda 함수 이름을 가져올 수 없습니다.")
+
+def handle_delete_interaction(interactive_payload):
+    """
+    Slack 인터랙티브 메시지(삭제 버튼 클릭)를 처리하고 delete_handler를 비동기 호출합니다.
+    """
+    log.info("인터랙티브 페이로드 감지됨", type=interactive_payload.get('type'))
+    log.payload("인터랙티브 페이로드", interactive_payload)
+    
+    # 액션 ID 확인 (block_actions 타입)
+    if interactive_payload.get('type') == 'block_actions':
+        actions = interactive_payload.get('actions', [])
+        if actions and actions[0].get('action_id') == 'delete':
+            log.info("삭제 버튼 클릭 감지됨")
+            response_url = interactive_payload.get('response_url', '')
+            log.debug("인터랙티브 response_url: %s", response_url)
+            
+            try:
+                value_str = actions[0].get('value', '{}')
+                resources_data = json.loads(value_str)
+                resources = resources_data.get('resources', {})
+                # 리소스 세트가 서버 측에 저장된 경우 버튼에는 스캔 ID만 담겨 있음
+                scan_id = resources_data.get('scan_id', '')
+                if resources:
+                    log.payload("삭제할 리소스", resources)
+                else:
+                    log.info("삭제할 리소스 세트", scan_id=scan_id)
+                
+                function_name = os.environ.get('AWS_LAMBDA_FUNCTION_NAME')
+                
+                if function_name and response_url and (resources or scan_id):
+                    lambda_payload = {
+                        'source': 'lambda',
+                        'action': 'delete',
+                        'response_url': response_url
+                    }
+                    channel_id = interactive_payload.get('channel', {}).get('id')
+                    if channel_id:
+                        lambda_payload['channel_id'] = channel_id
+                    if scan_id:
+                        lambda_payload['scan_id'] = scan_id
+                    else:
+                        lambda_payload['resources'] = resources
+                    body = json.dumps(lambda_payload)
+                    log.payload("비동기 호출 Payload", body)
+                    get_invoker().invoke(
+                        FunctionName=function_name,
+                        InvocationType='Event',
+                        Payload=body
+                    )
+                    log.info("Lambda 함수 '%s' 비동기 호출 성공 (delete)", function_name)
+                    
+                    return {
+                        "statusCode": 200,
+                        "headers": {"Content-Type": "application/json"},
+                        "body": json.dumps({"text": "삭제 요청을 받았습니다. 잠시 후 결과가 전송됩니다."})
+                    }
+                else:
+                    error_msg = "Lambda 함수 정보, 응답 URL 또는 리소스 정보를 가져올 수 없습니다."
+                    log.error(error_msg)
+                    return return_slack_response(error_msg)
+                
+            except Exception as e:
+                error_msg = f"인터랙티브 메시지 처리 중 오류 발생: {str(e)}"
+                log.error(error_msg)
+                return return_slack_response(error_msg)
+    
+    log.warning("처리할 수 없는 인터랙션 타입입니다.")
+    return return_slack_response("알 수 없는 인터랙션입니다.")
@@ -1,174 +1,565 @@
-import boto3
+import itertools
 import json
 import time
 import os
 import sys
+import threading
 
 # 상위 디렉토리를 경로에 추가하여 모듈을 찾을 수 있도록 합니다
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
-from eni.delete import delete_eni
-from eip.delete import delete_eip
-from util.slack import send_slack_block_response
+from util.accounts import split_location
+from util.aws import get_client
+from util.deadline import UNKNOWN, invoke_continuation, load_continuation, run_until_deadline
+from util.invoker import LAMBDA_INVOKER, get_invoker
+from util.log import get_logger
+from util.metrics import count, timer
+from util.journal import (
+    JOURNAL_BACKEND, ResultJournal, claim_fan_out_report, claim_job, collect_fan_out, get_journal_store,
+    job_id_for, load_completed, release_job, renew_job, save_shard_result, start_fan_out,
+)
+from util.protection import find_protected, get_protection_rules
+from util.slack import send_slack_block_messages, upload_slack_file
+from util.resource_store import resolve_resource_set
+from util.resource_types import get_resource_type
+from util.snapshot import remove_from_snapshot, verify_against_snapshot
+from util.storage import is_shared_backend
 from util.slack import send_slack_text_response
-from util.slack_block import create_resource_delete_blocks
-from util.slack import return_slack_response
+from util.slack_block import create_resource_delete_messages
 
-# AWS Lambda 클라이언트 초기화 (interactive handler에서 사용)
-lambda_client = boto3.client('lambda')
+log = get_logger('delete_handler')
 
-def handle_delete_interaction(interactive_payload):
+# 삭제 엔진 동시성 설정
+DELETE_MAX_WORKERS = int(os.environ.get('DELETE_MAX_WORKERS', '32'))          # 전체 워커 풀 크기
+DELETE_REGION_CONCURRENCY = int(os.environ.get('DELETE_REGION_CONCURRENCY', '8'))  # 리전당 동시 삭제 호출 수
+DELETE_API_CONCURRENCY = int(os.environ.get('DELETE_API_CONCURRENCY', '4'))      # 리전·API당 동시 호출 수
+
+# 팬아웃 설정: DELETE_FANOUT=true 이면 리전(과 큰 리전은 청크) 단위로 워커 Lambda 에 나눠 삭제
+DELETE_FANOUT = os.environ.get('DELETE_FANOUT', 'false').lower() == 'true'
+DELETE_SHARD_SIZE = int(os.environ.get('DELETE_SHARD_SIZE', '200'))  # 워커 하나가 맡는 최대 리소스 수
+
+# 스냅샷 없이 삭제 요청을 검증할 때 다시 탐지하는 페이지 크기 (탐지기가 허용 범위로 조정)
+VERIFY_PAGE_SIZE = 1000
+
+_semaphores = {}
+_semaphores_lock = threading.Lock()
+
+def _get_semaphore(key, limit):
+    """리전 또는 (리전, API) 단위의 동시성 제한 세마포어를 반환합니다."""
+    with _semaphores_lock:
+        if key not in _semaphores:
+            _semaphores[key] = threading.BoundedSemaphore(max(1, limit))
+        return _semaphores[key]
+
+def _delete_one(client, region, resource_type, resource_id):
     """
-    Slack 인터랙티브 메시지(삭제 버튼 클릭)를 처리하고 delete_handler를 비동기 호출합니다.
+    단일 리소스를 등록된 리소스 타입의 삭제 함수로 삭제합니다.
+    리전·API별 동시성 제한 안에서 호출됩니다.
+
+    Returns:
+        (결과 키, 성공 여부) 튜플
     """
-    print(f"인터랙티브 페이로드 감지됨: {json.dumps(interactive_payload)}")
-    
-    # 액션 ID 확인 (block_actions 타입)
-    if interactive_payload.get('type') == 'block_actions':
-        actions = interactive_payload.get('actions', [])
-        if actions and actions[0].get('action_id') == 'delete':
-            print("삭제 버튼 클릭 감지됨")
-            response_url = interactive_payload.get('response_url', '')
-            print(f"인터랙티브 response_url: {response_url}")
-            
+    key = f"{region}:{resource_type}:{resource_id}"
+    definition = get_resource_type(resource_type)
+    account_id, region_name = split_location(region)
+    dimensions = {'Region': region_name, 'Account': account_id, 'ResourceType': resource_type}
+    with _get_semaphore(region, DELETE_REGION_CONCURRENCY), \
+            _get_semaphore((region, definition.delete_api), DELETE_API_CONCURRENCY):
+        try:
+            log.debug("%s 삭제 중: %s (리전: %s)", resource_type, resource_id, region)
+            with timer('DeleteLatency', **dimensions):
+                definition.delete(client, resource_id)
+            count('ResourcesDeleted', **dimensions)
+            return key, True
+        except Exception as e:
+            log.warning("%s 삭제 실패: %s - %s", resource_type, resource_id, e, region=region)
+            count('DeleteFailures', **dimensions)
+            return key, False
+
+def _live_unused_ids(region, resource_type):
+    """리소스 타입의 탐지기로 위치의 현재 미사용 리소스 ID를 다시 탐지합니다 (스냅샷이 없을 때 삭제 요청 검증용)."""
+    definition = get_resource_type(resource_type)
+    account_id, region_name = split_location(region)
+    client = get_client(definition.service, region_name, account_id)
+    return definition.detect(client, VERIFY_PAGE_SIZE, None, **definition.related_clients(region_name, account_id))
+
+def drop_protected(clients, region, tasks, results):
+    """
+    삭제 직전에 리소스를 다시 조회해 보호 규칙에 걸리는 리소스를 작업에서 빼고 results["failed"]에 추가합니다.
+    탐지 이후 보호 태그가 붙었거나 다른 서비스가 가져간 리소스를 지우지 않기 위한 확인이며,
+    다시 조회할 수 없는 리소스 타입은 안전을 위해 모두 삭제하지 않습니다.
+
+    Returns:
+        보호되지 않은 [(리소스 타입, 리소스 ID), ...]
+    """
+    by_type = {}
+    for resource_type, resource_id in tasks:
+        by_type.setdefault(resource_type, []).append(resource_id)
+
+    excluded = set()
+    for resource_type, resource_ids in by_type.items():
+        definition = get_resource_type(resource_type)
+        try:
+            records = definition.describe(clients[(region, definition.service)], resource_ids)
+        except Exception as e:
+            log.warning("리전 %s의 %s 보호 규칙 확인 실패, 삭제하지 않습니다: %s", region, resource_type, e)
+            excluded.update((resource_type, resource_id) for resource_id in resource_ids)
+            continue
+        for resource_id, reason in find_protected(resource_type, records).items():
+            count('ProtectedSkipped', ResourceType=resource_type)
+            log.info("보호된 리소스 %s(%s)는 삭제하지 않습니다. (리전: %s)", resource_id, reason, region)
+            excluded.add((resource_type, resource_id))
+
+    results["failed"].extend(f"{region}:{resource_type}:{resource_id}" for resource_type, resource_id in excluded)
+    return [task for task in tasks if task not in excluded]
+
+def plan_deletes(resources, results):
+    """
+    삭제 요청을 리전별로 묶어 실행할 작업 목록을 만듭니다.
+
+    지원되지 않는 리소스 타입이나 클라이언트를 만들 수 없는 리전의 리소스는
+    바로 results["failed"]에 추가됩니다. 보호 규칙이 있으면 삭제 직전에 다시 확인해
+    보호된 리소스도 실패로 처리합니다. 리전별 작업은 번갈아 배치되어
+    한 리전이 워커 풀을 독점하지 않습니다.
+
+    Returns:
+        ([(boto3 클라이언트, 리전, 리소스 타입, 리소스 ID), ...], 권장 워커 수) 튜플
+    """
+    # 리전별 작업 목록 구성: {"리전": [(리소스 타입, 리소스 ID), ...]}
+    region_tasks = {}
+    for resource_type, regions in resources.items():
+        log.debug("리소스 타입 %s 처리 중...", resource_type)
+        for region, resource_ids in regions.items():
+            if not resource_ids:
+                log.debug("리전 %s에 처리할 %s가 없습니다.", region, resource_type)
+                continue
+            if get_resource_type(resource_type) is None:
+                log.warning("지원되지 않는 리소스 타입: %s", resource_type)
+                results["failed"].extend(f"{region}:{resource_type}:{resource_id}" for resource_id in resource_ids)
+                continue
+            # 페이로드를 그대로 믿지 않고 마지막 스캔 스냅샷(없으면 다시 탐지한 결과)에 있는 리소스만 삭제
+            resource_ids, rejected_ids = verify_against_snapshot(
+                region, resource_type, resource_ids,
+                live_unused=lambda: _live_unused_ids(region, resource_type)
+            )
+            if rejected_ids:
+                log.warning("리전 %s의 %s %d개가 미사용으로 확인되지 않아 삭제하지 않습니다.", region, resource_type, len(rejected_ids))
+                results["failed"].extend(f"{region}:{resource_type}:{resource_id}" for resource_id in rejected_ids)
+                if not resource_ids:
+                    continue
+            region_tasks.setdefault(region, []).extend((resource_type, resource_id) for resource_id in resource_ids)
+
+    # 리전·서비스별 클라이언트 생성 (리전당 서비스마다 한 번)
+    clients = {}
+    for region, tasks in list(region_tasks.items()):
+        try:
+            # 교차 계정 리소스는 "<계정 ID>/<리전>" 키로 전달되며 해당 계정의 클라이언트로 삭제
+            account_id, region_name = split_location(region)
+            for service in {get_resource_type(resource_type).service for resource_type, _ in tasks}:
+                log.debug("리전 %s에 대한 %s 클라이언트 생성 중...", region, service)
+                clients[(region, service)] = get_client(service, region_name, account_id)
+        except Exception as e:
+            log.error("리전 %s에 대한 클라이언트 생성 실패: %s", region, e)
+            # 이 리전의 모든 리소스를 실패로 표시
+            for resource_type, resource_id in region_tasks.pop(region):
+                results["failed"].append(f"{region}:{resource_type}:{resource_id}")
+
+    # 탐지 이후 상태가 바뀌었을 수 있으므로 보호 규칙을 다시 확인
+    if get_protection_rules():
+        for region, tasks in list(region_tasks.items()):
+            region_tasks[region] = drop_protected(clients, region, tasks, results)
+            if not region_tasks[region]:
+                del region_tasks[region]
+
+    # 리전별 작업을 번갈아 배치하여 한 리전이 워커 풀을 독점하지 않도록 함
+    region_queues = [[(region, task) for task in tasks] for region, tasks in region_tasks.items()]
+    interleaved = [
+        (clients[(region, get_resource_type(resource_type).service)], region, resource_type, resource_id)
+        for batch in itertools.zip_longest(*region_queues)
+        for region, (resource_type, resource_id) in filter(None, batch)
+    ]
+    max_workers = min(
+        DELETE_MAX_WORKERS,
+        sum(min(DELETE_REGION_CONCURRENCY, len(tasks)) for tasks in region_tasks.values())
+    )
+    return interleaved, max(1, max_workers)
+
+def collect_delete_outcomes(tasks, outcomes, results):
+    """
+    삭제 작업 결과를 results 에 반영하고, 삭제된 리소스를 스냅샷에서 제거합니다.
+
+    Args:
+        tasks: plan_deletes 가 만든 작업 목록
+        outcomes: 작업과 같은 순서의 (결과 키, 성공 여부). 시작하지 않은 작업은 None,
+                  시작했지만 기한 안에 끝나지 않은 작업은 util.deadline.UNKNOWN
+
+    Returns:
+        (시작하지 않은 리소스, 결과를 알 수 없는 리소스) 튜플. 둘 다 {"리소스 타입": {"위치": [리소스 ID 목록]}}
+        결과를 알 수 없는 리소스는 삭제가 실제로 끝났을 수 있으므로 다시 삭제하지 않고 settle_unknown 으로 확인합니다.
+    """
+    remaining = {}
+    unknown = {}
+    for (_, region, resource_type, resource_id), outcome in zip(tasks, outcomes):
+        if outcome is None or outcome is UNKNOWN:
+            target = remaining if outcome is None else unknown
+            target.setdefault(resource_type, {}).setdefault(region, []).append(resource_id)
+            continue
+        key, ok = outcome
+        results["success" if ok else "failed"].append(key)
+    forget_deleted(results["success"])
+    return remaining, unknown
+
+def settle_unknown(unknown, results, on_result=None):
+    """
+    기한 때문에 결과를 받지 못한 삭제 호출의 리소스를 다시 조회해 실제 결과를 확정합니다.
+
+    더 이상 조회되지 않는 리소스는 삭제된 것으로 results["success"]에 추가하고,
+    아직 남아 있는 리소스는 다시 삭제할 수 있도록 반환합니다. 조회에 실패한 리소스는
+    결과를 확인할 수 없으므로 다시 삭제하지 않고 results["failed"]에 추가합니다.
+    확정된 결과마다 on_result 를 (결과 키, 성공 여부)로 호출합니다.
+
+    Returns:
+        아직 남아 있는 리소스 {"리소스 타입": {"위치": [리소스 ID 목록]}}
+    """
+    still_present = {}
+    deleted = []
+    for resource_type, regions in unknown.items():
+        definition = get_resource_type(resource_type)
+        for region, resource_ids in regions.items():
             try:
-                value_str = actions[0].get('value', '{}')
-                resources_data = json.loads(value_str)
-                resources = resources_data.get('resources', {})
-                print(f"삭제할 리소스: {json.dumps(resources)}")
-                
-                function_name = os.environ.get('AWS_LAMBDA_FUNCTION_NAME')
-                
-                if function_name and response_url and resources:
-                    lambda_payload = {
-                        'source': 'lambda',
-                        'action': 'delete',
-                        'response_url': response_url,
-                        'resources': resources
-                    }
-                    print(f"비동기 호출 Payload: {json.dumps(lambda_payload)}")
-                    lambda_client.invoke(
-                        FunctionName=function_name,
-                        InvocationType='Event',
-                        Payload=json.dumps(lambda_payload)
-                    )
-                    print(f"Lambda 함수 '{function_name}' 비동기 호출 성공 (delete)")
-                    
-                    return {
-                        "statusCode": 200,
-                        "headers": {"Content-Type": "application/json"},
-                        "body": json.dumps({"text": "삭제 요청을 받았습니다. 잠시 후 결과가 전송됩니다."})
-                    }
-                else:
-                    error_msg = "Lambda 함수 정보, 응답 URL 또는 리소스 정보를 가져올 수 없습니다."
-                    print(error_msg)
-                    return return_slack_response(error_msg)
-                
+                account_id, region_name = split_location(region)
+                existing = definition.describe(get_client(definition.service, region_name, account_id), resource_ids)
             except Exception as e:
-                error_msg = f"인터랙티브 메시지 처리 중 오류 발생: {str(e)}"
-                print(error_msg)
-                return return_slack_response(error_msg)
-    
-    print("처리할 수 없는 인터랙션 타입입니다.")
-    return return_slack_response("알 수 없는 인터랙션입니다.")
+                log.warning("리전 %s의 %s %d개 삭제 결과를 확인하지 못했습니다: %s", region, resource_type, len(resource_ids), e)
+                outcomes = [(f"{region}:{resource_type}:{resource_id}", False) for resource_id in resource_ids]
+            else:
+                outcomes = []
+                for resource_id in resource_ids:
+                    if resource_id in existing:
+                        still_present.setdefault(resource_type, {}).setdefault(region, []).append(resource_id)
+                    else:
+                        outcomes.append((f"{region}:{resource_type}:{resource_id}", True))
+            for key, ok in outcomes:
+                results["success" if ok else "failed"].append(key)
+                if ok:
+                    deleted.append(key)
+                if on_result:
+                    on_result((key, ok))
+    if deleted:
+        log.info("결과를 알 수 없던 삭제 %d개가 완료된 것을 확인했습니다.", len(deleted))
+        forget_deleted(deleted)
+    return still_present
+
+def _merge_resources(base, extra):
+    merged = {resource_type: {region: list(ids) for region, ids in regions.items()} for resource_type, regions in base.items()}
+    for resource_type, regions in extra.items():
+        for region, resource_ids in regions.items():
+            merged.setdefault(resource_type, {}).setdefault(region, []).extend(resource_ids)
+    return merged
 
-def delete_resources(resources, response_url):
+def run_deletes(resources, deadline=None, on_result=None, unknown=None):
     """
-    각 리소스 타입별, 리전별로 리소스를 삭제합니다.
+    리소스를 병렬 삭제하되, 실행 기한이 가까워지면 새 삭제를 시작하지 않습니다.
+    on_result 는 리소스 하나가 끝날 때마다 (결과 키, 성공 여부)로 호출됩니다.
+    unknown(이전 호출에서 결과를 받지 못한 리소스)은 먼저 다시 조회해 남아 있는 것만 다시 삭제합니다.
+
+    리전별 작업을 라운드 로빈으로 섞어 제한된 워커 풀에 제출하므로
+    전체 소요 시간은 리소스 총량이 아니라 가장 느린 리전에 의해 결정됩니다.
+
+    Returns:
+        (삭제 결과, 시작하지 않은 리소스, 결과를 알 수 없는 리소스) 튜플
+    """
+    with timer('DeletePhaseTime'):
+        return _run_deletes(resources, deadline, on_result, unknown)
+
+def _run_deletes(resources, deadline=None, on_result=None, unknown=None):
+    # 삭제 결과 저장
+    results = {
+        "success": [],  # 성공한 리소스 목록
+        "failed": []    # 실패한 리소스 목록
+    }
+    if unknown:
+        resources = _merge_resources(resources, settle_unknown(unknown, results, on_result))
+
+    tasks, max_workers = plan_deletes(resources, results)
+    if not tasks:
+        return results, {}, {}
+
+    outcomes = run_until_deadline(_delete_one, tasks, max_workers, deadline, on_result)
+    remaining, unknown = collect_delete_outcomes(tasks, outcomes, results)
+    return results, remaining, unknown
+
+def _mark_remaining_failed(results, remaining):
+    for resource_type, regions in remaining.items():
+        for region, resource_ids in regions.items():
+            results["failed"].extend(f"{region}:{resource_type}:{resource_id}" for resource_id in resource_ids)
+
+def _finish_in_place(results, remaining, unknown, on_result=None):
+    """
+    이어서 실행할 수 없을 때 남은 리소스를 정리합니다. 시작하지 않은 리소스는 실패로 보고하고,
+    결과를 알 수 없는 리소스는 다시 조회해 삭제되었으면 성공, 남아 있으면 실패로 보고합니다.
+    """
+    _mark_remaining_failed(results, remaining)
+    _mark_remaining_failed(results, settle_unknown(unknown, results, on_result))
+
+def delete_resources(resources, response_url, deadline=None):
+    """
+    각 리소스 타입별, 리전별로 리소스를 병렬 삭제합니다.
+    기한 안에 끝나지 않은 리소스는 실패로 보고됩니다.
     
     Args:
         resources: 타입별 리소스 정보가 담긴 딕셔너리
                   형식: {"리소스 타입": {"리전": [리소스 ID 목록]}}
                   예: {"eips": {"ap-northeast-2": ["eipalloc-xxx"]}, "enis": {"ap-northeast-2": ["eni-xxx"]}}
+                  교차 계정 리소스의 리전 키는 "<계정 ID>/<리전>" 형식입니다.
         response_url: 슬랙 응답 URL
+        deadline: 실행 기한 (util.deadline.Deadline, 없으면 제한 없음)
         
     Returns:
         삭제 결과를 담은 딕셔너리
     """
-    # 삭제 결과 저장
-    results = {
-        "success": [],  # 성공한 리소스 목록
-        "failed": []    # 실패한 리소스 목록
-    }
-    
-    # 리소스 타입별로 처리 (eips, enis 등)
+    results, remaining, unknown = run_deletes(resources, deadline)
+    _finish_in_place(results, remaining, unknown)
+    return results
+
+def skip_completed(job_id, resources):
+    """
+    같은 작업의 이전 실행에서 이미 삭제된 리소스를 목록에서 뺍니다.
+
+    Returns:
+        (남은 리소스, 이미 삭제된 리소스의 결과 키 목록) 튜플
+    """
+    keys = [
+        f"{region}:{resource_type}:{resource_id}"
+        for resource_type, regions in resources.items()
+        for region, resource_ids in regions.items()
+        for resource_id in resource_ids
+    ]
+    completed = load_completed(job_id, keys)
+    if not completed:
+        return resources, []
+    log.info("이전 실행에서 삭제된 리소스 %d개를 건너뜁니다", len(completed), job_id=job_id)
+    pending = {}
     for resource_type, regions in resources.items():
-        print(f"리소스 타입 {resource_type} 처리 중...")
-        
-        # 리전별로 처리
         for region, resource_ids in regions.items():
-            print(f"  리전 {region} 처리 중...")
-            
-            if not resource_ids:
-                print(f"  리전 {region}에 처리할 {resource_type}가 없습니다.")
-                continue
-            
-            # 리전별 EC2 클라이언트 생성
-            try:
-                print(f"  리전 {region}에 대한 EC2 클라이언트 생성 중...")
-                ec2_client = boto3.client('ec2', region_name=region)
-                
-                # 리소스 타입에 따라 적절한 삭제 함수 호출
-                for resource_id in resource_ids:
-                    try:
-                        if resource_type == "eips":
-                            print(f"    EIP 삭제 중: {resource_id} (리전: {region})")
-                            delete_eip(ec2_client, resource_id)
-                            results["success"].append(f"{region}:{resource_type}:{resource_id}")
-                            print(f"    EIP 삭제 성공: {resource_id}")
-                        elif resource_type == "enis":
-                            print(f"    ENI 삭제 중: {resource_id} (리전: {region})")
-                            delete_eni(ec2_client, resource_id)
-                            results["success"].append(f"{region}:{resource_type}:{resource_id}")
-                            print(f"    ENI 삭제 성공: {resource_id}")
-                        else:
-                            print(f"    지원되지 않는 리소스 타입: {resource_type}")
-                            results["failed"].append(f"{region}:{resource_type}:{resource_id}")
-                    except Exception as e:
-                        print(f"    {resource_type} 삭제 실패: {resource_id} - {str(e)}")
-                        results["failed"].append(f"{region}:{resource_type}:{resource_id}")
-            
-            except Exception as e:
-                print(f"  리전 {region}에 대한 EC2 클라이언트 생성 실패: {str(e)}")
-                # 이 리전의 모든 리소스를 실패로 표시
-                for resource_id in resource_ids:
-                    results["failed"].append(f"{region}:{resource_type}:{resource_id}")
+            left = [
+                resource_id for resource_id in resource_ids
+                if f"{region}:{resource_type}:{resource_id}" not in completed
+            ]
+            if left:
+                pending.setdefault(resource_type, {})[region] = left
+    return pending, [key for key in keys if key in completed]
 
-    return results
+def partition_resources(resources, shard_size=DELETE_SHARD_SIZE):
+    """
+    리소스를 위치(리전)별로 나누고, 큰 위치는 shard_size 개씩 다시 나눕니다.
+
+    Returns:
+        [{"리소스 타입": {"위치": [리소스 ID 목록]}}, ...] 형식의 샤드 목록
+    """
+    by_location = {}
+    for resource_type, regions in resources.items():
+        for region, resource_ids in regions.items():
+            by_location.setdefault(region, []).extend((resource_type, resource_id) for resource_id in resource_ids)
+
+    shards = []
+    for region, items in by_location.items():
+        for start in range(0, len(items), max(1, shard_size)):
+            shard = {}
+            for resource_type, resource_id in items[start:start + shard_size]:
+                shard.setdefault(resource_type, {}).setdefault(region, []).append(resource_id)
+            shards.append(shard)
+    return shards
+
+def can_fan_out():
+    """
+    워커가 조정자와 같은 작업 저널을 볼 수 있어 팬아웃할 수 있는지 여부.
+
+    워커는 다른 컨테이너에서 실행될 수 있으므로 저널이 s3/dynamodb 여야 합니다
+    (LAMBDA_INVOKER=local 이면 워커가 같은 프로세스에서 실행되므로 로컬 저널도 허용).
+    """
+    if get_journal_store() is None:
+        return False
+    return is_shared_backend(JOURNAL_BACKEND) or LAMBDA_INVOKER == 'local'
+
+def fan_out_deletes(event, fan_out_id, shards):
+    """
+    샤드마다 워커 Lambda 를 비동기 호출합니다 (action: 'delete_shard').
+
+    워커는 결과를 작업 저널에 저장하고, 마지막으로 끝난 워커가 전체 결과를 합쳐 전송합니다.
+    호출에 실패한 샤드는 전체 리소스를 실패로 기록합니다. 이미 호출한 워커가 있을 수 있으므로
+    이 함수 안의 오류로 이 호출에서 다시 삭제하지 않습니다.
+
+    Args:
+        fan_out_id: start_fan_out 이 반환한 팬아웃 ID
+    """
+    function_name = os.environ.get('AWS_LAMBDA_FUNCTION_NAME')
+    invoker = get_invoker()
+    log.info("삭제 작업을 워커 %d개로 나눠 실행합니다", len(shards), fan_out_id=fan_out_id)
+    finish_event = {
+        'job_id': event['job_id'],
+        'fan_out_id': fan_out_id,
+        'response_url': event.get('response_url', ''),
+        'channel_id': event.get('channel_id')
+    }
 
-def send_delete_result(results, response_url):
-    blocks = create_resource_delete_blocks(results, title="리소스 삭제 결과", show_delete_button=False)
-    send_slack_block_response(response_url, blocks)
+    failed_shards = {}
+    for shard_id, shard in enumerate(shards):
+        payload = {
+            'source': 'lambda',
+            'action': 'delete_shard',
+            **finish_event,
+            'shard_id': shard_id,
+            'resources': shard
+        }
+        try:
+            invoker.invoke(FunctionName=function_name, InvocationType='Event', Payload=json.dumps(payload))
+        except Exception as e:
+            log.error("워커 %s 호출 실패: %s", shard_id, e, fan_out_id=fan_out_id)
+            failed_shards[shard_id] = shard
+    if failed_shards:
+        try:
+            for shard_id, shard in failed_shards.items():
+                results = {"success": [], "failed": []}
+                _mark_remaining_failed(results, shard)
+                save_shard_result(fan_out_id, shard_id, results)
+            # 모든 워커 호출이 실패한 경우 등, 남은 워커가 없으면 여기서 결과를 전송
+            finish_fan_out(finish_event)
+        except Exception as e:
+            log.error("호출에 실패한 워커 %d개의 결과를 기록하지 못했습니다: %s", len(failed_shards), e, fan_out_id=fan_out_id)
+            send_slack_text_response(
+                response_url=finish_event['response_url'],
+                message=f"삭제 워커 {len(failed_shards)}개를 호출하지 못했고 결과도 기록하지 못했습니다: {e}. "
+                        "전체 결과가 전송되지 않을 수 있습니다.",
+                ephemeral=False
+            )
+    return {
+        'statusCode': 202,
+        'body': json.dumps({'message': f'삭제 작업을 워커 {len(shards)}개로 나눠 실행합니다.'})
+    }
 
-def delete_handler(event):
+def finish_fan_out(event):
+    """모든 워커가 끝났으면 합친 결과를 한 번만 전송하고 작업을 해제합니다."""
+    fan_out_id = event['fan_out_id']
+    combined = collect_fan_out(fan_out_id)
+    if combined is None or not claim_fan_out_report(fan_out_id):
+        return
+    release_job(event['job_id'])
+    send_delete_result(combined, event.get('response_url', ''), event.get('channel_id'))
+
+def delete_shard_handler(event, deadline=None):
+    """
+    팬아웃된 샤드 하나를 삭제하는 워커 핸들러.
+
+    결과는 Slack 으로 바로 보내지 않고 작업 저널에 저장하며,
+    기한 안에 끝나지 않으면 같은 샤드를 이어서 실행합니다.
+    """
+    job_id = event['job_id']
+    continuation = load_continuation(event)
+    previous = continuation['results'] if continuation else {"success": [], "failed": []}
+    resources = continuation['resources'] if continuation else event.get('resources', {})
+    unknown = continuation.get('unknown', {}) if continuation else {}
+    log.info("워커 %s 시작", event['shard_id'], fan_out_id=event['fan_out_id'])
+    if continuation:
+        # 워커가 이어서 실행되는 동안 조정자가 얻은 실행 중 표시가 만료되지 않도록 연장
+        renew_job(job_id)
+    journal = ResultJournal(job_id, event['fan_out_id'], event['shard_id'])
+
+    try:
+        results, remaining, unknown = run_deletes(resources, deadline, journal.record, unknown)
+    except Exception as e:
+        log.error("워커 %s 삭제 중 오류 발생: %s", event['shard_id'], e, fan_out_id=event['fan_out_id'])
+        results, remaining = {"success": [], "failed": []}, _merge_resources(resources, unknown)
+        unknown = {}
+    journal.flush()
+    results = {
+        "success": previous["success"] + results["success"],
+        "failed": previous["failed"] + results["failed"]
+    }
+    if remaining or unknown:
+        if invoke_continuation(event, {'resources': remaining, 'unknown': unknown, 'results': results}):
+            return {'statusCode': 202, 'body': json.dumps({'message': '남은 리소스는 다음 호출에서 이어서 삭제합니다.'})}
+        _finish_in_place(results, remaining, unknown, journal.record)
+        journal.flush()
+
+    try:
+        save_shard_result(event['fan_out_id'], event['shard_id'], results)
+        finish_fan_out(event)
+    except Exception as e:
+        # 전체 결과를 보낼 수 없으므로 실행 중 표시를 해제해 다시 클릭하면 재실행되게 함
+        log.error("워커 %s 결과 기록 실패: %s", event['shard_id'], e, fan_out_id=event['fan_out_id'])
+        release_job(job_id)
+        send_slack_text_response(
+            response_url=event.get('response_url', ''),
+            message=f"삭제 워커 {event['shard_id']}의 결과를 기록하지 못했습니다: {e}. "
+                    "다시 삭제를 누르면 남은 리소스부터 재실행합니다.",
+            ephemeral=False
+        )
+        return {'statusCode': 500, 'body': json.dumps({'error': str(e)})}
+    return {'statusCode': 200, 'body': json.dumps({'success': len(results["success"]), 'failed': len(results["failed"])})}
+
+def forget_deleted(success_keys):
+    """삭제에 성공한 리소스("위치:타입:ID" 키)를 인벤토리 스냅샷에서 제거합니다."""
+    deleted = {}
+    for key in success_keys:
+        location, resource_type, resource_id = key.split(":", 2)
+        deleted.setdefault((location, resource_type), []).append(resource_id)
+    for (location, resource_type), resource_ids in deleted.items():
+        remove_from_snapshot(location, resource_type, resource_ids)
+
+def send_delete_result(results, response_url, channel_id=None):
+    # 블록·메시지 제한에 맞춰 나눠서 전송하고, 넘치는 목록은 파일로 첨부
+    messages, omitted = create_resource_delete_messages(results)
+    send_slack_block_messages(response_url, messages)
+    if omitted:
+        listing = "".join(f"failed\t{key}\n" for key in results["failed"]) + \
+                  "".join(f"success\t{key}\n" for key in results["success"])
+        upload_slack_file(channel_id, "delete-results.tsv", listing, title="리소스 삭제 결과 전체 목록")
+
+def delete_handler(event, deadline=None):
     """
     삭제 요청을 처리하는 Lambda 핸들러 함수
+
+    실행 기한이 가까워지면 남은 리소스와 지금까지의 결과를 담아 자기 자신을
+    비동기 호출(continuation)하고, 마지막 호출이 전체 결과를 전송합니다.
     
     Args:
         event: 요청 이벤트 객체
+        deadline: 실행 기한 (util.deadline.Deadline, 없으면 제한 없음)
         
     Returns:
         Lambda 응답 객체
     """
-    print("리소스 삭제 핸들러 시작...")
-    print(f"이벤트: {json.dumps(event)}")
+    log.info("리소스 삭제 핸들러 시작", scan_id=event.get('scan_id') or None,
+             continuation_depth=event.get('continuation_depth', 0))
+    log.payload("이벤트", event)
     
     # 응답 URL 가져오기
     response_url = event.get('response_url', '')
     if not response_url:
-        print("응답 URL이 제공되지 않았습니다.")
+        log.warning("응답 URL이 제공되지 않았습니다.")
         return {
             'statusCode': 400,
             'body': json.dumps({'message': '응답 URL이 제공되지 않았습니다.'})
         }
     
-    # 삭제할 리소스 정보 가져오기
-    resources = event.get('resources', {})
-    if not resources:
-        print("삭제할 리소스 정보가 제공되지 않았습니다.")
+    # 이전 호출에서 넘겨받은 남은 리소스와 결과
+    continuation = load_continuation(event)
+    previous = continuation['results'] if continuation else {"success": [], "failed": []}
+
+    # 삭제할 리소스 정보 가져오기 (스캔 ID가 전달된 경우 저장소에서 조회)
+    resources = continuation['resources'] if continuation else resolve_resource_set(event)
+    # 이전 호출에서 기한 때문에 결과를 받지 못한 리소스 (다시 조회해 확인)
+    unknown = continuation.get('unknown', {}) if continuation else {}
+    if not resources and not unknown:
+        if event.get('scan_id'):
+            message = "삭제할 리소스 목록이 만료되었거나 찾을 수 없습니다. '/cleanup-unattach'로 다시 탐색해주세요."
+        else:
+            message = "삭제할 리소스 정보가 제공되지 않았습니다."
+        log.warning(message)
         send_slack_text_response(
             response_url=response_url,
-            message="삭제할 리소스 정보가 제공되지 않았습니다.",
+            message=message,
             ephemeral=False
         )
         return {
@@ -176,13 +567,68 @@ def delete_handler(event):
             'body': json.dumps({'message': '삭제할 리소스 정보가 제공되지 않았습니다.'})
         }
     
+    # 작업 저널: 중복 클릭은 한 번만 실행하고, 재실행은 이전에 삭제된 리소스를 건너뜀
+    job_id = job_id_for(event)
+    event = {**event, 'job_id': job_id}
+    if continuation:
+        renew_job(job_id)
+    elif not claim_job(job_id):
+        log.info("같은 삭제 작업이 이미 진행 중입니다", job_id=job_id)
+        send_slack_text_response(
+            response_url=response_url,
+            message="같은 리소스에 대한 삭제 작업이 이미 진행 중입니다. 완료되면 결과가 전송됩니다.",
+            ephemeral=False
+        )
+        return {
+            'statusCode': 409,
+            'body': json.dumps({'message': '같은 삭제 작업이 이미 진행 중입니다.'})
+        }
+
+    # 리소스별 결과는 모아 두었다가 다음 호출로 넘기거나 결과를 전송하기 전에 한 번에 저널에 기록
+    journal = ResultJournal(job_id)
     try:
-    
-        results = delete_resources(resources, response_url)
-        send_delete_result(results, response_url)
+        if not continuation:
+            resources, already_deleted = skip_completed(job_id, resources)
+            previous["success"].extend(already_deleted)
+            # 팬아웃: 이 호출은 조정자로서 샤드를 워커 Lambda 에 나눠 주고 종료
+            if DELETE_FANOUT and not can_fan_out():
+                log.warning("DELETE_FANOUT 에는 JOURNAL_BACKEND=s3 또는 dynamodb 가 필요합니다 (현재 %s). "
+                            "이 호출에서 직접 삭제합니다.", JOURNAL_BACKEND)
+            elif DELETE_FANOUT:
+                shards = partition_resources(resources)
+                if len(shards) > 1:
+                    # 워커를 하나도 호출하기 전(팬아웃 기록 실패)에만 이 호출에서 직접 삭제
+                    try:
+                        fan_out_id = start_fan_out(job_id, len(shards), previous)
+                    except Exception as e:
+                        log.warning("팬아웃 실패, 이 호출에서 직접 삭제합니다: %s", e)
+                    else:
+                        # 실행 중 표시는 마지막 워커가 결과를 보낸 뒤 해제
+                        return fan_out_deletes(event, fan_out_id, shards)
+
+        results, remaining, unknown = run_deletes(resources, deadline, journal.record, unknown)
+        journal.flush()
+        results = {
+            "success": previous["success"] + results["success"],
+            "failed": previous["failed"] + results["failed"]
+        }
+        if remaining or unknown:
+            if invoke_continuation(event, {'resources': remaining, 'unknown': unknown, 'results': results}):
+                return {
+                    'statusCode': 202,
+                    'body': json.dumps({'message': '남은 리소스는 다음 호출에서 이어서 삭제합니다.'})
+                }
+            # 이어서 실행할 수 없으면 남은 리소스는 실패로, 결과를 모르는 리소스는 다시 확인해 보고
+            _finish_in_place(results, remaining, unknown, journal.record)
+            journal.flush()
+        release_job(job_id)
+        send_delete_result(results, response_url, event.get('channel_id'))
     
     except Exception as e:
-        print(f"리소스 삭제 중 오류 발생: {str(e)}")
+        log.error("리소스 삭제 중 오류 발생: %s", e, job_id=job_id)
+        # 다시 클릭하면 남은 리소스부터 재실행할 수 있도록 지금까지의 결과를 기록하고 실행 중 표시 해제
+        journal.flush()
+        release_job(job_id)
         
         # 오류 발생 시 슬랙으로 오류 메시지 전송
         send_slack_text_response(
@@ -1,92 +1,339 @@
-import boto3
-import concurrent.futures
+import itertools
+import os
 import time
-from eip.detector import detect_eips
-from eni.detector import detect_enis
-from util.slack import send_slack_block_response
-from util.slack_block import create_resource_detect_blocks
-from typing import Dict, Any, List
-
-def get_all_regions():
-    """Returns a list of all AWS regions."""
-    ec2_client = boto3.client('ec2', region_name='us-east-1')  # Call from default region
-    regions = [region['RegionName'] for region in ec2_client.describe_regions()['Regions']]
+from util.accounts import get_scan_accounts, make_location
+from util.aws import get_client
+from util.deadline import UNKNOWN, Deadline, invoke_continuation, load_continuation, run_until_deadline
+from util.log import get_logger
+from util.metrics import count, timer
+from util.pricing import COST_ESTIMATION, estimate_savings
+from util.progress import ProgressReporter
+from util.protection import get_server_filters, iter_actionable
+from util.records import ResourceRecord, records_from_json, records_to_json
+from util.regions import get_regions
+from util.resource_store import build_delete_button_value
+from util.resource_types import get_resource_type, get_resource_types
+from util.slack import send_slack_block_messages, upload_slack_file
+from util.snapshot import load_fresh_snapshot, save_snapshot
+from util.slack_block import SLACK_MAX_MESSAGES, create_resource_detect_messages, format_resource_listing
+from typing import Callable, Dict, Any, List, Optional, Tuple
+
+log = get_logger('detect_handler')
+
+# Detector paging settings (page size per describe call, optional early-stop limit per region/type)
+DETECT_PAGE_SIZE = int(os.environ.get('DETECT_PAGE_SIZE', '1000'))
+DETECT_MAX_ITEMS: Optional[int] = int(os.environ['DETECT_MAX_ITEMS']) if os.environ.get('DETECT_MAX_ITEMS') else None
+
+# Fan-out sizing: Lambda allocates one full vCPU at 1769 MB, and detection is I/O bound,
+# so each vCPU can keep many threads waiting on the network.
+LAMBDA_MB_PER_VCPU = 1769
+SCAN_THREADS_PER_VCPU = int(os.environ.get('SCAN_THREADS_PER_VCPU', '32'))
+
+# Progressive mode: replace the slash-command response in place with partial
+# results while the scan is still running, then with the final report.
+PROGRESSIVE_RESULTS = os.environ.get('PROGRESSIVE_RESULTS', 'false').lower() == 'true'
+
+def get_all_regions(account_id: Optional[str] = None):
+    """
+    Returns the list of regions to scan in an account (enabled, filtered by
+    INCLUDE/EXCLUDE_REGIONS, cached per account with a TTL).
+    """
+    with timer('RegionDiscoveryTime', Account=account_id):
+        regions = get_regions(account_id=account_id)
+    count('Regions', len(regions), Account=account_id)
     return regions
 
-def search_region_resources(region):
-    """Finds unused resources in a specific region."""
+def get_scan_worker_count(task_count: int) -> int:
+    """
+    Sizes the scan thread pool from the task count and the Lambda CPU allocation.
+
+    SCAN_MAX_WORKERS overrides the computed size. Otherwise the pool gets up to
+    SCAN_THREADS_PER_VCPU threads per allocated vCPU (derived from
+    AWS_LAMBDA_FUNCTION_MEMORY_SIZE), but never more threads than tasks.
+    """
+    override = os.environ.get('SCAN_MAX_WORKERS')
+    if override:
+        return max(1, min(int(override), task_count))
+
+    memory_mb = int(os.environ.get('AWS_LAMBDA_FUNCTION_MEMORY_SIZE', str(LAMBDA_MB_PER_VCPU)))
+    vcpus = max(1.0, memory_mb / LAMBDA_MB_PER_VCPU)
+    return max(1, min(task_count, int(vcpus * SCAN_THREADS_PER_VCPU)))
+
+def get_scan_tasks() -> List[Tuple[Optional[str], str, str]]:
+    """
+    Returns every (account, region, resource type) combination to scan.
+
+    Each registered resource type (util.resource_types) runs as its own task per region,
+    so a slow describe call doesn't hold up the cheap ones in the same region.
+    Opt-in regions differ between accounts, so each account lists its own regions.
+    """
+    resource_types = [resource_type.name for resource_type in get_resource_types()]
+    tasks = []
+    for account_id in get_scan_accounts():
+        try:
+            regions = get_all_regions(account_id)
+        except Exception as e:
+            if account_id is None:
+                raise
+            # The per-task scans report the account's error (e.g. a role that can't be assumed)
+            log.error("Cannot list regions for account %s, using the Lambda account's regions: %s", account_id, e)
+            regions = get_all_regions()
+        tasks.extend((account_id, region, resource_type) for region in regions for resource_type in resource_types)
+    return tasks
+
+def search_region_resource_type(region: str, resource_type: str, account_id: Optional[str] = None) -> Dict[str, Any]:
+    """
+    Runs a single detector in a specific region (of the given account, or the Lambda's own account).
+
+    A snapshot younger than SNAPSHOT_MAX_AGE is returned without calling AWS;
+    otherwise the region is rescanned and the snapshot refreshed.
+    """
+    location = make_location(region, account_id)
+    dimensions = {'Region': region, 'Account': account_id, 'ResourceType': resource_type}
     try:
-        print(f"Searching region {region}...")
-        ec2 = boto3.client('ec2', region_name=region)
-        
-        # Search for unattached EIPs
-        unused_eips = detect_eips(ec2)
-        
-        # Search for unattached ENIs
-        unused_enis = detect_enis(ec2)
-        
-    
-        result = {
+        snapshot = load_fresh_snapshot(location, resource_type)
+        if snapshot is not None:
+            log.debug("Using snapshot for %s in %s", resource_type, location)
+            count('SnapshotHits', **dimensions)
+            count('ResourcesFound', len(snapshot['ids']), **dimensions)
+            return {
+                'region': region,
+                'account': account_id,
+                'type': resource_type,
+                'ids': snapshot['ids'],
+                'records': records_from_json(snapshot.get('records')),
+                'cached': True
+            }
+
+        log.debug("Searching %s in %s...", resource_type, location)
+        scanned_at = time.time()
+        definition = get_resource_type(resource_type)
+        client = get_client(definition.service, region, account_id)
+        # Detectors stream IDs page by page; the raw pages are never kept, only the IDs
+        # and a compact ResourceRecord per resource for rendering and cost estimation.
+        # Protection rules are pushed into the describe filters where possible; the rest
+        # are evaluated on the stream, and the limit counts only actionable resources.
+        records: Dict[str, ResourceRecord] = {}
+        detect_kwargs = definition.related_clients(region, account_id)
+        server_filters = get_server_filters(resource_type)
+        if server_filters:
+            detect_kwargs['filters'] = server_filters
+        with timer('ScanLatency', **dimensions):
+            stream = definition.detect(client, page_size=DETECT_PAGE_SIZE, limit=None, records=records, **detect_kwargs)
+            ids = list(itertools.islice(iter_actionable(resource_type, stream, records), DETECT_MAX_ITEMS))
+        count('ResourcesFound', len(ids), **dimensions)
+        save_snapshot(location, resource_type, ids, scanned_at, records)
+        return {
             'region': region,
-            'eips': unused_eips,
-            'enis': unused_enis
+            'account': account_id,
+            'type': resource_type,
+            'ids': ids,
+            'records': records
         }
-        return result
-            
     except Exception as e:
-        print(f"Error occurred while searching region {region}: {str(e)}")
+        log.error("Error occurred while searching %s in %s: %s", resource_type, location, e)
+        count('ScanErrors', **dimensions)
+        return {
+            'region': region,
+            'account': account_id,
+            'type': resource_type,
+            'ids': [],
+            'error': str(e)
+        }
+
+def search_region_resources(region, account_id: Optional[str] = None):
+    """Finds unused resources in a specific region."""
+    result = {'region': region, 'account': account_id}
+    with timer('RegionScanTime', Region=region, Account=account_id):
+        for resource_type in (definition.name for definition in get_resource_types()):
+            type_result = search_region_resource_type(region, resource_type, account_id)
+            result[resource_type] = type_result['ids']
+            if 'error' in type_result:
+                result['error'] = type_result['error']
+    return result
+
+def _scan_task(account_id: Optional[str], region: str, resource_type: str) -> Dict[str, Any]:
+    try:
+        return search_region_resource_type(region, resource_type, account_id)
+    except Exception as e:
         return {
             'region': region,
-            'eips': [],
-            'enis': [],
+            'account': account_id,
+            'type': resource_type,
+            'ids': [],
             'error': str(e)
         }
 
-def find_unused_resources() -> Dict[str, Dict[str, List[str]] ]:
-    """Asynchronously finds unused resources across all regions."""
-    all_regions = get_all_regions()
-    
-    all_results = []
-    
-    # Use ThreadPoolExecutor for parallel region search
-    with concurrent.futures.ThreadPoolExecutor(max_workers=10) as executor:
-        # Submit tasks for each region
-        future_to_region = {executor.submit(search_region_resources, region): region for region in all_regions}
-        
-        # Collect results
-        for future in concurrent.futures.as_completed(future_to_region):
-            region = future_to_region[future]
-            try:
-                result = future.result()
-                all_results.append(result)
-            except Exception as e:
-                all_results.append({
-                    'region': region,
-                    'eips': [],
-                    'enis': [],
-                    'error': str(e)
-                })
-
-    # Process results into the new format: {"eips": {"region": [...]}...}
+def scan_resources(tasks: List[Tuple[Optional[str], str, str]],
+                   on_result: Optional[Callable[[Dict[str, Any]], None]] = None,
+                   deadline: Optional[Deadline] = None) -> Tuple[List[Dict[str, Any]], List[Tuple[Optional[str], str, str]]]:
+    """
+    Runs the given (account, region, type) scan tasks in parallel until done or until the deadline.
+
+    New tasks stop being scheduled once the deadline's reserve is reached.
+
+    Returns:
+        (per-task results, tasks that were not finished before the deadline)
+    """
+    count('ScanTasks', len(tasks))
+    if not tasks:
+        return [], []
+    with timer('ScanPhaseTime'):
+        outcomes = run_until_deadline(_scan_task, tasks, get_scan_worker_count(len(tasks)), deadline, on_result)
+    # Scans are read-only, so tasks still in flight at the deadline are simply rerun
+    results = [outcome for outcome in outcomes if outcome is not None and outcome is not UNKNOWN]
+    unfinished = [task for task, outcome in zip(tasks, outcomes) if outcome is None or outcome is UNKNOWN]
+    return results, unfinished
+
+def find_unused_resources(tasks: Optional[List[Tuple[Optional[str], str, str]]] = None,
+                          on_result: Optional[Callable[[Dict[str, Any]], None]] = None) -> Dict[str, Dict[str, List[str]] ]:
+    """
+    Asynchronously finds unused resources across all accounts and regions.
+
+    Resources of the Lambda's own account are keyed by region; resources of
+    cross-account targets (TARGET_ROLE_ARNS) are keyed by "<account_id>/<region>".
+
+    Args:
+        tasks: (account, region, type) tuples to scan; defaults to get_scan_tasks()
+        on_result: called with each per-task result as soon as it completes
+    """
+    if tasks is None:
+        tasks = get_scan_tasks()
+    results, _ = scan_resources(tasks, on_result)
+    return merge_scan_results(results)
+
+def scan_inventory(tasks: Optional[List[Tuple[Optional[str], str, str]]] = None,
+                   on_result: Optional[Callable[[Dict[str, Any]], None]] = None
+                   ) -> Tuple[Dict[str, Dict[str, List[str]]], Dict[str, Dict[str, Dict[str, ResourceRecord]]]]:
+    """
+    Like find_unused_resources, but also returns the metadata collected during the scan.
+
+    Returns:
+        (resources, records) where records is {"type": {"location": {"id": ResourceRecord}}}
+    """
+    if tasks is None:
+        tasks = get_scan_tasks()
+    results, _ = scan_resources(tasks, on_result)
+    return merge_scan_results(results), merge_scan_records(results)
+
+def merge_scan_results(all_results: List[Dict[str, Any]]) -> Dict[str, Dict[str, List[str]]]:
+    """Processes per-task results into the format: {"eips": {"location": [...]}...}"""
     all_unused_resources = {}
-    
+
     for result in all_results:
-        region = result['region']
-        if 'error' not in result:
-            if result['eips']:
-                if "eips" not in all_unused_resources:
-                    all_unused_resources["eips"] = {}
-                all_unused_resources["eips"][region] = result['eips']
-            if result['enis']:
-                if "enis" not in all_unused_resources:
-                    all_unused_resources["enis"] = {}
-                all_unused_resources["enis"][region] = result['enis']
-    
+        if 'error' not in result and result['ids']:
+            location = make_location(result['region'], result.get('account'))
+            all_unused_resources.setdefault(result['type'], {})[location] = result['ids']
+
     return all_unused_resources
 
+def merge_scan_records(all_results: List[Dict[str, Any]],
+                       base: Optional[Dict[str, Dict[str, Dict[str, ResourceRecord]]]] = None
+                       ) -> Dict[str, Dict[str, Dict[str, ResourceRecord]]]:
+    """Collects per-resource metadata into the format: {"eips": {"location": {"id": ResourceRecord}}...}"""
+    records = {resource_type: dict(locations) for resource_type, locations in (base or {}).items()}
+    for result in all_results:
+        if 'error' not in result and result.get('records'):
+            location = make_location(result['region'], result.get('account'))
+            records.setdefault(result['type'], {})[location] = result['records']
+    return records
+
+def records_to_state(records: Dict[str, Dict[str, Dict[str, ResourceRecord]]]) -> Dict[str, Dict[str, List[List[Any]]]]:
+    """Converts merged records to JSON-friendly lists for continuation payloads."""
+    return {
+        resource_type: {location: records_to_json(location_records) for location, location_records in locations.items()}
+        for resource_type, locations in records.items()
+    }
+
+def records_from_state(state: Dict[str, Dict[str, List[List[Any]]]]) -> Dict[str, Dict[str, Dict[str, ResourceRecord]]]:
+    """Inverse of records_to_state."""
+    return {
+        resource_type: {location: records_from_json(values) for location, values in locations.items()}
+        for resource_type, locations in state.items()
+    }
+
+def merge_resources(base: Dict[str, Dict[str, List[str]]],
+                    extra: Dict[str, Dict[str, List[str]]]) -> Dict[str, Dict[str, List[str]]]:
+    """Merges two {"type": {"location": [...]}} dicts (used to combine chained invocations)."""
+    merged = {resource_type: dict(locations) for resource_type, locations in base.items()}
+    for resource_type, locations in extra.items():
+        merged.setdefault(resource_type, {}).update(locations)
+    return merged
+
+
+def detect_handler(response_url: str, channel_id: Optional[str] = None,
+                   deadline: Optional[Deadline] = None, event: Optional[Dict[str, Any]] = None):
+    """
+    Scans for unused resources and reports them to Slack.
+
+    When the deadline is near, the remaining scan tasks and the resources found so far
+    are handed to a new asynchronous invocation (continuation), which picks up where this
+    one stopped. If that's not possible, whatever was found is reported as a partial result.
+    """
+    event = event or {'source': 'lambda', 'action': 'detect', 'response_url': response_url, 'channel_id': channel_id}
+    continuation = load_continuation(event)
+    if continuation:
+        tasks = [tuple(task) for task in continuation['pending_tasks']]
+        found = continuation['resources']
+        found_records = records_from_state(continuation.get('records', {}))
+        messages_used = continuation.get('slack_messages_used', 0)
+    else:
+        tasks = get_scan_tasks()
+        found = {}
+        found_records = {}
+        messages_used = 0
+
+    reporter = None
+    if PROGRESSIVE_RESULTS:
+        reporter = ProgressReporter(response_url, len(tasks), used=messages_used, resources=found)
+    results, unfinished = scan_resources(tasks, on_result=reporter.add if reporter else None, deadline=deadline)
+    if reporter:
+        # Progress updates go out on a background thread; let them finish before the
+        # continuation or the final report replaces the same message
+        reporter.close()
+    unused_resources = merge_resources(found, merge_scan_results(results))
+    records = merge_scan_records(results, found_records)
+
+    title = "리소스 목록"
+    if unfinished:
+        state = {
+            'pending_tasks': unfinished,
+            'resources': unused_resources,
+            'records': records_to_state(records),
+            'slack_messages_used': reporter.messages_used if reporter else messages_used
+        }
+        if invoke_continuation(event, state):
+            return
+        title = f"리소스 목록 (일부 - 미완료 {len(unfinished)}개)"
+
+    # Estimated monthly savings; listings are ordered so the most expensive resources come first
+    costs = estimate_savings(unused_resources, records) if COST_ESTIMATION and unused_resources else None
 
-def detect_handler(response_url: str):
-    unused_resources = find_unused_resources()
-    blocks = create_resource_detect_blocks(unused_resources, response_url=response_url)
-    send_slack_block_response(response_url, blocks)
-    
+    # The delete button carries only a short scan ID when a resource store is configured
+    button_value, notice = None, None
+    if unused_resources:
+        try:
+            button_value = build_delete_button_value(unused_resources)
+        except ValueError as e:
+            # Too large to inline and no shared store: list the resources without a delete button
+            log.error("Cannot attach a delete button: %s", e)
+            notice = f"⚠️ 삭제 버튼을 만들 수 없습니다: {e}"
+    # Split into as few messages as Slack's section/block limits allow; progress
+    # updates already used part of the response_url budget
+    max_messages = reporter.remaining_messages if reporter else SLACK_MAX_MESSAGES
+    messages, omitted = create_resource_detect_messages(
+        unused_resources, title=title, button_value=button_value, max_messages=max_messages,
+        costs=costs, records=records, notice=notice
+    )
+    if omitted:
+        # Attach the full list when it doesn't fit in the messages a response_url allows.
+        # The delete button also deletes the omitted resources, so it is only offered
+        # once the full list has reached the channel
+        uploaded = upload_slack_file(channel_id, "unused-resources.tsv", format_resource_listing(unused_resources, costs, records), title="미사용 리소스 전체 목록")
+        if not uploaded and notice is None:
+            log.warning("Full resource list was not attached; sending the report without a delete button")
+            notice = "⚠️ 일부 리소스가 메시지에서 생략되었고 전체 목록을 첨부하지 못해 삭제 버튼을 표시하지 않습니다."
+            messages, omitted = create_resource_detect_messages(
+                unused_resources, title=title, max_messages=max_messages, costs=costs, records=records, notice=notice
+            )
+    send_slack_block_messages(response_url, messages, replace_original=bool(reporter and reporter.messages_used > 0))
@@ -1,64 +1,132 @@
-import json
-import boto3
-import os
-from util.simple_parser import get_slack_command_payload
+from util.simple_parser import EVENT_COMMAND, EVENT_INTERACTION, EVENT_INTERNAL, classify_event
 from util.slack import return_slack_response
-from handler.detect_handler import detect_handler
-from handler.delete_handler import delete_handler, handle_delete_interaction
-from util.simple_parser import parse_body
-from util.simple_parser import get_action_id
-from util.simple_parser import get_slack_interactive_payload
-from handler.command_handler import command_handler
-# AWS Lambda 클라이언트 초기화
-lambda_client = boto3.client('lambda')
+from util.log import get_logger, start_invocation
+from util.metrics import count, flush_metrics
+
+# 핸들러, boto3, AWS 클라이언트는 필요한 경로에서 처음 사용할 때 import·생성합니다.
+# 콜드 스타트에서도 Slack 의 3초 응답 제한 안에 슬래시 커맨드·버튼 클릭에 응답하기 위함이며,
+# import 시간은 bench/import_time.py 로 확인할 수 있습니다.
+
+log = get_logger('lambda_function')
+
+UNSUPPORTED_MESSAGE = "지원되지 않는 요청입니다. '/cleanup-unattach' 명령어를 사용하거나 메시지의 버튼을 클릭해주세요."
+
+
+# --- Slack 요청 (3초 안에 응답해야 하므로 자기 자신을 비동기 호출하고 바로 응답) ---
+
+def route_cleanup_command(command_payload, context):
+    from handler.command_handler import command_handler
+    return command_handler(command_payload)
+
+def route_delete_button(interactive_payload, context):
+    from handler.command_handler import handle_delete_interaction
+    return handle_delete_interaction(interactive_payload)
+
+
+# --- 내부 비동기 호출 (실제 탐지·삭제 작업) ---
+
+def _deadline(context):
+    # 남은 실행 시간 기준 기한 (탐지·삭제 엔진이 새 작업 스케줄링을 멈출 시점)
+    from util.deadline import Deadline
+    return Deadline.from_context(context)
+
+def route_detect(event, context):
+    response_url = event.get('response_url', '')
+    if not response_url:
+        log.warning("Detect 실행에 response_url이 없습니다.")
+        return {"statusCode": 400, "body": "Missing response_url for detect action"}
+    from handler.detect_handler import detect_handler
+    return detect_handler(response_url, event.get('channel_id'), deadline=_deadline(context), event=event)
+
+def route_delete(event, context):
+    response_url = event.get('response_url', '')
+    resources = event.get('resources', {})
+    scan_id = event.get('scan_id', '')
+    continued = event.get('continuation') or event.get('continuation_id')
+    if not (response_url and (resources or scan_id or continued)):
+        log.warning("삭제 실행에 필요한 정보(response_url 또는 resources)가 없습니다.")
+        return {"statusCode": 400, "body": "Missing parameters for delete action"}
+    log.debug("delete_handler 호출")
+    from handler.delete_handler import delete_handler
+    # delete_handler 호출 시 event 형식에 맞게 전달
+    return delete_handler({
+        'source': 'lambda',
+        'action': 'delete',
+        'response_url': response_url,
+        'resources': resources,
+        'scan_id': scan_id,
+        'channel_id': event.get('channel_id'),
+        'continuation': event.get('continuation'),
+        'continuation_id': event.get('continuation_id'),
+        'continuation_depth': event.get('continuation_depth', 0),
+        'job_id': event.get('job_id')
+    }, deadline=_deadline(context))
+
+def route_delete_shard(event, context):
+    # 팬아웃된 삭제 작업의 워커 호출
+    from handler.delete_handler import delete_shard_handler
+    return delete_shard_handler(event, deadline=_deadline(context))
+
+
+# 라우팅 테이블: 새 슬래시 커맨드·버튼·내부 작업은 핸들러 함수를 만들고 여기에 등록합니다.
+# 핸들러는 (페이로드, Lambda context) 를 받습니다.
+COMMAND_ROUTES = {                 # 슬래시 커맨드 → 핸들러
+    '/cleanup-unattach': route_cleanup_command,
+}
+INTERACTION_ROUTES = {             # 첫 번째 action_id → 핸들러
+    'delete': route_delete_button,
+}
+INTERNAL_ROUTES = {                # 내부 호출 action → 핸들러
+    'detect': route_detect,
+    'delete': route_delete,
+    'delete_shard': route_delete_shard,
+}
+
+
+def resolve_route(kind, payload):
+    """
+    이벤트 종류와 페이로드로 라우팅 테이블에서 핸들러를 찾습니다.
+
+    Returns:
+        (핸들러, 라우트 키) 튜플. 등록된 핸들러가 없으면 핸들러는 None
+    """
+    if kind == EVENT_COMMAND:
+        key = payload.get('command')
+        return COMMAND_ROUTES.get(key), key
+    if kind == EVENT_INTERACTION:
+        actions = payload.get('actions') or [{}]
+        key = actions[0].get('action_id') if isinstance(actions[0], dict) else None
+        return INTERACTION_ROUTES.get(key), key
+    if kind == EVENT_INTERNAL:
+        key = payload.get('action')
+        return INTERNAL_ROUTES.get(key), key
+    return None, None
 
 def lambda_handler(event, context):
     """
     메인 Lambda 핸들러 함수
     """
-    print(f"Lambda 함수 호출됨. 이벤트: {json.dumps(event)}")
-
-    # Slack 슬래시 커맨드 처리
-    command_payload = get_slack_command_payload(event)
-    if command_payload and command_payload.get('command') == '/cleanup-unattach':
-        return command_handler(command_payload, lambda_client)
-
-    # Slack 인터랙티브 메시지(버튼 클릭) 처리
-    interactive_payload = get_slack_interactive_payload(event)
-    if interactive_payload:
-        return handle_delete_interaction(interactive_payload)
-
-    # 내부 Lambda 호출 처리 (비동기 실행된 작업)
-    if event.get('source') == 'lambda':
-        action = event.get('action')
-        print(f"내부 Lambda 호출 감지됨. action: {action}")
-        # 비동기 호출 시 전달된 event 로그 출력
-        print(f"내부 호출 이벤트: {json.dumps(event)}") 
-        
-        if action == 'detect':
-            response_url = event.get('response_url', '')
-            if response_url:
-                return detect_handler(response_url)
-            else:
-                print("Detect 실행에 response_url이 없습니다.")
-                return {"statusCode": 400, "body": "Missing response_url for detect action"}
-        elif action == 'delete':
-            response_url = event.get('response_url', '')
-            resources = event.get('resources', {})
-            if response_url and resources:
-                print("delete_handler 호출")
-                # delete_handler 호출 시 event 형식에 맞게 전달
-                return delete_handler({
-                    'response_url': response_url,
-                    'resources': resources
-                })
-            else:
-                print("삭제 실행에 필요한 정보(response_url 또는 resources)가 없습니다.")
-                return {"statusCode": 400, "body": "Missing parameters for delete action"}
-    
-    # 어떤 조건에도 해당하지 않는 경우
-    print("지원되지 않는 요청 타입입니다.")
-    return return_slack_response("지원되지 않는 요청입니다. '/cleanup-unattach' 명령어를 사용하거나 메시지의 버튼을 클릭해주세요.")
-    
-    
+    try:
+        return handle_event(event, context)
+    finally:
+        # 호출 동안 모인 단계별 시간·호출 수를 EMF 로그로 출력
+        flush_metrics()
+
+def handle_event(event, context):
+    """이벤트 종류(슬래시 커맨드, 버튼 클릭, 내부 비동기 호출)를 한 번 판별하고 라우팅 테이블의 핸들러를 호출합니다."""
+    start_invocation(context)
+    # body 는 여기서 한 번만 파싱하며, 내부 호출은 파싱하지 않음
+    kind, payload = classify_event(event)
+    handler, key = resolve_route(kind, payload)
+    log.info("Lambda 함수 호출됨", kind=kind, route=key)
+    log.payload("이벤트", event)
+    count('Requests', Route=f"{kind}:{key}" if handler else 'unsupported')
+
+    if handler is not None:
+        return handler(payload, context)
 
+    # 어떤 라우트에도 해당하지 않는 경우
+    log.warning("지원되지 않는 요청 타입입니다.", kind=kind, route=key)
+    if kind == EVENT_INTERACTION:
+        return return_slack_response("알 수 없는 인터랙션입니다.")
+    return return_slack_response(UNSUPPORTED_MESSAGE)
@@ -0,0 +1,31 @@
+from natgw.detector import is_routed_nat_gateway
+from util.log import get_logger
+from util.throttle import call_with_retry
+
+log = get_logger('natgw.delete')
+
+def delete_nat_gateway(ec2_client, nat_gateway_id):
+    """
+    NAT 게이트웨이를 삭제합니다. 연결된 EIP 는 해제되지 않으며, 삭제 후 미사용 EIP 로 다시 탐지됩니다.
+    스로틀링·일시적 오류는 util.throttle 에서 백오프 후 재시도합니다.
+
+    AWS 는 경로가 가리키는 NAT 게이트웨이도 삭제하므로, 탐지 이후 라우팅 테이블이 바뀌었는지
+    삭제 직전에 다시 확인합니다.
+
+    Args:
+        ec2_client: boto3 EC2 클라이언트
+        nat_gateway_id: 삭제할 NAT 게이트웨이의 ID (예: 'nat-12345')
+
+    Raises:
+        Exception: NAT 게이트웨이가 다시 사용 중이거나 삭제 중 오류가 발생한 경우
+    """
+    try:
+        if is_routed_nat_gateway(ec2_client, nat_gateway_id):
+            raise RuntimeError(f"NAT 게이트웨이 {nat_gateway_id}를 가리키는 경로가 있어 삭제하지 않습니다.")
+        call_with_retry(ec2_client, 'delete_nat_gateway', NatGatewayId=nat_gateway_id)
+        log.debug("✅ NAT 게이트웨이 %s 삭제 성공", nat_gateway_id)
+        return True
+    except Exception as e:
+        log.debug("❌ NAT 게이트웨이 %s 삭제 실패: %s", nat_gateway_id, e)
+        # 예외를 다시 발생시켜 상위 함수에서 처리하도록 함
+        raise
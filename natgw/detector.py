@@ -0,0 +1,93 @@
+from typing import Any, Dict, Iterator, List, Optional
+from util.records import ResourceRecord, describe_records, epoch, tags_from
+from util.throttle import paginate_with_retry
+
+# describe_nat_gateways 의 MaxResults 허용 범위 (5 ~ 1000)
+MIN_PAGE_SIZE = 5
+MAX_PAGE_SIZE = 1000
+# describe_route_tables 의 MaxResults 허용 범위 (5 ~ 100)
+ROUTE_TABLE_PAGE_SIZE = 100
+# 삭제되지 않은 NAT 게이트웨이 상태 (deleting/deleted 는 삭제 후에도 한 시간가량 조회됨)
+LIVE_STATES = ['pending', 'available', 'failed']
+
+def _routed_nat_gateway_ids(ec2_client) -> set:
+    """라우팅 테이블의 경로가 가리키는 NAT 게이트웨이 ID 집합."""
+    pages = paginate_with_retry(
+        ec2_client,
+        'describe_route_tables',
+        PaginationConfig={'PageSize': ROUTE_TABLE_PAGE_SIZE}
+    )
+    return {
+        route['NatGatewayId']
+        for page in pages
+        for route_table in page.get('RouteTables', [])
+        for route in route_table.get('Routes', [])
+        if route.get('NatGatewayId')
+    }
+
+def is_routed_nat_gateway(ec2_client, nat_gateway_id: str) -> bool:
+    """라우팅 테이블의 경로 중 NAT 게이트웨이를 가리키는 것이 있는지 확인합니다 (삭제 직전 재확인용)."""
+    pages = paginate_with_retry(
+        ec2_client,
+        'describe_route_tables',
+        Filters=[{'Name': 'route.nat-gateway-id', 'Values': [nat_gateway_id]}],
+        PaginationConfig={'PageSize': ROUTE_TABLE_PAGE_SIZE}
+    )
+    return any(page.get('RouteTables') for page in pages)
+
+def nat_gateway_record(nat_gateway: Dict[str, Any]) -> ResourceRecord:
+    """describe_nat_gateways 응답 항목에서 레코드를 만듭니다."""
+    public_ips = [address['PublicIp'] for address in nat_gateway.get('NatGatewayAddresses', []) if address.get('PublicIp')]
+    return ResourceRecord(
+        id=nat_gateway['NatGatewayId'],
+        created_at=epoch(nat_gateway.get('CreateTime')),
+        tags=tags_from(nat_gateway.get('Tags')),
+        public_ip=public_ips[0] if public_ips else None,
+        subnet_id=nat_gateway.get('SubnetId'),
+        vpc_id=nat_gateway.get('VpcId')
+    )
+
+def detect_idle_nat_gateways(ec2_client, page_size: int = MAX_PAGE_SIZE, limit: Optional[int] = None,
+                             records: Optional[Dict[str, ResourceRecord]] = None) -> Iterator[str]:
+    """
+    어떤 라우팅 테이블에서도 경로로 사용하지 않는 NAT 게이트웨이 ID를 스트리밍합니다.
+
+    Args:
+        ec2_client: boto3 EC2 클라이언트
+        page_size: 페이지당 요청할 NAT 게이트웨이 수 (5 ~ 1000)
+        limit: 최대 반환 개수 (None이면 전체)
+        records: 주어지면 리소스 ID별 메타데이터(ResourceRecord)를 채웁니다
+
+    Yields:
+        유휴 NAT 게이트웨이의 ID (예: 'nat-12345')
+    """
+    if limit is not None and limit <= 0:
+        return
+
+    routed = _routed_nat_gateway_ids(ec2_client)
+    page_size = max(MIN_PAGE_SIZE, min(MAX_PAGE_SIZE, page_size))
+    pages = paginate_with_retry(
+        ec2_client,
+        'describe_nat_gateways',
+        Filter=[{'Name': 'state', 'Values': ['available']}],
+        PaginationConfig={'PageSize': page_size}
+    )
+
+    count = 0
+    for page in pages:
+        for nat_gateway in page.get('NatGateways', []):
+            if nat_gateway['NatGatewayId'] in routed:
+                continue
+            if records is not None:
+                records[nat_gateway['NatGatewayId']] = nat_gateway_record(nat_gateway)
+            yield nat_gateway['NatGatewayId']
+            count += 1
+            if limit is not None and count >= limit:
+                return
+
+def describe_nat_gateways(ec2_client, nat_gateway_ids: List[str]) -> Dict[str, ResourceRecord]:
+    """NAT 게이트웨이를 ID로 다시 조회해 {ID: 레코드} 를 반환합니다. 삭제 중이거나 삭제된 것은 포함하지 않습니다."""
+    return describe_records(
+        ec2_client, 'describe_nat_gateways', 'NatGateways', 'nat-gateway-id', nat_gateway_ids, nat_gateway_record,
+        filter_param='Filter', filters=[{'Name': 'state', 'Values': LIVE_STATES}]
+    )
@@ -0,0 +1,25 @@
+from util.log import get_logger
+from util.throttle import call_with_retry
+
+log = get_logger('sg.delete')
+
+def delete_security_group(ec2_client, group_id):
+    """
+    보안 그룹을 삭제합니다.
+    스로틀링·일시적 오류는 util.throttle 에서 백오프 후 재시도합니다.
+
+    Args:
+        ec2_client: boto3 EC2 클라이언트
+        group_id: 삭제할 보안 그룹의 ID (예: 'sg-12345')
+
+    Raises:
+        Exception: 보안 그룹 삭제 중 오류가 발생한 경우 (다른 리소스가 참조 중이면 DependencyViolation)
+    """
+    try:
+        call_with_retry(ec2_client, 'delete_security_group', GroupId=group_id)
+        log.debug("✅ 보안 그룹 %s 삭제 성공", group_id)
+        return True
+    except Exception as e:
+        log.debug("❌ 보안 그룹 %s 삭제 실패: %s", group_id, e)
+        # 예외를 다시 발생시켜 상위 함수에서 처리하도록 함
+        raise
@@ -0,0 +1,138 @@
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Set, Tuple
+from util.records import ResourceRecord, describe_records, tags_from
+from util.throttle import paginate_with_retry
+
+# describe_security_groups / describe_network_interfaces 의 MaxResults 허용 범위 (5 ~ 1000)
+MIN_PAGE_SIZE = 5
+MAX_PAGE_SIZE = 1000
+# describe_launch_templates / describe_launch_template_versions 는 최대 200,
+# describe_launch_configurations(MaxRecords) 는 최대 100
+LAUNCH_TEMPLATE_PAGE_SIZE = 200
+LAUNCH_CONFIGURATION_PAGE_SIZE = 100
+
+def _attached_group_ids(ec2_client, page_size: int) -> set:
+    """ENI 에 연결된 보안 그룹 ID 집합 (인스턴스·Lambda·RDS 등은 모두 ENI 를 통해 보안 그룹을 사용)."""
+    pages = paginate_with_retry(
+        ec2_client,
+        'describe_network_interfaces',
+        PaginationConfig={'PageSize': page_size}
+    )
+    return {
+        group['GroupId']
+        for page in pages
+        for eni in page.get('NetworkInterfaces', [])
+        for group in eni.get('Groups', [])
+    }
+
+def _add_group_refs(refs: Iterable[str], ids: Set[str], names: Set[str]) -> None:
+    """ID 또는 이름(기본 VPC 에서 허용)으로 적힌 보안 그룹 참조를 나눠 담습니다."""
+    for ref in refs:
+        (ids if ref.startswith('sg-') else names).add(ref)
+
+def _launch_template_group_refs(ec2_client, page_size: int) -> Tuple[Set[str], Set[str]]:
+    """
+    시작 템플릿이 참조하는 보안 그룹 (ID 집합, 이름 집합).
+    Auto Scaling 그룹이나 EC2 Fleet 은 기본·최신이 아닌 버전을 지정할 수 있으므로 모든 버전을 확인합니다.
+    """
+    ids: Set[str] = set()
+    names: Set[str] = set()
+    page_size = min(LAUNCH_TEMPLATE_PAGE_SIZE, page_size)
+    for page in paginate_with_retry(ec2_client, 'describe_launch_templates', PaginationConfig={'PageSize': page_size}):
+        for template in page.get('LaunchTemplates', []):
+            versions = paginate_with_retry(
+                ec2_client,
+                'describe_launch_template_versions',
+                LaunchTemplateId=template['LaunchTemplateId'],
+                PaginationConfig={'PageSize': page_size}
+            )
+            for version_page in versions:
+                for version in version_page.get('LaunchTemplateVersions', []):
+                    data = version.get('LaunchTemplateData', {})
+                    _add_group_refs(data.get('SecurityGroupIds', []) + data.get('SecurityGroups', []), ids, names)
+                    for interface in data.get('NetworkInterfaces', []):
+                        _add_group_refs(interface.get('Groups', []), ids, names)
+    return ids, names
+
+def _launch_configuration_group_refs(autoscaling_client) -> Tuple[Set[str], Set[str]]:
+    """Auto Scaling 시작 구성이 참조하는 보안 그룹 (ID 집합, 이름 집합)."""
+    ids: Set[str] = set()
+    names: Set[str] = set()
+    pages = paginate_with_retry(
+        autoscaling_client,
+        'describe_launch_configurations',
+        PaginationConfig={'PageSize': LAUNCH_CONFIGURATION_PAGE_SIZE}
+    )
+    for page in pages:
+        for configuration in page.get('LaunchConfigurations', []):
+            _add_group_refs(configuration.get('SecurityGroups', []), ids, names)
+    return ids, names
+
+def security_group_record(group: Dict[str, Any]) -> ResourceRecord:
+    """describe_security_groups 응답 항목에서 레코드를 만듭니다."""
+    return ResourceRecord(
+        id=group['GroupId'],
+        description=group.get('Description') or None,
+        tags=tags_from(group.get('Tags')),
+        vpc_id=group.get('VpcId')
+    )
+
+def detect_orphaned_security_groups(ec2_client, page_size: int = MAX_PAGE_SIZE,
+                                    limit: Optional[int] = None,
+                                    records: Optional[Dict[str, ResourceRecord]] = None,
+                                    autoscaling_client=None) -> Iterator[str]:
+    """
+    어떤 ENI 에도 연결되지 않았고 다른 보안 그룹 규칙, 시작 템플릿, 시작 구성에서도 참조하지 않는
+    보안 그룹 ID를 스트리밍합니다. 지금은 인스턴스가 없어도 Auto Scaling 이 새 인스턴스에 붙일 그룹은
+    사용 중으로 봅니다. VPC 기본 보안 그룹(default)은 삭제할 수 없으므로 제외합니다.
+
+    Args:
+        ec2_client: boto3 EC2 클라이언트
+        page_size: 페이지당 요청할 항목 수 (5 ~ 1000)
+        limit: 최대 반환 개수 (None이면 전체)
+        records: 주어지면 리소스 ID별 메타데이터(ResourceRecord)를 채웁니다
+        autoscaling_client: 같은 리전·계정의 boto3 Auto Scaling 클라이언트 (시작 구성 확인용, 없으면 건너뜀)
+
+    Yields:
+        고아 보안 그룹의 ID (예: 'sg-12345')
+    """
+    if limit is not None and limit <= 0:
+        return
+
+    page_size = max(MIN_PAGE_SIZE, min(MAX_PAGE_SIZE, page_size))
+    in_use = _attached_group_ids(ec2_client, page_size)
+    # 시작 템플릿·시작 구성의 참조 (기본 VPC 그룹은 이름으로도 참조할 수 있으므로 이름도 비교)
+    template_ids, in_use_names = _launch_template_group_refs(ec2_client, page_size)
+    in_use |= template_ids
+    if autoscaling_client is not None:
+        configuration_ids, configuration_names = _launch_configuration_group_refs(autoscaling_client)
+        in_use |= configuration_ids
+        in_use_names |= configuration_names
+
+    # 규칙 참조 여부는 전체 목록을 본 뒤에 알 수 있으므로 후보만 먼저 모음
+    candidates = []
+    for page in paginate_with_retry(ec2_client, 'describe_security_groups', PaginationConfig={'PageSize': page_size}):
+        for group in page.get('SecurityGroups', []):
+            for permission in group.get('IpPermissions', []) + group.get('IpPermissionsEgress', []):
+                for pair in permission.get('UserIdGroupPairs', []):
+                    # 자기 자신을 참조하는 규칙은 사용 중으로 보지 않음
+                    if pair.get('GroupId') and pair['GroupId'] != group['GroupId']:
+                        in_use.add(pair['GroupId'])
+            if group['GroupName'] != 'default' and group['GroupName'] not in in_use_names:
+                candidates.append((group['GroupId'], security_group_record(group) if records is not None else None))
+
+    count = 0
+    for group_id, record in candidates:
+        if group_id in in_use:
+            continue
+        if records is not None:
+            records[group_id] = record
+        yield group_id
+        count += 1
+        if limit is not None and count >= limit:
+            return
+
+def describe_security_groups(ec2_client, group_ids: List[str]) -> Dict[str, ResourceRecord]:
+    """보안 그룹을 ID로 다시 조회해 {ID: 레코드} 를 반환합니다. 이미 삭제된 보안 그룹은 포함되지 않습니다."""
+    return describe_records(
+        ec2_client, 'describe_security_groups', 'SecurityGroups', 'group-id', group_ids, security_group_record
+    )
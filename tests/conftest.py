@@ -0,0 +1,5 @@
+import os
+import sys
+
+# 저장소 루트를 import 경로에 추가 (Lambda 와 같이 util, handler 등을 최상위 패키지로 import)
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
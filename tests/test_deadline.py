@@ -0,0 +1,38 @@
+import threading
+import time
+
+from util.deadline import UNKNOWN, Deadline, run_until_deadline
+
+
+def test_run_until_deadline_without_deadline_runs_everything():
+    seen = []
+    results = run_until_deadline(lambda x: x * 2, [(i,) for i in range(10)], 3, on_result=seen.append)
+    assert results == [i * 2 for i in range(10)]
+    assert sorted(seen) == results
+
+
+def test_run_until_deadline_marks_in_flight_calls_unknown():
+    release = threading.Event()
+
+    def work(slow):
+        if slow:
+            release.wait(5)
+        else:
+            time.sleep(0.05)
+        return slow
+
+    # 남은 시간 1초, 새 작업은 0.5초 전까지만 시작하고 진행 중인 작업은 0.8초 전까지만 기다림
+    deadline = Deadline.after(1.0, reserve=0.5, finalize=0.8)
+    items = [(False,), (True,)] + [(False,)] * 20
+    try:
+        results = run_until_deadline(work, items, 2, deadline)
+    finally:
+        release.set()
+    assert results[1] is UNKNOWN
+    assert results[0] is False
+    assert None in results  # 기한 이후의 작업은 시작하지 않음
+
+
+def test_expired_deadline_starts_nothing():
+    results = run_until_deadline(lambda: 1, [()] * 3, 2, Deadline.after(0.1, reserve=1.0))
+    assert results == [None, None, None]
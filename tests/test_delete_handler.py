@@ -0,0 +1,131 @@
+import json
+
+from handler import delete_handler
+from handler.delete_handler import partition_resources
+
+
+def test_partition_resources_splits_by_location():
+    resources = {
+        "eips": {"us-east-1": ["eipalloc-1"], "111111111111/eu-west-1": ["eipalloc-2"]},
+        "enis": {"us-east-1": ["eni-1"]},
+    }
+    shards = partition_resources(resources, shard_size=10)
+    assert sorted(shards, key=len) == [
+        {"eips": {"111111111111/eu-west-1": ["eipalloc-2"]}},
+        {"eips": {"us-east-1": ["eipalloc-1"]}, "enis": {"us-east-1": ["eni-1"]}},
+    ]
+
+
+def test_partition_resources_chunks_large_locations():
+    resources = {"enis": {"us-east-1": [f"eni-{i}" for i in range(5)]}, "eips": {"us-east-1": ["eipalloc-1"]}}
+    shards = partition_resources(resources, shard_size=2)
+    assert [sum(len(ids) for regions in shard.values() for ids in regions.values()) for shard in shards] == [2, 2, 2]
+    merged = {}
+    for shard in shards:
+        for resource_type, regions in shard.items():
+            merged.setdefault(resource_type, []).extend(regions["us-east-1"])
+    assert merged == {"enis": [f"eni-{i}" for i in range(5)], "eips": ["eipalloc-1"]}
+
+
+def test_partition_resources_empty():
+    assert partition_resources({}) == []
+
+
+def test_skip_completed_drops_deleted_resources(monkeypatch):
+    requested = []
+
+    def fake_load_completed(job_id, keys):
+        requested.append((job_id, list(keys)))
+        return {"us-east-1:eips:eipalloc-1": "success", "us-east-1:enis:eni-1": "success"}
+
+    monkeypatch.setattr(delete_handler, "load_completed", fake_load_completed)
+    resources = {"eips": {"us-east-1": ["eipalloc-1", "eipalloc-2"]}, "enis": {"us-east-1": ["eni-1"]}}
+    pending, already_deleted = delete_handler.skip_completed("job-1", resources)
+
+    assert requested == [("job-1", ["us-east-1:eips:eipalloc-1", "us-east-1:eips:eipalloc-2", "us-east-1:enis:eni-1"])]
+    assert pending == {"eips": {"us-east-1": ["eipalloc-2"]}}
+    assert already_deleted == ["us-east-1:eips:eipalloc-1", "us-east-1:enis:eni-1"]
+
+
+def test_skip_completed_without_journal_entries_returns_resources_unchanged(monkeypatch):
+    monkeypatch.setattr(delete_handler, "load_completed", lambda job_id, keys: {})
+    resources = {"eips": {"us-east-1": ["eipalloc-1"]}}
+    assert delete_handler.skip_completed("job-1", resources) == (resources, [])
+
+
+def test_plan_deletes_fails_unsupported_types():
+    results = {"success": [], "failed": []}
+    tasks, _ = delete_handler.plan_deletes({"widgets": {"us-east-1": ["w-1", "w-2"]}}, results)
+    assert tasks == []
+    assert results == {"success": [], "failed": ["us-east-1:widgets:w-1", "us-east-1:widgets:w-2"]}
+
+
+def test_can_fan_out_requires_shared_journal(monkeypatch, tmp_path):
+    from util.storage import LocalJsonStore
+    monkeypatch.setattr(delete_handler, "get_journal_store", lambda: LocalJsonStore("jobs", directory=str(tmp_path)))
+    monkeypatch.setattr(delete_handler, "LAMBDA_INVOKER", "aws")
+    monkeypatch.setattr(delete_handler, "JOURNAL_BACKEND", "local")
+    assert not delete_handler.can_fan_out()
+    monkeypatch.setattr(delete_handler, "JOURNAL_BACKEND", "dynamodb")
+    assert delete_handler.can_fan_out()
+    monkeypatch.setattr(delete_handler, "JOURNAL_BACKEND", "local")
+    monkeypatch.setattr(delete_handler, "LAMBDA_INVOKER", "local")
+    assert delete_handler.can_fan_out()
+    monkeypatch.setattr(delete_handler, "get_journal_store", lambda: None)
+    assert not delete_handler.can_fan_out()
+
+
+class _Invoker:
+    def __init__(self, fail_shards):
+        self.fail_shards = fail_shards
+        self.invoked = []
+
+    def invoke(self, FunctionName, InvocationType, Payload):
+        shard_id = json.loads(Payload)["shard_id"]
+        if shard_id in self.fail_shards:
+            raise RuntimeError("throttled")
+        self.invoked.append(shard_id)
+
+
+def _fan_out(monkeypatch, tmp_path, invoker):
+    from util import journal
+    from util.storage import LocalJsonStore
+    store = LocalJsonStore("jobs", directory=str(tmp_path))
+    monkeypatch.setattr(journal, "get_journal_store", lambda: store)
+    monkeypatch.setattr(delete_handler, "get_invoker", lambda: invoker)
+    sent = []
+    monkeypatch.setattr(delete_handler, "send_delete_result", lambda results, *args: sent.append(results))
+    shards = [{"eips": {"us-east-1": ["eipalloc-1"]}}, {"eips": {"eu-west-1": ["eipalloc-2"]}}]
+    fan_out_id = journal.start_fan_out("job-1", len(shards), {"success": ["old"], "failed": []})
+    event = {"job_id": "job-1", "response_url": "https://example.invalid", "channel_id": "C1"}
+    delete_handler.fan_out_deletes(event, fan_out_id, shards)
+    return sent
+
+
+def test_fan_out_reports_when_every_worker_invoke_fails(monkeypatch, tmp_path):
+    sent = _fan_out(monkeypatch, tmp_path, _Invoker({0, 1}))
+    assert sent == [{"success": ["old"], "failed": ["us-east-1:eips:eipalloc-1", "eu-west-1:eips:eipalloc-2"]}]
+
+
+def test_fan_out_waits_for_dispatched_workers(monkeypatch, tmp_path):
+    invoker = _Invoker({1})
+    sent = _fan_out(monkeypatch, tmp_path, invoker)
+    assert invoker.invoked == [0]
+    assert sent == []
+
+
+def test_delete_handler_releases_lease_when_setup_fails(monkeypatch):
+    released, sent = [], []
+
+    def fail_skip_completed(job_id, resources):
+        raise RuntimeError("journal unavailable")
+
+    monkeypatch.setattr(delete_handler, "claim_job", lambda job_id: True)
+    monkeypatch.setattr(delete_handler, "release_job", released.append)
+    monkeypatch.setattr(delete_handler, "skip_completed", fail_skip_completed)
+    monkeypatch.setattr(delete_handler, "send_slack_text_response", lambda **kwargs: sent.append(kwargs["message"]))
+    event = {"response_url": "https://example.invalid/response", "resources": {"eips": {"us-east-1": ["eipalloc-1"]}}}
+    response = delete_handler.delete_handler(event)
+    assert response["statusCode"] == 500
+    assert released == [delete_handler.job_id_for(event)]
+    assert "journal unavailable" in sent[0]
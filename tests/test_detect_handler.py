@@ -0,0 +1,53 @@
+from handler.detect_handler import merge_scan_results
+
+
+def test_merge_scan_results_groups_by_type_and_location():
+    results = [
+        {'type': 'eips', 'region': 'us-east-1', 'ids': ['eipalloc-1']},
+        {'type': 'eips', 'region': 'eu-west-1', 'account': '111111111111', 'ids': ['eipalloc-2']},
+        {'type': 'enis', 'region': 'us-east-1', 'ids': []},
+        {'type': 'enis', 'region': 'us-west-2', 'ids': ['eni-1'], 'error': 'AccessDenied'},
+    ]
+    assert merge_scan_results(results) == {
+        'eips': {'us-east-1': ['eipalloc-1'], '111111111111/eu-west-1': ['eipalloc-2']}
+    }
+
+
+def _report_with_omitted_sections(monkeypatch, uploaded):
+    from handler import detect_handler as dh
+
+    results = [{'type': 'eips', 'region': f'region-{i}', 'ids': [f'eipalloc-{i}']} for i in range(300)]
+    sent = []
+    monkeypatch.setattr(dh, 'get_scan_tasks', lambda: [])
+    monkeypatch.setattr(dh, 'scan_resources', lambda tasks, on_result=None, deadline=None: (results, []))
+    monkeypatch.setattr(dh, 'build_delete_button_value', lambda resources: {'scan_id': 'scan-1'})
+    monkeypatch.setattr(dh, 'upload_slack_file', lambda *args, **kwargs: uploaded)
+    monkeypatch.setattr(dh, 'send_slack_block_messages', lambda url, messages, replace_original=False: sent.extend(messages))
+    dh.detect_handler('https://example.invalid/response', channel_id='C1')
+    return [block for message in sent for block in message]
+
+
+def test_detect_handler_drops_delete_button_when_full_list_upload_fails(monkeypatch):
+    blocks = _report_with_omitted_sections(monkeypatch, uploaded=False)
+    assert not any(block['type'] == 'actions' for block in blocks)
+    assert '삭제 버튼을 표시하지 않습니다' in blocks[-1]['text']['text']
+
+
+def test_detect_handler_keeps_confirmed_delete_button_when_full_list_is_attached(monkeypatch):
+    blocks = _report_with_omitted_sections(monkeypatch, uploaded=True)
+    button = [block for block in blocks if block['type'] == 'actions'][0]['elements'][0]
+    assert '총 300개' in button['confirm']['text']['text']
+
+
+def test_scan_tasks_use_each_accounts_regions(monkeypatch):
+    from handler import detect_handler as dh
+
+    account_regions = {None: ['us-east-1'], '111111111111': ['ap-east-1', 'us-east-1']}
+    monkeypatch.setattr(dh, 'get_scan_accounts', lambda: [None, '111111111111'])
+    monkeypatch.setattr(dh, 'get_regions', lambda force_refresh=False, account_id=None: account_regions[account_id])
+    monkeypatch.setattr(dh, 'get_resource_types', lambda: [type('Type', (), {'name': 'eips'})])
+    assert dh.get_scan_tasks() == [
+        (None, 'us-east-1', 'eips'),
+        ('111111111111', 'ap-east-1', 'eips'),
+        ('111111111111', 'us-east-1', 'eips'),
+    ]
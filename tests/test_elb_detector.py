@@ -0,0 +1,72 @@
+import boto3
+import pytest
+from moto import mock_aws
+
+from elb.detector import _forward_target_groups, is_unused_load_balancer
+
+REGION = 'us-east-1'
+
+
+def test_forward_target_groups_reads_single_and_weighted_targets():
+    action = {
+        'Type': 'forward',
+        'TargetGroupArn': 'tg-a',
+        'ForwardConfig': {'TargetGroups': [{'TargetGroupArn': 'tg-a'}, {'TargetGroupArn': 'tg-b'}]},
+    }
+    assert list(_forward_target_groups(action)) == ['tg-a', 'tg-a', 'tg-b']
+    assert list(_forward_target_groups({'Type': 'redirect'})) == []
+
+
+@pytest.fixture
+def alb(monkeypatch):
+    monkeypatch.setenv('AWS_ACCESS_KEY_ID', 'testing')
+    monkeypatch.setenv('AWS_SECRET_ACCESS_KEY', 'testing')
+    monkeypatch.setenv('AWS_DEFAULT_REGION', REGION)
+    with mock_aws():
+        ec2 = boto3.client('ec2', region_name=REGION)
+        elbv2 = boto3.client('elbv2', region_name=REGION)
+        vpc_id = ec2.create_vpc(CidrBlock='10.0.0.0/16')['Vpc']['VpcId']
+        subnets = [
+            ec2.create_subnet(VpcId=vpc_id, CidrBlock=f'10.0.{i}.0/24', AvailabilityZone=f'{REGION}{zone}')['Subnet']['SubnetId']
+            for i, zone in enumerate('ab')
+        ]
+        arn = elbv2.create_load_balancer(Name='alb', Subnets=subnets)['LoadBalancers'][0]['LoadBalancerArn']
+
+        def target_group(name):
+            return elbv2.create_target_group(
+                Name=name, Protocol='HTTP', Port=80, VpcId=vpc_id, TargetType='ip'
+            )['TargetGroups'][0]['TargetGroupArn']
+
+        empty = target_group('empty')
+        listener = elbv2.create_listener(
+            LoadBalancerArn=arn, Protocol='HTTP', Port=80,
+            DefaultActions=[{'Type': 'forward', 'TargetGroupArn': empty}]
+        )['Listeners'][0]['ListenerArn']
+        yield elbv2, arn, listener, target_group
+
+
+def test_load_balancer_forwarding_to_empty_target_group_is_unused(alb):
+    elbv2, arn, _, _ = alb
+    assert is_unused_load_balancer(elbv2, arn)
+
+
+def test_listener_rule_forwarding_to_registered_targets_is_in_use(alb):
+    elbv2, arn, listener, target_group = alb
+    busy = target_group('busy')
+    elbv2.register_targets(TargetGroupArn=busy, Targets=[{'Id': '10.0.0.10'}])
+    elbv2.create_rule(
+        ListenerArn=listener, Priority=1,
+        Conditions=[{'Field': 'path-pattern', 'Values': ['/api/*']}],
+        Actions=[{'Type': 'forward', 'TargetGroupArn': busy}]
+    )
+    assert not is_unused_load_balancer(elbv2, arn)
+
+
+def test_listener_rule_with_fixed_response_is_in_use(alb):
+    elbv2, arn, listener, _ = alb
+    elbv2.create_rule(
+        ListenerArn=listener, Priority=1,
+        Conditions=[{'Field': 'path-pattern', 'Values': ['/health']}],
+        Actions=[{'Type': 'fixed-response', 'FixedResponseConfig': {'StatusCode': '200'}}]
+    )
+    assert not is_unused_load_balancer(elbv2, arn)
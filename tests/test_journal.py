@@ -0,0 +1,42 @@
+import pytest
+
+from util import journal
+from util.storage import LocalJsonStore
+
+
+@pytest.fixture
+def store(tmp_path, monkeypatch):
+    store = LocalJsonStore('jobs', directory=str(tmp_path))
+    monkeypatch.setattr(journal, 'get_journal_store', lambda: store)
+    return store
+
+
+def test_result_journal_writes_once_per_flush(store, monkeypatch):
+    writes = []
+    original = store._write
+    monkeypatch.setattr(store, '_write', lambda key, value: (writes.append(key), original(key, value)))
+
+    results = journal.ResultJournal('job-1')
+    for i in range(50):
+        results.record((f"us-east-1:eips:eipalloc-{i}", i != 3))
+    results.flush()
+    results.flush()
+
+    assert writes == ['job-1/items']
+    completed = journal.load_completed('job-1', ['us-east-1:eips:eipalloc-3', 'us-east-1:eips:eipalloc-4'])
+    assert completed == {'us-east-1:eips:eipalloc-4': 'success'}
+
+
+def test_load_completed_reads_fan_out_shards(store):
+    fan_out_id = journal.start_fan_out('job-1', 2, {'success': [], 'failed': []})
+    for shard_id, key in enumerate(['a:eips:1', 'a:eips:2']):
+        shard = journal.ResultJournal('job-1', fan_out_id, shard_id)
+        shard.record((key, True))
+        shard.flush()
+    main = journal.ResultJournal('job-1')
+    main.record(('a:eips:3', True))
+    main.flush()
+
+    assert journal.load_completed('job-1', ['a:eips:1', 'a:eips:2', 'a:eips:3', 'a:eips:4']) == {
+        'a:eips:1': 'success', 'a:eips:2': 'success', 'a:eips:3': 'success'
+    }
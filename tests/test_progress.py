@@ -0,0 +1,43 @@
+import threading
+import time
+
+from util import progress
+from util.progress import ProgressReporter
+
+
+def _result(i):
+    return {'region': f'region-{i}', 'type': 'eips', 'ids': [f'eipalloc-{i}']}
+
+
+def test_add_hands_sends_to_background_thread(monkeypatch):
+    release = threading.Event()
+    sent = []
+
+    def slow_send(response_url, blocks, replace_original=False):
+        release.wait(2)
+        sent.append(blocks)
+
+    monkeypatch.setattr(progress, 'send_slack_block_response', slow_send)
+    reporter = ProgressReporter('https://example.invalid/response', total=10, max_updates=4, min_interval=0)
+
+    started = time.monotonic()
+    for i in range(3):
+        reporter.add(_result(i))
+    assert time.monotonic() - started < 0.5
+    assert reporter.updates_sent == 3
+
+    release.set()
+    reporter.close()
+    assert len(sent) == 3
+    assert '(3/10)' in sent[-1][0]['text']['text']
+
+
+def test_close_stops_further_updates(monkeypatch):
+    sent = []
+    monkeypatch.setattr(progress, 'send_slack_block_response', lambda url, blocks, replace_original=False: sent.append(blocks))
+    reporter = ProgressReporter('https://example.invalid/response', total=10, max_updates=4, min_interval=0)
+    reporter.add(_result(0))
+    reporter.close()
+    reporter.add(_result(1))
+    assert len(sent) == 1
+    assert reporter.messages_used == 1
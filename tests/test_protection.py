@@ -0,0 +1,60 @@
+import pytest
+
+from util.protection import (
+    InterfaceTypeRule, MinAgeRule, ProtectionRule, RequesterManagedRule, TagRule, build_rule
+)
+from util.records import ResourceRecord
+
+NOW = 1_800_000_000.0
+DAY = 86400
+
+
+def test_tag_rule_matches_value_case_insensitively():
+    rule = TagRule('keep', ['true'])
+    assert rule.protects(ResourceRecord('eni-1', tags=(('keep', 'TRUE'),)), NOW)
+    assert not rule.protects(ResourceRecord('eni-1', tags=(('keep', 'false'),)), NOW)
+    assert not rule.protects(ResourceRecord('eni-1'), NOW)
+
+
+def test_tag_rule_without_values_matches_any_value():
+    rule = TagRule('owner')
+    assert rule.protects(ResourceRecord('eni-1', tags=(('owner', ''),)), NOW)
+
+
+def test_requester_managed_rule():
+    rule = RequesterManagedRule()
+    assert rule.protects(ResourceRecord('eni-1', requester_managed=True), NOW)
+    assert not rule.protects(ResourceRecord('eni-1'), NOW)
+    assert rule.server_filters('enis') == [{'Name': 'requester-managed', 'Values': ['false']}]
+    assert rule.server_filters('eips') == []
+
+
+def test_interface_type_rule_applies_to_enis_only():
+    rule = InterfaceTypeRule(['lambda'])
+    assert rule.protects(ResourceRecord('eni-1', interface_type='lambda'), NOW)
+    assert not rule.protects(ResourceRecord('eni-1', interface_type='interface'), NOW)
+    assert rule.applies_to('enis') and not rule.applies_to('eips')
+
+
+def test_min_age_rule_uses_created_then_attached_time():
+    rule = MinAgeRule(7)
+    assert rule.protects(ResourceRecord('vol-1', created_at=NOW - 6 * DAY), NOW)
+    assert not rule.protects(ResourceRecord('vol-1', created_at=NOW - 8 * DAY), NOW)
+    assert rule.protects(ResourceRecord('eni-1', attached_at=NOW - DAY), NOW)
+    assert not rule.protects(ResourceRecord('eipalloc-1'), NOW)
+
+
+def test_min_age_rule_reports_types_without_timestamps():
+    assert MinAgeRule(7, types=['volumes', 'eips', 'enis']).untimed_types() == ['eips', 'enis']
+    assert MinAgeRule(7, types=['volumes', 'snapshots']).untimed_types() == []
+
+
+def test_build_rule_rejects_unknown_rule():
+    assert isinstance(build_rule({'rule': 'min_age', 'days': 3, 'types': ['volumes']}), MinAgeRule)
+    with pytest.raises(ValueError):
+        build_rule({'rule': 'unknown'})
+
+
+def test_protection_rule_is_abstract():
+    with pytest.raises(TypeError):
+        ProtectionRule()
@@ -0,0 +1,43 @@
+import pytest
+
+from util import regions
+
+
+@pytest.fixture(autouse=True)
+def empty_cache(monkeypatch):
+    monkeypatch.setattr(regions, '_cache', {})
+    monkeypatch.setattr(regions, 'REGION_CACHE_FILE', '')
+
+
+def test_regions_are_described_with_the_account_session(monkeypatch):
+    clients = []
+    monkeypatch.setattr(regions, 'get_client', lambda service, region, account_id=None: clients.append(account_id) or account_id)
+    monkeypatch.setattr(regions, 'call_with_retry', lambda client, api, **kwargs: {
+        'Regions': [{'RegionName': 'us-east-1'}] + ([{'RegionName': 'ap-east-1'}] if client == '111111111111' else [])
+    })
+
+    assert regions.get_enabled_regions() == ['us-east-1']
+    assert regions.get_enabled_regions(account_id='111111111111') == ['ap-east-1', 'us-east-1']
+    assert clients == [None, '111111111111']
+
+
+def test_cache_is_kept_per_account(monkeypatch, tmp_path):
+    calls = []
+
+    def describe(account_id=None):
+        calls.append(account_id)
+        return ['us-east-1'] if account_id is None else ['eu-south-1', 'us-east-1']
+
+    monkeypatch.setattr(regions, '_describe_enabled_regions', describe)
+    monkeypatch.setattr(regions, 'REGION_CACHE_FILE', str(tmp_path / 'regions.json'))
+
+    for _ in range(2):
+        assert regions.get_enabled_regions() == ['us-east-1']
+        assert regions.get_enabled_regions(account_id='222222222222') == ['eu-south-1', 'us-east-1']
+    assert calls == [None, '222222222222']
+
+    # A new container reads both accounts from the cache file
+    monkeypatch.setattr(regions, '_cache', {})
+    assert regions.get_enabled_regions(account_id='222222222222') == ['eu-south-1', 'us-east-1']
+    assert regions.get_enabled_regions() == ['us-east-1']
+    assert calls == [None, '222222222222']
@@ -0,0 +1,29 @@
+import pytest
+
+from util import resource_store
+from util.storage import LocalJsonStore
+
+
+def _resources(count):
+    return {"enis": {"us-east-1": [f"eni-{i:017x}" for i in range(count)]}}
+
+
+def test_small_set_is_inlined_without_store(monkeypatch):
+    monkeypatch.setattr(resource_store, 'RESOURCE_STORE_BACKEND', 'none')
+    assert resource_store.build_delete_button_value(_resources(2)) == {'resources': _resources(2)}
+
+
+def test_oversized_set_without_store_is_refused(monkeypatch):
+    monkeypatch.setattr(resource_store, 'RESOURCE_STORE_BACKEND', 'none')
+    with pytest.raises(ValueError, match='RESOURCE_STORE_BACKEND'):
+        resource_store.build_delete_button_value(_resources(200))
+
+
+def test_store_round_trip_by_scan_id(monkeypatch, tmp_path):
+    store = LocalJsonStore('resource-sets', directory=str(tmp_path))
+    monkeypatch.setattr(resource_store, 'RESOURCE_STORE_BACKEND', 's3')
+    monkeypatch.setattr(resource_store, 'get_resource_store', lambda backend=None: store)
+    value = resource_store.build_delete_button_value(_resources(200))
+    assert set(value) == {'scan_id'}
+    assert resource_store.resolve_resource_set(value) == _resources(200)
+    assert resource_store.resolve_resource_set({'scan_id': 'missing'}) is None
@@ -0,0 +1,45 @@
+import boto3
+import pytest
+from moto import mock_aws
+
+from sg.detector import detect_orphaned_security_groups
+
+REGION = 'us-east-1'
+
+
+@pytest.fixture
+def clients(monkeypatch):
+    monkeypatch.setenv('AWS_ACCESS_KEY_ID', 'testing')
+    monkeypatch.setenv('AWS_SECRET_ACCESS_KEY', 'testing')
+    monkeypatch.setenv('AWS_DEFAULT_REGION', REGION)
+    with mock_aws():
+        yield boto3.client('ec2', region_name=REGION), boto3.client('autoscaling', region_name=REGION)
+
+
+def _group(ec2, vpc_id, name):
+    return ec2.create_security_group(GroupName=name, Description=name, VpcId=vpc_id)['GroupId']
+
+
+def test_groups_referenced_by_launch_templates_and_configurations_are_in_use(clients):
+    ec2, autoscaling = clients
+    vpc_id = ec2.create_vpc(CidrBlock='10.0.0.0/16')['Vpc']['VpcId']
+    orphan = _group(ec2, vpc_id, 'orphan')
+    latest = _group(ec2, vpc_id, 'template-latest')
+    old_version = _group(ec2, vpc_id, 'template-old-version')
+    configured = _group(ec2, vpc_id, 'launch-configuration')
+
+    template_id = ec2.create_launch_template(
+        LaunchTemplateName='app', LaunchTemplateData={'SecurityGroupIds': [old_version]}
+    )['LaunchTemplate']['LaunchTemplateId']
+    ec2.create_launch_template_version(
+        LaunchTemplateId=template_id,
+        LaunchTemplateData={'NetworkInterfaces': [{'DeviceIndex': 0, 'Groups': [latest]}]}
+    )
+    autoscaling.create_launch_configuration(
+        LaunchConfigurationName='app', ImageId='ami-12345678', InstanceType='t3.micro', SecurityGroups=[configured]
+    )
+
+    found = set(detect_orphaned_security_groups(ec2, autoscaling_client=autoscaling))
+    assert orphan in found
+    assert not found & {latest, old_version, configured}
+
@@ -0,0 +1,65 @@
+from util.slack_block import MESSAGE_BLOCK_LIMIT, _section_block, create_resource_detect_messages, paginate_blocks
+
+
+def _blocks(count):
+    return [_section_block(f"line {i}") for i in range(count)]
+
+
+def test_paginate_blocks_fits_in_one_message():
+    header = [_section_block("header")]
+    footer = [{"type": "divider"}]
+    messages, omitted = paginate_blocks(header, _blocks(3), footer)
+    assert omitted == 0
+    assert messages == [header + _blocks(3) + footer]
+
+
+def test_paginate_blocks_splits_and_keeps_footer_on_last_message():
+    footer = [{"type": "divider"}, {"type": "actions", "elements": []}]
+    messages, omitted = paginate_blocks([], _blocks(120), footer, continuation_title="계속")
+    assert omitted == 0
+    assert len(messages) > 1
+    assert all(len(message) <= MESSAGE_BLOCK_LIMIT for message in messages)
+    assert messages[-1][-2:] == footer
+    assert all(footer[1] not in message for message in messages[:-1])
+    for message in messages[1:]:
+        assert message[0]["type"] == "header"
+        assert message[0]["text"]["text"] == "계속"
+    listed = [block for message in messages for block in message if block["type"] == "section"]
+    assert listed == _blocks(120)
+
+
+def test_paginate_blocks_omits_blocks_beyond_max_messages():
+    messages, omitted = paginate_blocks([], _blocks(200), max_messages=2)
+    assert len(messages) == 2
+    assert omitted > 0
+    assert "생략했습니다" in messages[-1][-1]["text"]["text"]
+    kept = sum(1 for message in messages for block in message if block["text"]["text"].startswith("line"))
+    assert kept + omitted == 200
+
+
+def _many_resources(count):
+    return {"eips": {f"region-{i}": [f"eipalloc-{i}"] for i in range(count)}}
+
+
+def _delete_button(messages):
+    actions = [block for block in messages[-1] if block["type"] == "actions"]
+    return actions[0]["elements"][0] if actions else None
+
+
+def test_delete_button_confirms_full_count_when_sections_are_omitted():
+    messages, omitted = create_resource_detect_messages(_many_resources(120), max_messages=1)
+    assert omitted > 0
+    confirm = _delete_button(messages)["confirm"]
+    assert "총 120개" in confirm["text"]["text"]
+
+
+def test_delete_button_has_no_confirm_when_everything_is_listed():
+    messages, omitted = create_resource_detect_messages(_many_resources(3))
+    assert omitted == 0
+    assert "confirm" not in _delete_button(messages)
+
+
+def test_notice_replaces_delete_button():
+    messages, _ = create_resource_detect_messages(_many_resources(120), max_messages=1, notice="안내")
+    assert _delete_button(messages) is None
+    assert messages[-1][-1]["text"]["text"] == "안내"
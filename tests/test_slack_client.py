@@ -0,0 +1,69 @@
+import http.server
+import threading
+import time
+
+import pytest
+
+from util.slack import SlackClient
+
+
+class _Handler(http.server.BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    responses = []
+    seen = []
+
+    def do_POST(self):
+        self.rfile.read(int(self.headers.get("Content-Length", 0)))
+        self.seen.append(self.path)
+        status, delay = self.responses.pop(0) if self.responses else (200, 0)
+        time.sleep(delay)
+        body = b"ok"
+        self.send_response(status)
+        self.send_header("Content-Length", str(len(body)))
+        if status == 429:
+            self.send_header("Retry-After", "0")
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def server():
+    _Handler.responses, _Handler.seen = [], []
+    httpd = http.server.ThreadingHTTPServer(("127.0.0.1", 0), _Handler)
+    thread = threading.Thread(target=httpd.serve_forever, daemon=True)
+    thread.start()
+    yield f"http://127.0.0.1:{httpd.server_address[1]}"
+    httpd.shutdown()
+    httpd.server_close()
+
+
+def test_request_retries_retryable_status(server):
+    _Handler.responses = [(503, 0), (429, 0)]
+    client = SlackClient(timeout=2, max_retries=3, send_budget=10)
+    status, body = client.request("POST", f"{server}/hook", body=b"{}")
+    assert (status, body) == (200, b"ok")
+    assert len(_Handler.seen) == 3
+
+
+def test_request_does_not_resend_post_after_read_timeout(server):
+    _Handler.responses = [(200, 0.5)]
+    client = SlackClient(timeout=0.1, max_retries=3, send_budget=10)
+    with pytest.raises(TimeoutError):
+        client.request("POST", f"{server}/hook", body=b"{}")
+    time.sleep(0.6)
+    assert _Handler.seen == ["/hook"]
+
+
+def test_slow_request_does_not_block_other_threads(server):
+    _Handler.responses = [(200, 0.5)]
+    client = SlackClient(timeout=2)
+    slow = threading.Thread(target=client.request, args=("POST", f"{server}/slow", b"{}"))
+    slow.start()
+    time.sleep(0.1)
+    started = time.monotonic()
+    client.request("POST", f"{server}/fast", body=b"{}")
+    assert time.monotonic() - started < 0.3
+    slow.join()
@@ -0,0 +1,70 @@
+import pytest
+
+from util import snapshot
+from util.storage import LocalJsonStore
+
+
+class FailingStore:
+    def get(self, key):
+        raise ConnectionError('timeout')
+
+
+@pytest.fixture
+def store(tmp_path, monkeypatch):
+    store = LocalJsonStore('snapshots', directory=str(tmp_path))
+    # 테스트에서는 로컬 저장소를 공유 백엔드처럼 사용
+    monkeypatch.setattr(snapshot, 'SNAPSHOT_BACKEND', 's3')
+    monkeypatch.setattr(snapshot, 'SNAPSHOT_VERIFY_DELETE', True)
+    monkeypatch.setattr(snapshot, 'get_snapshot_store', lambda: store)
+    return store
+
+
+def _fail():
+    raise RuntimeError('describe failed')
+
+
+def test_verify_allows_only_ids_in_snapshot(store):
+    snapshot.save_snapshot('us-east-1', 'eips', ['eipalloc-1', 'eipalloc-2'])
+    allowed, rejected = snapshot.verify_against_snapshot(
+        'us-east-1', 'eips', ['eipalloc-1', 'eipalloc-3'], live_unused=_fail
+    )
+    assert allowed == ['eipalloc-1']
+    assert rejected == ['eipalloc-3']
+
+
+def test_verify_falls_back_to_live_check_without_snapshot(store):
+    allowed, rejected = snapshot.verify_against_snapshot(
+        'us-east-1', 'eips', ['eipalloc-1', 'eipalloc-3'], live_unused=lambda: ['eipalloc-3']
+    )
+    assert allowed == ['eipalloc-3']
+    assert rejected == ['eipalloc-1']
+
+
+def test_verify_falls_back_to_live_check_when_lookup_fails(monkeypatch, store):
+    monkeypatch.setattr(snapshot, 'get_snapshot_store', lambda: FailingStore())
+    allowed, rejected = snapshot.verify_against_snapshot(
+        'us-east-1', 'eips', ['eipalloc-1'], live_unused=lambda: ['eipalloc-1']
+    )
+    assert allowed == ['eipalloc-1']
+    assert rejected == []
+
+
+def test_verify_rejects_all_when_no_check_is_possible(store):
+    assert snapshot.verify_against_snapshot('us-east-1', 'eips', ['eipalloc-1']) == ([], ['eipalloc-1'])
+    assert snapshot.verify_against_snapshot('us-east-1', 'eips', ['eipalloc-1'], live_unused=_fail) == \
+        ([], ['eipalloc-1'])
+
+
+def test_verify_ignores_non_shared_backend(monkeypatch, store):
+    snapshot.save_snapshot('us-east-1', 'eips', ['eipalloc-1'])
+    monkeypatch.setattr(snapshot, 'SNAPSHOT_BACKEND', 'local')
+    allowed, rejected = snapshot.verify_against_snapshot(
+        'us-east-1', 'eips', ['eipalloc-1', 'eipalloc-2'], live_unused=lambda: ['eipalloc-2']
+    )
+    assert allowed == ['eipalloc-2']
+    assert rejected == ['eipalloc-1']
+
+
+def test_verify_disabled_allows_everything(monkeypatch, store):
+    monkeypatch.setattr(snapshot, 'SNAPSHOT_VERIFY_DELETE', False)
+    assert snapshot.verify_against_snapshot('us-east-1', 'eips', ['eipalloc-1']) == (['eipalloc-1'], [])
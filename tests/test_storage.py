@@ -0,0 +1,52 @@
+import threading
+import time
+
+import pytest
+
+from util.storage import LocalJsonStore, SqliteStore
+
+
+@pytest.fixture(params=['local', 'sqlite'])
+def store(request, tmp_path):
+    if request.param == 'local':
+        return LocalJsonStore('test', directory=str(tmp_path))
+    return SqliteStore('test', path=str(tmp_path / 'kv.db'))
+
+
+def test_put_if_absent_only_first_writer_wins(store):
+    assert store.put_if_absent('lease', {'owner': 1})
+    assert not store.put_if_absent('lease', {'owner': 2})
+    assert store.get('lease') == {'owner': 1}
+
+
+def test_put_if_absent_replaces_expired_value(store, monkeypatch):
+    assert store.put_if_absent('lease', {'owner': 1}, ttl=10)
+    now = time.time()
+    monkeypatch.setattr(time, 'time', lambda: now + 11)
+    assert store.put_if_absent('lease', {'owner': 2}, ttl=10)
+    assert store.get('lease') == {'owner': 2}
+
+
+def test_put_if_absent_is_atomic_across_threads(store):
+    winners = []
+    barrier = threading.Barrier(8)
+
+    def claim(owner):
+        barrier.wait()
+        if store.put_if_absent('lease', {'owner': owner}):
+            winners.append(owner)
+
+    threads = [threading.Thread(target=claim, args=(owner,)) for owner in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert len(winners) == 1
+    assert store.get('lease') == {'owner': winners[0]}
+
+
+def test_get_drops_expired_value(store, monkeypatch):
+    store.put('key', {'value': 1}, ttl=5)
+    now = time.time()
+    monkeypatch.setattr(time, 'time', lambda: now + 6)
+    assert store.get('key') is None
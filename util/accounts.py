@@ -0,0 +1,56 @@
+import os
+from typing import Dict, List, Optional, Tuple
+
+from util.log import get_logger
+
+log = get_logger('accounts')
+
+# 리소스 딕셔너리의 위치 키 구분자: "<계정 ID>/<리전>"
+# 실행 계정의 리소스는 기존과 같이 리전 이름만 키로 사용합니다.
+LOCATION_SEPARATOR = '/'
+
+def get_role_arns() -> Dict[str, str]:
+    """
+    TARGET_ROLE_ARNS(쉼표 구분)에 설정된 교차 계정 역할 ARN을 계정 ID별로 반환합니다.
+
+    예: "arn:aws:iam::111111111111:role/CleanupRole,arn:aws:iam::222222222222:role/CleanupRole"
+    """
+    role_arns = {}
+    for role_arn in os.environ.get('TARGET_ROLE_ARNS', '').split(','):
+        role_arn = role_arn.strip()
+        if not role_arn:
+            continue
+        parts = role_arn.split(':')
+        if len(parts) < 6 or not parts[4]:
+            log.warning("잘못된 역할 ARN을 무시합니다: %s", role_arn)
+            continue
+        role_arns[parts[4]] = role_arn
+    return role_arns
+
+def get_role_arn(account_id: str) -> Optional[str]:
+    return get_role_arns().get(account_id)
+
+def get_scan_accounts() -> List[Optional[str]]:
+    """
+    스캔 대상 계정 목록을 반환합니다. None 은 Lambda 실행 계정을 뜻합니다.
+
+    SCAN_LOCAL_ACCOUNT=false 이면 TARGET_ROLE_ARNS 의 계정만 스캔합니다.
+    """
+    accounts: List[Optional[str]] = []
+    if os.environ.get('SCAN_LOCAL_ACCOUNT', 'true').lower() != 'false':
+        accounts.append(None)
+    accounts.extend(get_role_arns().keys())
+    return accounts
+
+def make_location(region: str, account_id: Optional[str] = None) -> str:
+    """리전과 계정 ID로 리소스 딕셔너리의 위치 키를 만듭니다."""
+    if account_id:
+        return f"{account_id}{LOCATION_SEPARATOR}{region}"
+    return region
+
+def split_location(location: str) -> Tuple[Optional[str], str]:
+    """위치 키를 (계정 ID, 리전) 으로 분리합니다. 실행 계정이면 계정 ID는 None 입니다."""
+    if LOCATION_SEPARATOR in location:
+        account_id, region = location.split(LOCATION_SEPARATOR, 1)
+        return account_id, region
+    return None, location
@@ -0,0 +1,163 @@
+import os
+import threading
+import time
+from typing import TYPE_CHECKING, Any, Dict, Optional, Tuple
+
+from util.accounts import get_role_arn
+from util.log import get_logger
+from util.throttle import register_client_scope
+
+if TYPE_CHECKING:
+    import boto3
+
+log = get_logger('aws')
+
+# 클라이언트 연결 풀 설정
+# 워커 스레드가 같은 리전 클라이언트를 공유하므로 풀 크기를 워커 수 이상으로 둡니다.
+MAX_POOL_CONNECTIONS = int(os.environ.get('AWS_MAX_POOL_CONNECTIONS', '32'))
+CONNECT_TIMEOUT = float(os.environ.get('AWS_CONNECT_TIMEOUT', '5'))
+READ_TIMEOUT = float(os.environ.get('AWS_READ_TIMEOUT', '30'))
+
+# AssumeRole 설정
+ASSUME_ROLE_SESSION_NAME = os.environ.get('ASSUME_ROLE_SESSION_NAME', 'delete-unattach-resource')
+ASSUME_ROLE_DURATION = int(os.environ.get('ASSUME_ROLE_DURATION', '3600'))  # 초
+ASSUME_ROLE_EXTERNAL_ID = os.environ.get('ASSUME_ROLE_EXTERNAL_ID', '')
+CREDENTIAL_REFRESH_MARGIN = 300  # 만료 5분 전에 자격 증명을 갱신
+
+# 모듈 수준 캐시: 웜 컨테이너에서는 호출 간에 재사용됩니다.
+# 계정 ID가 None 이면 Lambda 가 실행 중인 계정(기본 자격 증명)을 뜻합니다.
+# boto3 는 import 에만 100ms 이상 걸리므로 처음 세션이 필요할 때 import 합니다.
+_session: Optional['boto3.session.Session'] = None
+_account_sessions: Dict[str, Tuple['boto3.session.Session', float]] = {}  # 계정 ID -> (세션, 만료 시각)
+_clients: Dict[Tuple[str, Optional[str], Optional[str]], Tuple['boto3.session.Session', object]] = {}
+_client_config: Any = None
+# 캐시 조회는 잠금 없이 하고, 만들 때만 계정별 잠금을 잡아 AssumeRole·클라이언트 생성이 다른 계정을 막지 않게 합니다.
+# _lock 은 기본 세션과 계정별 잠금 딕셔너리만 보호합니다.
+_lock = threading.Lock()
+_account_locks: Dict[Optional[str], threading.RLock] = {}
+
+def _account_lock(account_id: Optional[str]) -> threading.RLock:
+    """계정의 세션·클라이언트를 만들 때 잡는 잠금 (boto3 세션은 스레드 안전하지 않으므로 세션별로 직렬화)."""
+    lock = _account_locks.get(account_id)
+    if lock is None:
+        with _lock:
+            lock = _account_locks.setdefault(account_id, threading.RLock())
+    return lock
+
+def get_client_config():
+    """모든 클라이언트가 공유하는 botocore Config (처음 호출할 때 생성)."""
+    global _client_config
+    if _client_config is None:
+        from botocore.config import Config
+        _client_config = Config(
+            max_pool_connections=MAX_POOL_CONNECTIONS,
+            connect_timeout=CONNECT_TIMEOUT,
+            read_timeout=READ_TIMEOUT,
+            tcp_keepalive=True,
+            # 스로틀링 재시도는 util.throttle 에서 처리하므로 botocore 재시도는 최소화
+            retries={'mode': 'standard', 'max_attempts': 2},
+        )
+    return _client_config
+
+def get_session() -> 'boto3.session.Session':
+    """
+    공유 boto3 세션을 반환합니다.
+
+    boto3 세션은 스레드 안전하지 않으므로 기본 세션(boto3.client)을 쓰지 않고
+    전용 세션을 만들어 잠금 안에서만 클라이언트 생성에 사용합니다.
+    """
+    global _session
+    if _session is not None:
+        return _session
+    with _lock:
+        if _session is None:
+            import boto3
+            _session = boto3.session.Session()
+        return _session
+
+def _assume_role(account_id: str) -> Tuple['boto3.session.Session', float]:
+    """대상 계정의 역할을 AssumeRole 하여 세션과 만료 시각(epoch 초)을 반환합니다."""
+    role_arn = get_role_arn(account_id)
+    if not role_arn:
+        raise ValueError(f"계정 {account_id}에 대한 역할 ARN이 설정되지 않았습니다.")
+
+    params = {
+        'RoleArn': role_arn,
+        'RoleSessionName': ASSUME_ROLE_SESSION_NAME,
+        'DurationSeconds': ASSUME_ROLE_DURATION,
+    }
+    if ASSUME_ROLE_EXTERNAL_ID:
+        params['ExternalId'] = ASSUME_ROLE_EXTERNAL_ID
+    credentials = get_client('sts', os.environ.get('AWS_REGION')).assume_role(**params)['Credentials']
+    log.info("계정 %s 역할 AssumeRole 성공 (만료: %s)", account_id, credentials['Expiration'])
+
+    import boto3
+    session = boto3.session.Session(
+        aws_access_key_id=credentials['AccessKeyId'],
+        aws_secret_access_key=credentials['SecretAccessKey'],
+        aws_session_token=credentials['SessionToken'],
+    )
+    return session, credentials['Expiration'].timestamp()
+
+def get_account_session(account_id: Optional[str] = None) -> 'boto3.session.Session':
+    """
+    계정별 세션을 반환합니다. 교차 계정 자격 증명은 만료 직전까지 캐시됩니다.
+
+    Args:
+        account_id: 대상 계정 ID (None이면 Lambda 실행 계정)
+    """
+    if account_id is None:
+        return get_session()
+    cached = _account_sessions.get(account_id)
+    if cached is not None and cached[1] - time.time() >= CREDENTIAL_REFRESH_MARGIN:
+        return cached[0]
+    with _account_lock(account_id):
+        # 잠금을 기다리는 동안 다른 스레드가 갱신했을 수 있으므로 다시 확인
+        cached = _account_sessions.get(account_id)
+        if cached is None or cached[1] - time.time() < CREDENTIAL_REFRESH_MARGIN:
+            cached = _assume_role(account_id)
+            _account_sessions[account_id] = cached
+        return cached[0]
+
+def get_client(service: str, region: Optional[str] = None, account_id: Optional[str] = None):
+    """
+    서비스·리전·계정별로 캐시된 boto3 클라이언트를 반환합니다.
+
+    생성된 클라이언트는 스레드 안전하며 HTTP 연결 풀(keep-alive)을 유지하므로,
+    같은 컨테이너의 이후 호출에서는 클라이언트 생성과 TCP/TLS 핸드셰이크를 생략합니다.
+    교차 계정 자격 증명이 갱신되면 해당 계정의 클라이언트도 새로 만듭니다.
+
+    Args:
+        service: AWS 서비스 이름 (예: 'ec2', 'lambda')
+        region: 리전 이름 (None이면 기본 리전)
+        account_id: 대상 계정 ID (None이면 Lambda 실행 계정)
+
+    Returns:
+        boto3 클라이언트
+    """
+    key = (service, region, account_id)
+    session = get_account_session(account_id)
+    cached = _clients.get(key)
+    if cached is not None and cached[0] is session:
+        return cached[1]
+
+    with _account_lock(account_id):
+        session = get_account_session(account_id)
+        cached = _clients.get(key)
+        if cached is not None and cached[0] is session:
+            return cached[1]
+
+        client = session.client(service, region_name=region, config=get_client_config())
+        if account_id is not None:
+            # 스로틀링 버킷을 계정별로 분리
+            register_client_scope(client, account_id)
+        _clients[key] = (session, client)
+        return client
+
+def clear_clients() -> None:
+    """캐시된 세션과 클라이언트를 모두 비웁니다 (자격 증명 교체 등)."""
+    global _session
+    with _lock:
+        _clients.clear()
+        _account_sessions.clear()
+        _session = None
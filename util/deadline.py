@@ -0,0 +1,194 @@
+import concurrent.futures
+import json
+import math
+import os
+import secrets
+import time
+from typing import Any, Callable, Dict, List, Optional, Sequence
+
+from util.log import get_logger
+from util.storage import get_store
+
+log = get_logger('deadline')
+
+# 실행 기한 설정
+# DEADLINE_RESERVE_SECONDS: 남은 시간이 이보다 적으면 새 작업을 시작하지 않음
+# DEADLINE_FINALIZE_SECONDS: 진행 중인 호출은 남은 시간이 이만큼 될 때까지만 기다림 (결과 전송·재호출용)
+DEADLINE_RESERVE_SECONDS = float(os.environ.get('DEADLINE_RESERVE_SECONDS', '30'))
+DEADLINE_FINALIZE_SECONDS = float(os.environ.get('DEADLINE_FINALIZE_SECONDS', '10'))
+
+# 이어서 실행(continuation) 설정
+MAX_CONTINUATIONS = int(os.environ.get('MAX_CONTINUATIONS', '10'))
+# 비동기 호출 페이로드는 256KB 로 제한되므로 큰 상태는 저장소에 두고 ID만 전달
+CONTINUATION_INLINE_LIMIT = int(os.environ.get('CONTINUATION_INLINE_LIMIT', '200000'))
+CONTINUATION_BACKEND = os.environ.get('CONTINUATION_BACKEND', os.environ.get('RESOURCE_STORE_BACKEND', 'none'))
+CONTINUATION_TTL = 3600  # 초
+
+# run_until_deadline 결과에서 호출은 시작했지만 기한 안에 끝나지 않은 작업 자리의 값.
+# 이런 호출은 컨테이너가 멈췄다가 다음 호출에서 이어서 끝날 수 있으므로,
+# 다시 실행하지 말고 실제 결과를 다시 확인해야 합니다.
+UNKNOWN = object()
+
+
+class Deadline:
+    """
+    Lambda context 의 남은 실행 시간을 기준으로 작업 스케줄링을 멈출 시점을 알려줍니다.
+    context 가 없으면(로컬 실행 등) 기한이 없는 것으로 취급합니다.
+    """
+
+    def __init__(self, remaining_ms: Optional[Callable[[], int]] = None,
+                 reserve: float = DEADLINE_RESERVE_SECONDS,
+                 finalize: float = DEADLINE_FINALIZE_SECONDS):
+        self._remaining_ms = remaining_ms
+        self.reserve = reserve
+        self.finalize = finalize
+
+    @classmethod
+    def from_context(cls, context) -> 'Deadline':
+        return cls(getattr(context, 'get_remaining_time_in_millis', None))
+
+    @classmethod
+    def after(cls, seconds: float, **kwargs) -> 'Deadline':
+        """지금부터 seconds 초 뒤에 끝나는 기한 (테스트·로컬 실행용)."""
+        end = time.monotonic() + seconds
+        return cls(lambda: int((end - time.monotonic()) * 1000), **kwargs)
+
+    @property
+    def limited(self) -> bool:
+        return self._remaining_ms is not None
+
+    def remaining(self) -> float:
+        """Lambda 가 종료될 때까지 남은 시간(초)."""
+        if self._remaining_ms is None:
+            return math.inf
+        return self._remaining_ms() / 1000
+
+    def expired(self) -> bool:
+        """새 작업을 시작하면 안 되는 시점이면 True."""
+        return self.remaining() <= self.reserve
+
+    def wait_timeout(self) -> Optional[float]:
+        """진행 중인 작업을 기다릴 수 있는 최대 시간(초). 기한이 없으면 None."""
+        if self._remaining_ms is None:
+            return None
+        return max(0.0, self.remaining() - self.finalize)
+
+
+def run_until_deadline(func: Callable, items: Sequence[Sequence[Any]], max_workers: int,
+                       deadline: Optional[Deadline] = None,
+                       on_result: Optional[Callable[[Any], None]] = None) -> List[Any]:
+    """
+    items 의 각 인자 묶음으로 func 를 스레드 풀에서 실행합니다.
+
+    작업은 워커 수만큼만 미리 제출하고 하나가 끝날 때마다 다음 작업을 제출하므로,
+    기한이 가까워지면(reserve) 새 작업을 더 시작하지 않습니다. 진행 중인 호출은
+    결과 전송·재호출에 쓸 finalize 여유 시간을 남기고 Deadline.wait_timeout() 동안 기다립니다.
+
+    Returns:
+        items 와 같은 순서의 결과 리스트. 시작하지 않은 작업의 자리는 None,
+        시작했지만 기다리는 동안 끝나지 않은 작업의 자리는 UNKNOWN
+    """
+    deadline = deadline or Deadline()
+    results: List[Any] = [None] * len(items)
+    remaining = iter(enumerate(items))
+    pending: Dict[concurrent.futures.Future, int] = {}
+    executor = concurrent.futures.ThreadPoolExecutor(max_workers=max(1, max_workers))
+
+    def submit_more():
+        while len(pending) < max_workers and not deadline.expired():
+            try:
+                index, args = next(remaining)
+            except StopIteration:
+                return
+            pending[executor.submit(func, *args)] = index
+
+    try:
+        submit_more()
+        while pending:
+            done, _ = concurrent.futures.wait(
+                pending, timeout=deadline.wait_timeout(), return_when=concurrent.futures.FIRST_COMPLETED
+            )
+            if not done:
+                log.warning("⏱️ 실행 기한이 가까워 진행 중인 작업 %s개의 결과를 기다리지 않습니다.", len(pending))
+                break
+            for future in done:
+                index = pending.pop(future)
+                results[index] = future.result()
+                if on_result:
+                    on_result(results[index])
+            submit_more()
+    finally:
+        # 끝나지 않은 호출은 결과를 알 수 없음으로 표시하고, 시작하지 않은 작업은 취소
+        for index in pending.values():
+            results[index] = UNKNOWN
+        executor.shutdown(wait=False, cancel_futures=True)
+
+    unfinished = sum(1 for result in results if result is None)
+    if unfinished or pending:
+        log.info("⏱️ 실행 기한 때문에 %s/%s개 작업을 다음 호출로 넘깁니다 (결과 확인 필요 %s개).",
+                 unfinished + len(pending), len(items), len(pending))
+    return results
+
+
+def _continuation_store():
+    return get_store(CONTINUATION_BACKEND, 'continuations')
+
+def load_continuation(event: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+    """이벤트에 담긴(또는 저장소에 저장된) 이어서 실행할 상태를 반환합니다."""
+    if event.get('continuation'):
+        return event['continuation']
+    continuation_id = event.get('continuation_id')
+    if not continuation_id:
+        return None
+    store = _continuation_store()
+    state = store.get(continuation_id) if store else None
+    if state is None:
+        log.error("이어서 실행할 상태를 찾을 수 없습니다 (continuation_id: %s)", continuation_id)
+    return state
+
+def invoke_continuation(event: Dict[str, Any], state: Dict[str, Any]) -> bool:
+    """
+    남은 작업 상태를 담아 자기 자신을 비동기 호출합니다.
+
+    Args:
+        event: 현재 호출의 이벤트 (action, response_url 등은 그대로 전달)
+        state: 다음 호출이 이어서 처리할 상태
+
+    Returns:
+        재호출에 성공했으면 True. 재호출 횟수 제한을 넘었거나 실패하면 False
+    """
+    depth = int(event.get('continuation_depth', 0)) + 1
+    function_name = os.environ.get('AWS_LAMBDA_FUNCTION_NAME')
+    if not function_name:
+        log.error("Lambda 함수 이름을 가져올 수 없어 이어서 실행할 수 없습니다.")
+        return False
+    if depth > MAX_CONTINUATIONS:
+        log.warning("이어서 실행 횟수 제한(%s)을 넘었습니다.", MAX_CONTINUATIONS)
+        return False
+
+    payload = {
+        key: value for key, value in event.items()
+        if key not in ('continuation', 'continuation_id', 'resources', 'scan_id')
+    }
+    payload['continuation_depth'] = depth
+    payload['continuation'] = state
+    body = json.dumps(payload)
+    if len(body) > CONTINUATION_INLINE_LIMIT:
+        store = _continuation_store()
+        if store is None:
+            log.error("이어서 실행할 상태가 너무 커서 CONTINUATION_BACKEND 저장소가 필요합니다.")
+            return False
+        continuation_id = secrets.token_urlsafe(9)
+        store.put(continuation_id, state, ttl=CONTINUATION_TTL)
+        del payload['continuation']
+        payload['continuation_id'] = continuation_id
+        body = json.dumps(payload)
+
+    try:
+        from util.invoker import get_invoker
+        get_invoker().invoke(FunctionName=function_name, InvocationType='Event', Payload=body)
+    except Exception as e:
+        log.error("이어서 실행하기 위한 비동기 호출 실패: %s", e)
+        return False
+    log.info("Lambda 함수 '%s' 이어서 실행 호출 성공 (%s, %s번째)", function_name, payload['action'], depth)
+    return True
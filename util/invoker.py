@@ -0,0 +1,55 @@
+import json
+import os
+import threading
+from typing import Any, Dict, List
+
+# Lambda 호출 방식: 'aws'(기본) 또는 'local'(같은 프로세스의 스레드에서 lambda_handler 실행, 테스트용)
+LAMBDA_INVOKER = os.environ.get('LAMBDA_INVOKER', 'aws')
+
+
+class LocalInvoker:
+    """
+    lambda_client.invoke 와 같은 방식으로 호출하면 같은 프로세스에서 lambda_handler 를 실행합니다.
+
+    InvocationType='Event' 는 별도 스레드에서 실행되며, wait() 로 연쇄 호출까지 모두 끝날 때까지 기다릴 수 있습니다.
+    로컬 저장소(JOURNAL_BACKEND=local 등)를 그대로 공유하므로 팬아웃·이어서 실행을 AWS 없이 확인할 수 있습니다.
+    """
+
+    def __init__(self):
+        self.threads: List[threading.Thread] = []
+        self.lock = threading.Lock()
+
+    def _run(self, payload: Dict[str, Any]):
+        from lambda_function import lambda_handler
+        return lambda_handler(payload, None)
+
+    def invoke(self, FunctionName: str, InvocationType: str = 'RequestResponse', Payload: str = '{}', **kwargs) -> Dict[str, Any]:
+        payload = json.loads(Payload)
+        if InvocationType == 'Event':
+            thread = threading.Thread(target=self._run, args=(payload,), daemon=True)
+            with self.lock:
+                self.threads.append(thread)
+            thread.start()
+            return {'StatusCode': 202}
+        return {'StatusCode': 200, 'Payload': json.dumps(self._run(payload))}
+
+    def wait(self, timeout: float = 60) -> None:
+        """비동기로 시작된 호출(과 그 호출이 다시 시작한 호출)이 모두 끝날 때까지 기다립니다."""
+        while True:
+            with self.lock:
+                alive = [thread for thread in self.threads if thread.is_alive()]
+                self.threads = alive
+            if not alive:
+                return
+            for thread in alive:
+                thread.join(timeout)
+
+
+_local_invoker = LocalInvoker()
+
+def get_invoker():
+    """자기 자신을 비동기 호출할 때 사용할 클라이언트 (lambda 클라이언트 또는 LocalInvoker)."""
+    if LAMBDA_INVOKER == 'local':
+        return _local_invoker
+    from util.aws import get_client
+    return get_client('lambda')
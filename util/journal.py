@@ -0,0 +1,195 @@
+import hashlib
+import json
+import os
+import secrets
+import threading
+import time
+from typing import Any, Dict, Iterable, List, Optional
+
+from util.log import get_logger
+from util.storage import KeyValueStore, get_store, is_shared_backend
+
+log = get_logger('journal')
+
+# 삭제 작업 저널 설정
+# JOURNAL_BACKEND: 'local'(기본), 'sqlite', 's3', 'dynamodb', 'none'
+# 여러 Lambda 컨테이너에서 중복 클릭을 막으려면 s3/dynamodb 를 사용하세요.
+JOURNAL_BACKEND = os.environ.get('JOURNAL_BACKEND', 'local')
+JOURNAL_TTL = int(os.environ.get('JOURNAL_TTL', '604800'))            # 리소스별 결과 보관 기간(초)
+JOURNAL_LEASE_SECONDS = int(os.environ.get('JOURNAL_LEASE_SECONDS', '900'))  # 실행 중 표시 유효 시간(초), Lambda 최대 실행 시간
+
+
+def get_journal_store() -> Optional[KeyValueStore]:
+    """설정된 저널 저장소를 반환합니다. 비활성화되어 있으면 None."""
+    return get_store(JOURNAL_BACKEND, 'jobs')
+
+def job_id_for(event: Dict[str, Any]) -> str:
+    """
+    삭제 요청의 작업 ID를 만듭니다.
+
+    같은 탐지 결과의 삭제 버튼은 같은 스캔 ID 또는 같은 리소스 목록을 담고 있으므로
+    중복 클릭과 재실행은 같은 작업 ID를 갖습니다.
+    """
+    if event.get('job_id'):
+        return event['job_id']
+    if event.get('scan_id'):
+        return f"scan-{event['scan_id']}"
+    digest = hashlib.sha256(json.dumps(event.get('resources', {}), sort_keys=True).encode('utf-8')).hexdigest()
+    return f"res-{digest[:24]}"
+
+def _lease_key(job_id: str) -> str:
+    return f"{job_id}/lease"
+
+def _items_key(job_id: str) -> str:
+    return f"{job_id}/items"
+
+def _shard_items_key(fan_out_id: str, shard_id: int) -> str:
+    return f"{fan_out_id}/items/{shard_id}"
+
+def claim_job(job_id: str) -> bool:
+    """
+    작업 실행 권한을 얻습니다. 같은 작업이 이미 실행 중이면 False 를 반환합니다.
+    저널이 비활성화되어 있으면 항상 True. 공유되지 않는 저장소(local, sqlite)면 경고를 남깁니다.
+    """
+    store = get_journal_store()
+    if store is None:
+        return True
+    if not is_shared_backend(JOURNAL_BACKEND):
+        log.warning("JOURNAL_BACKEND=%s 는 컨테이너마다 따로 저장되어 다른 컨테이너로 전달된 중복 클릭이나 재실행을 "
+                    "막지 못합니다. s3 또는 dynamodb 를 사용하세요.", JOURNAL_BACKEND)
+    return store.put_if_absent(_lease_key(job_id), {'claimed_at': time.time()}, ttl=JOURNAL_LEASE_SECONDS)
+
+def renew_job(job_id: str) -> None:
+    """이어서 실행되는 호출에서 실행 중 표시의 유효 시간을 연장합니다."""
+    store = get_journal_store()
+    if store is None:
+        return
+    try:
+        store.put(_lease_key(job_id), {'claimed_at': time.time()}, ttl=JOURNAL_LEASE_SECONDS)
+    except Exception as e:
+        log.warning("작업 저널 갱신 실패 (%s): %s", job_id, e)
+
+def release_job(job_id: str) -> None:
+    """작업이 끝났음을 기록합니다. 이후의 재실행은 다시 실행 권한을 얻을 수 있습니다."""
+    store = get_journal_store()
+    if store is None:
+        return
+    try:
+        store.delete(_lease_key(job_id))
+    except Exception as e:
+        log.warning("작업 저널 해제 실패 (%s): %s", job_id, e)
+
+class ResultJournal:
+    """
+    리소스별 삭제 결과를 모아 두었다가 flush 에서 한 번에 기록합니다.
+
+    작업(팬아웃 워커는 샤드)마다 삭제에 성공한 결과 키 목록을 객체 하나에 저장하므로
+    리소스 수와 관계없이 flush 한 번에 저장소를 두 번(읽기, 쓰기)만 호출합니다.
+    객체마다 쓰는 호출은 한 번에 하나뿐이므로 (작업 실행 권한, 샤드별 객체) 읽어서 합친 뒤 써도 안전합니다.
+    다음 호출(continuation)이나 결과 전송으로 넘어가기 전에 flush 하세요.
+    """
+
+    def __init__(self, job_id: str, fan_out_id: Optional[str] = None, shard_id: Optional[int] = None):
+        self.key = _items_key(job_id) if fan_out_id is None else _shard_items_key(fan_out_id, shard_id)
+        self.succeeded: List[str] = []
+        self.lock = threading.Lock()
+
+    def record(self, outcome) -> None:
+        """run_deletes 의 on_result 로 사용합니다. outcome 은 (결과 키, 성공 여부) 튜플."""
+        result_key, ok = outcome
+        if ok:
+            with self.lock:
+                self.succeeded.append(result_key)
+
+    def flush(self) -> None:
+        """모아 둔 결과를 저장합니다. 기록 실패는 삭제 결과에 영향을 주지 않습니다."""
+        with self.lock:
+            succeeded, self.succeeded = self.succeeded, []
+        store = get_journal_store()
+        if store is None or not succeeded:
+            return
+        try:
+            record = store.get(self.key) or {}
+            record['success'] = list(dict.fromkeys(record.get('success', []) + succeeded))
+            store.put(self.key, record, ttl=JOURNAL_TTL)
+        except Exception as e:
+            log.warning("작업 저널 기록 실패 (%s, %d개): %s", self.key, len(succeeded), e)
+
+def load_completed(job_id: str, result_keys: Iterable[str]) -> Dict[str, str]:
+    """
+    이전 실행에서 이미 삭제에 성공한 리소스를 찾습니다.
+
+    작업의 결과 객체 하나와, 팬아웃했던 작업이면 샤드별 결과 객체를 읽습니다.
+
+    Returns:
+        {"위치:타입:ID": "success"} 형식의 딕셔너리 (실패했거나 기록이 없는 리소스는 포함하지 않음)
+    """
+    store = get_journal_store()
+    if store is None:
+        return {}
+    succeeded = set()
+    try:
+        record = store.get(_items_key(job_id)) or {}
+        succeeded.update(record.get('success', []))
+        for fan_out_id, shard_count in record.get('fan_outs', {}).items():
+            for shard_id in range(shard_count):
+                shard = store.get(_shard_items_key(fan_out_id, shard_id))
+                if shard:
+                    succeeded.update(shard.get('success', []))
+    except Exception as e:
+        log.warning("작업 저널 조회 실패 (%s): %s", job_id, e)
+    return {result_key: 'success' for result_key in result_keys if result_key in succeeded}
+
+
+def _fan_out_store() -> KeyValueStore:
+    store = get_journal_store()
+    if store is None:
+        raise ValueError("팬아웃에는 JOURNAL_BACKEND 저장소가 필요합니다.")
+    return store
+
+def start_fan_out(job_id: str, shard_count: int, previous: Dict[str, List[str]]) -> str:
+    """
+    여러 워커 Lambda 로 나눠 실행할 삭제 작업을 기록하고 팬아웃 ID를 반환합니다.
+
+    Args:
+        shard_count: 워커 수 (샤드 ID 는 0 ~ shard_count - 1)
+        previous: 워커 결과와 합칠 결과 (이전 실행에서 삭제된 리소스 등)
+    """
+    store = _fan_out_store()
+    fan_out_id = f"{job_id}/fanout-{secrets.token_urlsafe(6)}"
+    store.put(fan_out_id, {'shard_count': shard_count, 'results': previous}, ttl=JOURNAL_TTL)
+    # 재실행 시 load_completed 가 워커들의 결과 객체도 읽도록 작업 결과 객체에 기록
+    record = store.get(_items_key(job_id)) or {}
+    record.setdefault('fan_outs', {})[fan_out_id] = shard_count
+    store.put(_items_key(job_id), record, ttl=JOURNAL_TTL)
+    return fan_out_id
+
+def save_shard_result(fan_out_id: str, shard_id: int, results: Dict[str, List[str]]) -> None:
+    """워커 하나의 삭제 결과를 저장합니다."""
+    _fan_out_store().put(f"{fan_out_id}/shards/{shard_id}", results, ttl=JOURNAL_TTL)
+
+def collect_fan_out(fan_out_id: str) -> Optional[Dict[str, List[str]]]:
+    """
+    모든 워커가 결과를 저장했으면 합친 결과를 반환하고, 아직 남은 워커가 있으면 None 을 반환합니다.
+
+    각 워커는 자기 결과를 저장한 뒤 이 함수를 호출하므로 마지막으로 끝난 워커는 항상 전체 결과를 봅니다.
+    """
+    store = _fan_out_store()
+    meta = store.get(fan_out_id)
+    if meta is None:
+        return None
+    combined = {
+        "success": list(meta['results']['success']),
+        "failed": list(meta['results']['failed'])
+    }
+    for shard_id in range(meta['shard_count']):
+        shard = store.get(f"{fan_out_id}/shards/{shard_id}")
+        if shard is None:
+            return None
+        combined["success"].extend(shard["success"])
+        combined["failed"].extend(shard["failed"])
+    return combined
+
+def claim_fan_out_report(fan_out_id: str) -> bool:
+    """합친 결과를 한 번만 전송하도록 전송 권한을 얻습니다 (여러 워커가 동시에 끝나도 하나만 True)."""
+    return _fan_out_store().put_if_absent(f"{fan_out_id}/reported", {'reported_at': time.time()}, ttl=JOURNAL_TTL)
@@ -0,0 +1,108 @@
+import json
+import os
+import random
+import sys
+import threading
+import time
+from typing import Any, Dict, Optional
+
+# 로그 설정
+# LOG_LEVEL: 이 수준 이상의 로그만 출력 (DEBUG, INFO, WARNING, ERROR)
+LOG_LEVEL = os.environ.get('LOG_LEVEL', 'INFO').upper()
+# 이벤트·페이로드 같은 큰 값은 직렬화한 뒤 이 길이(문자)로 자름
+LOG_PAYLOAD_CHARS = int(os.environ.get('LOG_PAYLOAD_CHARS', '500'))
+# LOG_LEVEL 이 DEBUG 가 아니어도 이 비율의 호출에서는 페이로드를 INFO 로 남김 (0 ~ 1)
+LOG_PAYLOAD_SAMPLE_RATE = float(os.environ.get('LOG_PAYLOAD_SAMPLE_RATE', '0'))
+
+LEVELS = {'DEBUG': 10, 'INFO': 20, 'WARNING': 30, 'ERROR': 40}
+
+_threshold = LEVELS.get(LOG_LEVEL, LEVELS['INFO'])
+_write_lock = threading.Lock()
+# 호출 단위 상태 (요청 ID, 페이로드 샘플링 여부)
+_invocation: Dict[str, Any] = {'request_id': None, 'sampled': False}
+
+
+def start_invocation(context=None) -> None:
+    """
+    Lambda 호출마다 한 번 호출합니다.
+    이후 로그에 요청 ID 를 붙이고, 이 호출에서 페이로드를 남길지(샘플링) 결정합니다.
+    """
+    _invocation['request_id'] = getattr(context, 'aws_request_id', None)
+    _invocation['sampled'] = LOG_PAYLOAD_SAMPLE_RATE > 0 and random.random() < LOG_PAYLOAD_SAMPLE_RATE
+
+
+def truncate(value: Any, limit: Optional[int] = None) -> str:
+    """값을 JSON 으로 직렬화하고 limit(기본 LOG_PAYLOAD_CHARS) 문자로 자릅니다."""
+    limit = LOG_PAYLOAD_CHARS if limit is None else limit
+    text = value if isinstance(value, str) else json.dumps(value, ensure_ascii=False, default=str)
+    if len(text) > limit:
+        return f"{text[:limit]}...(+{len(text) - limit} chars)"
+    return text
+
+
+class Logger:
+    """
+    한 줄에 JSON 객체 하나를 stdout 으로 출력하는 로거 (CloudWatch Logs Insights 에서 필드로 조회 가능).
+
+    메시지는 logging 모듈처럼 % 인자로 넘기면 해당 수준이 켜져 있을 때만 포맷하고,
+    키워드 인자는 레코드의 필드가 됩니다.
+
+        log.info("리전 %s 처리 완료", region, deleted=3)
+        log.payload("이벤트", event)   # DEBUG 이거나 샘플링된 호출에서만 직렬화
+
+    Attributes:
+        name: 로거 이름 (레코드의 logger 필드)
+    """
+
+    def __init__(self, name: str):
+        self.name = name
+
+    def enabled(self, level: str) -> bool:
+        return LEVELS[level] >= _threshold
+
+    def _log(self, level: str, msg: str, args: tuple, fields: Dict[str, Any]) -> None:
+        if LEVELS[level] < _threshold:
+            return
+        record = {'ts': round(time.time(), 3), 'level': level, 'logger': self.name,
+                  'msg': msg % args if args else msg}
+        if _invocation['request_id']:
+            record['request_id'] = _invocation['request_id']
+        record.update(fields)
+        line = json.dumps(record, ensure_ascii=False, default=str)
+        with _write_lock:
+            sys.stdout.write(line + '\n')
+
+    def debug(self, msg: str, *args, **fields) -> None:
+        self._log('DEBUG', msg, args, fields)
+
+    def info(self, msg: str, *args, **fields) -> None:
+        self._log('INFO', msg, args, fields)
+
+    def warning(self, msg: str, *args, **fields) -> None:
+        self._log('WARNING', msg, args, fields)
+
+    def error(self, msg: str, *args, **fields) -> None:
+        self._log('ERROR', msg, args, fields)
+
+    def payload(self, msg: str, value: Any, **fields) -> None:
+        """
+        이벤트·페이로드처럼 큰 값을 남깁니다.
+        DEBUG 가 켜져 있거나 샘플링된 호출에서만 직렬화하며, LOG_PAYLOAD_CHARS 길이로 자릅니다.
+        """
+        if _threshold <= LEVELS['DEBUG']:
+            level = 'DEBUG'
+        elif _invocation['sampled']:
+            level = 'INFO'
+        else:
+            return
+        self._log(level, msg, (), dict(fields, payload=truncate(value)))
+
+
+_loggers: Dict[str, Logger] = {}
+
+def get_logger(name: str) -> Logger:
+    """이름별 로거를 반환합니다."""
+    logger = _loggers.get(name)
+    if logger is None:
+        logger = _loggers.setdefault(name, Logger(name))
+    return logger
@@ -0,0 +1,120 @@
+import contextlib
+import functools
+import json
+import os
+import sys
+import threading
+import time
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple
+
+# 지표 설정
+# METRICS_ENABLED: 단계별 시간·호출 수 지표를 CloudWatch Embedded Metric Format(EMF) 로그로 출력
+METRICS_ENABLED = os.environ.get('METRICS_ENABLED', 'true').lower() != 'false'
+METRICS_NAMESPACE = os.environ.get('METRICS_NAMESPACE', 'UnusedResourceCleanup')
+
+# EMF 문서 하나에 담을 수 있는 지표당 최대 값 개수
+EMF_MAX_VALUES = 100
+
+# 차원(정렬된 (이름, 값) 튜플) → 지표 이름 → 값 목록. 카운터는 값 하나를 누적합니다.
+_metrics: Dict[Tuple[Tuple[str, str], ...], Dict[str, List[float]]] = {}
+_units: Dict[str, str] = {}
+_counters = set()
+_lock = threading.Lock()
+
+
+def _dimensions(dimensions: Dict[str, Optional[str]]) -> Tuple[Tuple[str, str], ...]:
+    # 값이 없는 차원(자기 계정의 Account 등)은 빼서 같은 지표가 여러 조합으로 갈라지지 않게 함
+    return tuple(sorted((key, str(value)) for key, value in dimensions.items() if value is not None))
+
+def record(name: str, value: float, unit: str = 'Milliseconds', **dimensions) -> None:
+    """값 하나를 기록합니다 (시간 분포 등). 같은 호출 안의 값은 flush_metrics() 때 함께 출력됩니다."""
+    if not METRICS_ENABLED:
+        return
+    key = _dimensions(dimensions)
+    with _lock:
+        _units[name] = unit
+        _metrics.setdefault(key, {}).setdefault(name, []).append(value)
+
+def count(name: str, value: float = 1, unit: str = 'Count', **dimensions) -> None:
+    """카운터에 value 를 더합니다 (API 호출 수, 리소스 수 등)."""
+    if not METRICS_ENABLED:
+        return
+    key = _dimensions(dimensions)
+    with _lock:
+        _units[name] = unit
+        _counters.add(name)
+        values = _metrics.setdefault(key, {}).setdefault(name, [0])
+        values[0] += value
+
+@contextlib.contextmanager
+def timer(name: str, **dimensions) -> Iterator[None]:
+    """
+    블록 실행 시간(밀리초)을 기록합니다. 예외가 나도 기록합니다.
+
+        with timer('ScanLatency', Region=region, ResourceType=resource_type):
+            ...
+    """
+    if not METRICS_ENABLED:
+        yield
+        return
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        record(name, round((time.perf_counter() - started) * 1000, 3), **dimensions)
+
+def timed(name: str, **dimensions) -> Callable:
+    """함수 실행 시간을 기록하는 데코레이터 (차원은 고정값)."""
+    def decorator(func: Callable) -> Callable:
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            with timer(name, **dimensions):
+                return func(*args, **kwargs)
+        return wrapper
+    return decorator
+
+
+def _emf_documents(timestamp_ms: int) -> Iterator[Dict[str, Any]]:
+    for key, metrics in _metrics.items():
+        names = list(metrics)
+        dimension_names = [dimension for dimension, _ in key]
+        # 전체 차원 조합과 함께 차원별 합계도 볼 수 있도록 단일 차원 집합을 추가
+        dimension_sets = [dimension_names]
+        if len(dimension_names) > 1:
+            dimension_sets += [[dimension] for dimension in dimension_names]
+        longest = max(len(metrics[name]) for name in names)
+        for start in range(0, longest, EMF_MAX_VALUES):
+            chunk = {name: metrics[name][start:start + EMF_MAX_VALUES] for name in names}
+            chunk = {name: values for name, values in chunk.items() if values}
+            document: Dict[str, Any] = {
+                '_aws': {
+                    'Timestamp': timestamp_ms,
+                    'CloudWatchMetrics': [{
+                        'Namespace': METRICS_NAMESPACE,
+                        'Dimensions': dimension_sets,
+                        'Metrics': [{'Name': name, 'Unit': _units[name]} for name in chunk],
+                    }],
+                },
+            }
+            document.update(key)
+            for name, values in chunk.items():
+                document[name] = values[0] if name in _counters else values
+            yield document
+
+def flush_metrics() -> int:
+    """
+    모아 둔 지표를 차원 조합마다 EMF 형식 JSON 한 줄로 stdout 에 출력하고 비웁니다.
+    Lambda 호출이 끝날 때 한 번 호출합니다.
+
+    Returns:
+        출력한 EMF 문서 수
+    """
+    if not METRICS_ENABLED:
+        return 0
+    with _lock:
+        documents = list(_emf_documents(int(time.time() * 1000)))
+        _metrics.clear()
+    for document in documents:
+        sys.stdout.write(json.dumps(document, separators=(',', ':')) + '\n')
+    sys.stdout.flush()
+    return len(documents)
@@ -0,0 +1,98 @@
+import functools
+import json
+import os
+from typing import Any, Dict, List, Optional
+
+from util.accounts import split_location
+from util.records import ResourceRecord
+from util.resource_types import get_resource_type
+
+# 비용 추정 설정
+COST_ESTIMATION = os.environ.get('COST_ESTIMATION', 'true').lower() != 'false'
+# 기본 가격표 대신 사용할 JSON 파일 (util/prices.json 과 같은 형식)
+PRICE_TABLE_FILE = os.environ.get('PRICE_TABLE_FILE', '') or os.path.join(os.path.dirname(os.path.abspath(__file__)), 'prices.json')
+
+HOURS_PER_MONTH = 730
+
+
+@functools.lru_cache(maxsize=1)
+def load_price_table() -> Dict[str, Any]:
+    """번들된(또는 PRICE_TABLE_FILE 로 지정한) 가격표를 읽습니다. 컨테이너 수명 동안 캐시됩니다."""
+    with open(PRICE_TABLE_FILE, 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+@functools.lru_cache(maxsize=None)
+def get_unit_price(region: str, resource_type: str) -> float:
+    """리전·리소스 타입의 단가를 반환합니다 (리전 값이 없으면 기본값, 둘 다 없으면 0)."""
+    table = load_price_table()
+    regional = table.get('regions', {}).get(region, {})
+    return float(regional.get(resource_type, table.get('default', {}).get(resource_type, 0.0)))
+
+def estimate_savings(resources: Dict[str, Dict[str, List[str]]],
+                     records: Optional[Dict[str, Dict[str, Dict[str, ResourceRecord]]]] = None) -> Dict[str, Any]:
+    """
+    미사용 리소스를 삭제했을 때의 예상 월 절감액을 계산합니다.
+
+    단가는 (리전, 타입) 묶음마다 한 번만 조회하고, 시간 요금 타입은 묶음 전체를 개수로 한 번에 계산합니다.
+    GB 단위 타입(볼륨·스냅샷)은 스캔에서 수집한 레코드의 size 를 사용하며, 크기를 모르면 0으로 계산합니다.
+    공인 IP 시간 요금 타입(ENI)은 레코드에 public_ip 가 있는 리소스만 IPv4 시간 요금으로 계산합니다.
+
+    Args:
+        resources: {"리소스 타입": {"위치": [리소스 ID 목록]}}
+        records: {"리소스 타입": {"위치": {"리소스 ID": ResourceRecord}}}
+
+    Returns:
+        {
+            "total": 전체 월 절감액,
+            "by_location": {"위치": 월 절감액},
+            "by_type": {"리소스 타입": 월 절감액},
+            "by_group": {"리소스 타입": {"위치": 월 절감액}},
+            "by_resource": {"리소스 타입": {"위치": {"리소스 ID": 월 절감액}}}
+        }
+    """
+    records = records or {}
+    costs: Dict[str, Any] = {'total': 0.0, 'by_location': {}, 'by_type': {}, 'by_group': {}, 'by_resource': {}}
+    for resource_type, locations in resources.items():
+        definition = get_resource_type(resource_type)
+        unit = definition.pricing.get('unit') if definition else 'none'
+        for location, resource_ids in locations.items():
+            if not resource_ids:
+                continue
+            price = get_unit_price(split_location(location)[1], resource_type)
+            if unit == 'hour':
+                monthly = price * HOURS_PER_MONTH
+                per_resource = dict.fromkeys(resource_ids, monthly)
+                subtotal = monthly * len(resource_ids)
+            elif unit == 'gb_month':
+                location_records = records.get(resource_type, {}).get(location, {})
+                per_resource = {
+                    resource_id: _size(location_records.get(resource_id)) * price for resource_id in resource_ids
+                }
+                subtotal = sum(per_resource.values())
+            elif unit == 'public_ip_hour':
+                location_records = records.get(resource_type, {}).get(location, {})
+                monthly = price * HOURS_PER_MONTH
+                per_resource = {
+                    resource_id: monthly if _public_ip(location_records.get(resource_id)) else 0.0
+                    for resource_id in resource_ids
+                }
+                subtotal = sum(per_resource.values())
+            else:
+                per_resource = dict.fromkeys(resource_ids, 0.0)
+                subtotal = 0.0
+
+            costs['by_resource'].setdefault(resource_type, {})[location] = per_resource
+            costs['by_group'].setdefault(resource_type, {})[location] = subtotal
+            costs['by_location'][location] = costs['by_location'].get(location, 0.0) + subtotal
+            costs['by_type'][resource_type] = costs['by_type'].get(resource_type, 0.0) + subtotal
+            costs['total'] += subtotal
+    return costs
+
+def _size(record: Optional[ResourceRecord]) -> float:
+    return (record.size or 0) if record is not None else 0
+
+def _public_ip(record: Optional[ResourceRecord]) -> Optional[str]:
+    return record.public_ip if record is not None else None
+
+def format_usd(amount: float) -> str:
+    return f"${amount:,.2f}"
@@ -0,0 +1,119 @@
+import os
+import queue
+import threading
+import time
+from typing import Any, Dict, List, Optional
+
+from util.accounts import make_location
+from util.log import get_logger
+from util.slack import send_slack_block_response
+from util.slack_block import SLACK_MAX_MESSAGES, create_resource_detect_messages
+
+log = get_logger('progress')
+
+# 진행 상황 메시지 설정
+# response_url 은 최대 5번까지 사용할 수 있으므로 최종 결과에 쓸 횟수를 남겨 둡니다.
+PROGRESS_MAX_UPDATES = int(os.environ.get('PROGRESS_MAX_UPDATES', '2'))
+PROGRESS_MIN_INTERVAL = float(os.environ.get('PROGRESS_MIN_INTERVAL', '3'))  # 초
+PROGRESS_CLOSE_TIMEOUT = float(os.environ.get('PROGRESS_CLOSE_TIMEOUT', '5'))  # 최종 결과 전에 진행 상황 전송을 기다리는 최대 시간(초)
+
+
+class ProgressReporter:
+    """
+    스캔 결과가 들어오는 대로 누적하고, 일정 간격 이상 벌어졌을 때만
+    response_url 의 메시지를 제자리 교체(replace_original)하여 중간 결과를 보여줍니다.
+
+    전송은 백그라운드 스레드 하나가 순서대로 처리하므로, 스캔 결과를 모으는 루프는
+    Slack 응답을 기다리지 않습니다. 최종 결과를 보내기 전에 close() 를 호출하세요.
+    """
+
+    def __init__(self, response_url: str, total: int,
+                 max_updates: int = PROGRESS_MAX_UPDATES,
+                 min_interval: float = PROGRESS_MIN_INTERVAL,
+                 used: int = 0,
+                 resources: Optional[Dict[str, Dict[str, List[str]]]] = None):
+        """
+        Args:
+            used: 이전 호출(이어서 실행 전)에서 이미 사용한 response_url 횟수
+            resources: 이전 호출에서 찾은 리소스 (이어서 실행할 때)
+        """
+        self.response_url = response_url
+        self.total = total
+        self.used = used
+        # 최종 결과 메시지를 위해 최소 1번은 남겨 둠
+        self.max_updates = max(0, min(max_updates - used, SLACK_MAX_MESSAGES - 1 - used))
+        self.min_interval = min_interval
+        self.completed = 0
+        self.updates_sent = 0
+        self.last_sent = time.monotonic()  # 첫 갱신도 간격을 두어 빠른 스캔은 바로 최종 결과만 보냄
+        self.resources: Dict[str, Dict[str, List[str]]] = {
+            resource_type: dict(locations) for resource_type, locations in (resources or {}).items()
+        }
+        self.lock = threading.Lock()
+        self.pending: "queue.Queue[Optional[List[Dict[str, Any]]]]" = queue.Queue()
+        self.sender: Optional[threading.Thread] = None
+
+    def add(self, result: Dict[str, Any]) -> None:
+        """
+        스캔 작업 하나의 결과({'region', 'account', 'type', 'ids'[, 'error']})를 누적하고,
+        필요하면 진행 상황 전송을 백그라운드 스레드에 넘깁니다.
+        """
+        with self.lock:
+            self.completed += 1
+            if 'error' not in result and result['ids']:
+                location = make_location(result['region'], result.get('account'))
+                self.resources.setdefault(result['type'], {})[location] = result['ids']
+            if not self._should_send():
+                return
+            self.updates_sent += 1
+            self.last_sent = time.monotonic()
+            messages, _ = create_resource_detect_messages(
+                self.resources,
+                title=f"🔍 리소스 탐색 중... ({self.completed}/{self.total})",
+                show_delete_button=False,
+                max_messages=1
+            )
+            if self.sender is None:
+                self.sender = threading.Thread(target=self._send_loop, daemon=True)
+                self.sender.start()
+            self.pending.put(messages[0])
+
+    def _send_loop(self) -> None:
+        while True:
+            blocks = self.pending.get()
+            if blocks is None:
+                return
+            send_slack_block_response(self.response_url, blocks, replace_original=True)
+
+    def close(self, timeout: float = PROGRESS_CLOSE_TIMEOUT) -> None:
+        """
+        대기 중인 진행 상황 전송이 끝날 때까지 최대 timeout 초 기다립니다.
+        늦게 도착한 진행 상황이 최종 결과 메시지를 덮어쓰지 않도록 최종 결과 전에 호출합니다.
+        """
+        with self.lock:
+            sender, self.sender = self.sender, None
+            # 이후의 add() 는 전송하지 않음
+            self.max_updates = self.updates_sent
+            if sender is None:
+                return
+            self.pending.put(None)
+        sender.join(timeout)
+        if sender.is_alive():
+            log.warning("진행 상황 전송이 %.1f초 안에 끝나지 않았습니다. 최종 결과를 그대로 전송합니다.", timeout)
+
+    def _should_send(self) -> bool:
+        return (
+            self.updates_sent < self.max_updates
+            and self.completed < self.total
+            and time.monotonic() - self.last_sent >= self.min_interval
+        )
+
+    @property
+    def messages_used(self) -> int:
+        """지금까지(이전 호출 포함) 사용한 response_url 횟수."""
+        return self.used + self.updates_sent
+
+    @property
+    def remaining_messages(self) -> int:
+        """최종 결과에 사용할 수 있는 남은 response_url 사용 횟수."""
+        return max(1, SLACK_MAX_MESSAGES - self.messages_used)
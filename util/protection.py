@@ -0,0 +1,222 @@
+import abc
+import functools
+import json
+import os
+import time
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple
+
+from util.log import get_logger
+from util.records import ResourceRecord
+from util.resource_types import get_resource_type, get_resource_types
+
+log = get_logger('protection')
+
+# 보호 규칙 설정
+# PROTECTION_RULES(JSON 배열) 또는 PROTECTION_RULES_FILE(JSON 파일)을 지정하면 아래 개별 설정 대신 사용합니다.
+# 예: [{"rule": "tag", "key": "keep", "values": ["true"]},
+#      {"rule": "interface_type", "values": ["lambda"]},
+#      {"rule": "min_age", "days": 7, "types": ["volumes", "snapshots"]}]
+PROTECTION_RULES = os.environ.get('PROTECTION_RULES', '')
+PROTECTION_RULES_FILE = os.environ.get('PROTECTION_RULES_FILE', '')
+# 이 태그가 있는 리소스는 탐지·삭제하지 않음 (쉼표 구분, '키=값' 또는 값과 관계없이 '키')
+PROTECT_TAGS = os.environ.get('PROTECT_TAGS', 'keep=true')
+# AWS 서비스가 관리하는(requester-managed) ENI 보호
+PROTECT_REQUESTER_MANAGED = os.environ.get('PROTECT_REQUESTER_MANAGED', 'true').lower() != 'false'
+# 이 InterfaceType 의 ENI 는 보호 (쉼표 구분)
+PROTECT_INTERFACE_TYPES = os.environ.get('PROTECT_INTERFACE_TYPES', 'lambda,nat_gateway,vpc_endpoint')
+# 생성(또는 마지막 연결) 후 이 기간(일)이 지나지 않은 리소스는 보호 (0 이면 사용 안 함)
+MIN_RESOURCE_AGE_DAYS = float(os.environ.get('MIN_RESOURCE_AGE_DAYS', '0'))
+
+
+class ProtectionRule(abc.ABC):
+    """
+    리소스를 탐지·삭제 대상에서 제외하는 규칙.
+
+    protects() 는 스캔에서 수집한(또는 삭제 직전에 다시 조회한) ResourceRecord 로 평가하고,
+    server_filters() 는 같은 조건을 describe_* 의 Filters 로 표현할 수 있을 때 서버 측 필터를 반환합니다.
+
+    Attributes:
+        resource_types: 규칙을 적용할 리소스 타입 집합 (None 이면 모든 타입)
+    """
+
+    def __init__(self, types: Optional[Iterable[str]] = None):
+        self.resource_types = set(types) if types else None
+
+    def applies_to(self, resource_type: str) -> bool:
+        return self.resource_types is None or resource_type in self.resource_types
+
+    @abc.abstractmethod
+    def protects(self, record: ResourceRecord, now: float) -> bool:
+        """레코드의 리소스를 보호해야 하면 True."""
+
+    def server_filters(self, resource_type: str) -> List[Dict[str, Any]]:
+        return []
+
+    @abc.abstractmethod
+    def describe(self) -> str:
+        """Slack 메시지와 로그에 표시할 규칙 설명."""
+
+
+class TagRule(ProtectionRule):
+    """태그 key 가 있고 값이 values 중 하나(대소문자 무시, values 가 없으면 아무 값)인 리소스를 보호합니다."""
+
+    def __init__(self, key: str, values: Optional[Iterable[str]] = None, types: Optional[Iterable[str]] = None):
+        super().__init__(types)
+        self.key = key
+        self.values = {value.lower() for value in values} if values else None
+
+    def protects(self, record: ResourceRecord, now: float) -> bool:
+        value = record.tag(self.key)
+        if value is None:
+            return False
+        return self.values is None or value.lower() in self.values
+
+    def describe(self) -> str:
+        return f"태그 {self.key}" + (f"={'|'.join(sorted(self.values))}" if self.values else "")
+
+
+class RequesterManagedRule(ProtectionRule):
+    """AWS 서비스가 관리하는 ENI 를 보호합니다. ENI 는 describe_network_interfaces 필터로 서버에서 제외합니다."""
+
+    def protects(self, record: ResourceRecord, now: float) -> bool:
+        return record.requester_managed
+
+    def server_filters(self, resource_type: str) -> List[Dict[str, Any]]:
+        if resource_type == 'enis':
+            return [{'Name': 'requester-managed', 'Values': ['false']}]
+        return []
+
+    def describe(self) -> str:
+        return "requester-managed"
+
+
+class InterfaceTypeRule(ProtectionRule):
+    """InterfaceType 이 values 중 하나인 ENI 를 보호합니다."""
+
+    def __init__(self, values: Iterable[str], types: Optional[Iterable[str]] = None):
+        super().__init__(types or ['enis'])
+        self.values = set(values)
+
+    def protects(self, record: ResourceRecord, now: float) -> bool:
+        return record.interface_type in self.values
+
+    def describe(self) -> str:
+        return f"InterfaceType {'|'.join(sorted(self.values))}"
+
+
+class MinAgeRule(ProtectionRule):
+    """
+    생성(생성 시각이 없으면 마지막 연결) 후 days 일이 지나지 않은 리소스를 보호합니다.
+    두 시각을 모두 알 수 없는 리소스(EIP, 보안 그룹 등)에는 적용되지 않습니다.
+    """
+
+    def __init__(self, days: float, types: Optional[Iterable[str]] = None):
+        super().__init__(types)
+        self.days = float(days)
+
+    def protects(self, record: ResourceRecord, now: float) -> bool:
+        since = record.created_at or record.attached_at
+        return since is not None and now - since < self.days * 86400
+
+    def describe(self) -> str:
+        return f"{self.days:g}일 미만"
+
+    def untimed_types(self) -> List[str]:
+        """규칙을 적용하도록 설정했지만 생성·연결 시각이 없어 실제로는 보호하지 못하는 리소스 타입."""
+        if self.resource_types is None:
+            candidates = get_resource_types()
+        else:
+            candidates = filter(None, (get_resource_type(name) for name in sorted(self.resource_types)))
+        return [resource_type.name for resource_type in candidates if not resource_type.timestamped]
+
+
+RULE_TYPES = {
+    'tag': TagRule,
+    'requester_managed': RequesterManagedRule,
+    'interface_type': InterfaceTypeRule,
+    'min_age': MinAgeRule,
+}
+
+def build_rule(spec: Dict[str, Any]) -> ProtectionRule:
+    """{"rule": "tag", "key": "keep", ...} 형식의 설정으로 규칙을 만듭니다. 알 수 없는 규칙이면 ValueError."""
+    options = dict(spec)
+    name = options.pop('rule', None)
+    if name not in RULE_TYPES:
+        raise ValueError(f"알 수 없는 보호 규칙: {name}")
+    return RULE_TYPES[name](**options)
+
+def _default_rule_specs() -> List[Dict[str, Any]]:
+    specs = []
+    for item in filter(None, (item.strip() for item in PROTECT_TAGS.split(','))):
+        key, _, value = item.partition('=')
+        specs.append({'rule': 'tag', 'key': key.strip(), 'values': [value.strip()] if value else None})
+    if PROTECT_REQUESTER_MANAGED:
+        specs.append({'rule': 'requester_managed'})
+    interface_types = [value.strip() for value in PROTECT_INTERFACE_TYPES.split(',') if value.strip()]
+    if interface_types:
+        specs.append({'rule': 'interface_type', 'values': interface_types})
+    if MIN_RESOURCE_AGE_DAYS > 0:
+        specs.append({'rule': 'min_age', 'days': MIN_RESOURCE_AGE_DAYS})
+    return specs
+
+@functools.lru_cache(maxsize=1)
+def get_protection_rules() -> Tuple[ProtectionRule, ...]:
+    """설정된 보호 규칙 목록. 컨테이너 수명 동안 캐시됩니다."""
+    if PROTECTION_RULES_FILE:
+        with open(PROTECTION_RULES_FILE, 'r', encoding='utf-8') as f:
+            specs = json.load(f)
+    elif PROTECTION_RULES:
+        specs = json.loads(PROTECTION_RULES)
+    else:
+        specs = _default_rule_specs()
+    rules = tuple(build_rule(spec) for spec in specs)
+    for rule in rules:
+        if isinstance(rule, MinAgeRule) and rule.untimed_types():
+            log.warning("보호 규칙 '%s' 는 생성·연결 시각이 없는 %s 에는 적용되지 않습니다. 태그 규칙으로 보호하세요.",
+                        rule.describe(), ', '.join(rule.untimed_types()))
+    return rules
+
+def get_server_filters(resource_type: str) -> List[Dict[str, Any]]:
+    """리소스 타입의 describe_* 호출에 더할 서버 측 필터 (규칙 중 필터로 표현할 수 있는 것만)."""
+    return [
+        server_filter
+        for rule in get_protection_rules() if rule.applies_to(resource_type)
+        for server_filter in rule.server_filters(resource_type)
+    ]
+
+def protection_reason(resource_type: str, record: Optional[ResourceRecord], now: Optional[float] = None) -> Optional[str]:
+    """리소스를 보호하는 첫 규칙의 설명을 반환합니다. 보호되지 않거나 레코드가 없으면 None."""
+    if record is None:
+        return None
+    now = now if now is not None else time.time()
+    for rule in get_protection_rules():
+        if rule.applies_to(resource_type) and rule.protects(record, now):
+            return rule.describe()
+    return None
+
+def iter_actionable(resource_type: str, resource_ids: Iterable[str],
+                    records: Dict[str, ResourceRecord]) -> Iterator[str]:
+    """
+    탐지기가 스트리밍하는 ID 중 보호되지 않은 것만 흘려보냅니다.
+    보호된 리소스는 records 에서도 제거되므로 목록·비용 계산에 나타나지 않습니다.
+    """
+    now = time.time()
+    protected = 0
+    for resource_id in resource_ids:
+        if protection_reason(resource_type, records.get(resource_id), now):
+            records.pop(resource_id, None)
+            protected += 1
+            continue
+        yield resource_id
+    if protected:
+        log.info("보호 규칙으로 %s %s개를 제외했습니다.", resource_type, protected)
+
+def find_protected(resource_type: str, records: Dict[str, ResourceRecord]) -> Dict[str, str]:
+    """다시 조회한 레코드 중 보호 대상인 리소스의 {ID: 보호 규칙 설명} 을 반환합니다."""
+    now = time.time()
+    protected = {}
+    for resource_id, record in records.items():
+        reason = protection_reason(resource_type, record, now)
+        if reason:
+            protected[resource_id] = reason
+    return protected
@@ -0,0 +1,104 @@
+import datetime
+from typing import Any, Callable, Dict, Iterable, List, NamedTuple, Optional, Tuple
+
+from util.throttle import call_with_retry, paginate_with_retry
+
+
+class ResourceRecord(NamedTuple):
+    """
+    탐지된 리소스 하나의 메타데이터.
+
+    튜플 기반이라 인스턴스당 딕셔너리가 없어 수만 개를 보관해도 메모리가 작고,
+    JSON 으로는 리스트 하나로 직렬화되어 스냅샷·이어서 실행 상태에 그대로 담을 수 있습니다.
+    값이 없는 필드는 None(태그는 빈 튜플)입니다.
+
+    Attributes:
+        id: 리소스 ID (로드 밸런서는 ARN)
+        created_at: 생성 시각 (epoch 초)
+        attached_at: 마지막 연결 시각 (epoch 초)
+        description: 설명 (로드 밸런서는 DNS 이름)
+        requester: 리소스를 만든 주체 (ENI 의 RequesterId 등)
+        requester_managed: AWS 서비스가 관리하는 리소스인지 여부
+        interface_type: ENI 의 InterfaceType (예: 'interface', 'lambda', 'nat_gateway')
+        tags: (키, 값) 쌍의 튜플
+        public_ip: 공인 IP
+        subnet_id: 서브넷 ID
+        vpc_id: VPC ID
+        size: 크기(GB). 볼륨·스냅샷만 사용 (비용 추정용)
+    """
+    id: str
+    created_at: Optional[float] = None
+    attached_at: Optional[float] = None
+    description: Optional[str] = None
+    requester: Optional[str] = None
+    requester_managed: bool = False
+    interface_type: Optional[str] = None
+    tags: Tuple[Tuple[str, str], ...] = ()
+    public_ip: Optional[str] = None
+    subnet_id: Optional[str] = None
+    vpc_id: Optional[str] = None
+    size: Optional[float] = None
+
+    def tag(self, key: str) -> Optional[str]:
+        """태그 값을 반환합니다. 없으면 None."""
+        for tag_key, value in self.tags:
+            if tag_key == key:
+                return value
+        return None
+
+
+def epoch(value: Optional[datetime.datetime]) -> Optional[float]:
+    """boto3 응답의 datetime 을 epoch 초로 바꿉니다."""
+    return value.timestamp() if value is not None else None
+
+def tags_from(aws_tags: Optional[Iterable[Dict[str, str]]]) -> Tuple[Tuple[str, str], ...]:
+    """[{"Key": ..., "Value": ...}] 형식의 태그 목록을 (키, 값) 튜플로 바꿉니다."""
+    return tuple((tag['Key'], tag.get('Value', '')) for tag in aws_tags or ())
+
+def record_from_list(values: List[Any]) -> ResourceRecord:
+    """JSON 으로 저장된 리스트에서 레코드를 복원합니다."""
+    record = ResourceRecord(*values)
+    return record._replace(tags=tuple(tuple(pair) for pair in record.tags))
+
+def records_to_json(records: Dict[str, ResourceRecord]) -> List[List[Any]]:
+    """{ID: 레코드} 를 JSON 으로 저장할 리스트로 바꿉니다."""
+    return [list(record) for record in records.values()]
+
+def records_from_json(values: Optional[List[List[Any]]]) -> Dict[str, ResourceRecord]:
+    """records_to_json 결과를 {ID: 레코드} 로 복원합니다."""
+    return {record.id: record for record in map(record_from_list, values or [])}
+
+
+# describe_* Filters 의 값 목록 최대 길이
+FILTER_VALUES_LIMIT = 200
+
+def describe_records(client, operation: str, result_key: str, id_filter: str, ids: List[str],
+                     to_record: Callable[[Dict[str, Any]], ResourceRecord],
+                     filter_param: str = 'Filters', paginate: bool = True,
+                     filters: Iterable[Dict[str, Any]] = (), **kwargs) -> Dict[str, ResourceRecord]:
+    """
+    ID 필터로 리소스를 다시 조회해 {ID: 레코드} 를 반환합니다 (삭제 직전 보호 규칙 재확인용).
+    ID 로 직접 조회하면 없는 리소스 하나 때문에 전체 호출이 실패하므로 필터를 사용하며,
+    이미 삭제된 리소스는 결과에 포함되지 않습니다 (삭제 후에도 한동안 조회되는 리소스는 filters 로 상태를 제한).
+
+    Args:
+        operation: describe API 이름 (예: 'describe_network_interfaces')
+        result_key: 응답에서 항목 목록의 키 (예: 'NetworkInterfaces')
+        id_filter: ID 필터 이름 (예: 'network-interface-id')
+        to_record: 응답 항목을 레코드로 바꾸는 함수
+        filter_param: 필터 파라미터 이름 (describe_nat_gateways 는 'Filter')
+        paginate: 페이지네이션 지원 여부
+        filters: ID 필터와 함께 적용할 추가 필터 (예: 상태)
+    """
+    records: Dict[str, ResourceRecord] = {}
+    for start in range(0, len(ids), FILTER_VALUES_LIMIT):
+        params = dict(kwargs)
+        params[filter_param] = [{'Name': id_filter, 'Values': ids[start:start + FILTER_VALUES_LIMIT]}, *filters]
+        if paginate:
+            items = (item for page in paginate_with_retry(client, operation, **params) for item in page.get(result_key, []))
+        else:
+            items = call_with_retry(client, operation, **params)[result_key]
+        for item in items:
+            record = to_record(item)
+            records[record.id] = record
+    return records
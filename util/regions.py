@@ -0,0 +1,114 @@
+import json
+import os
+import threading
+import time
+from typing import Any, Dict, List, Optional, Set, Tuple
+
+from util.aws import get_client
+from util.log import get_logger
+from util.throttle import call_with_retry
+
+log = get_logger('regions')
+
+# 리전 목록 캐시 설정
+REGION_CACHE_TTL = int(os.environ.get('REGION_CACHE_TTL', '3600'))  # 초
+REGION_CACHE_FILE = os.environ.get('REGION_CACHE_FILE', '')          # 예: /tmp/regions.json (비어 있으면 메모리 캐시만 사용)
+DISCOVERY_REGION = os.environ.get('REGION_DISCOVERY_REGION', 'us-east-1')
+
+# 계정별 리전 목록 캐시: {계정 키: (리전 목록, 조회 시각)}
+# 옵트인 리전은 계정마다 다르므로 교차 계정 스캔은 계정마다 따로 조회합니다.
+_cache: Dict[str, Tuple[List[str], float]] = {}
+_lock = threading.Lock()
+
+def _account_key(account_id: Optional[str]) -> str:
+    return account_id or 'local'
+
+def _parse_region_list(value: str) -> Set[str]:
+    """쉼표로 구분된 리전 목록 문자열을 집합으로 변환합니다."""
+    return {region.strip() for region in value.split(',') if region.strip()}
+
+def _read_cache_file() -> Dict[str, Any]:
+    if not REGION_CACHE_FILE:
+        return {}
+    try:
+        with open(REGION_CACHE_FILE, 'r', encoding='utf-8') as f:
+            return json.load(f).get('accounts', {})
+    except FileNotFoundError:
+        pass
+    except (OSError, ValueError, AttributeError) as e:
+        log.warning("리전 캐시 파일을 읽을 수 없습니다: %s", e)
+    return {}
+
+def _read_cached_regions(key: str) -> Optional[Tuple[List[str], float]]:
+    entry = _read_cache_file().get(key)
+    try:
+        if entry and time.time() - entry['fetched_at'] < REGION_CACHE_TTL:
+            return entry['regions'], entry['fetched_at']
+    except (KeyError, TypeError) as e:
+        log.warning("리전 캐시 파일 항목이 올바르지 않습니다 (%s): %s", key, e)
+    return None
+
+def _write_cache_file(key: str, regions: List[str], fetched_at: float) -> None:
+    if not REGION_CACHE_FILE:
+        return
+    try:
+        # 다른 계정의 항목은 그대로 두고 이 계정 항목만 갱신
+        accounts = _read_cache_file()
+        accounts[key] = {'regions': regions, 'fetched_at': fetched_at}
+        tmp_path = f"{REGION_CACHE_FILE}.tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump({'accounts': accounts}, f)
+        os.replace(tmp_path, REGION_CACHE_FILE)
+    except OSError as e:
+        log.warning("리전 캐시 파일을 쓸 수 없습니다: %s", e)
+
+def _describe_enabled_regions(account_id: Optional[str] = None) -> List[str]:
+    """계정에서 옵트인되었거나 옵트인이 필요 없는(활성화된) 리전만 조회합니다."""
+    ec2_client = get_client('ec2', DISCOVERY_REGION, account_id)
+    response = call_with_retry(
+        ec2_client,
+        'describe_regions',
+        Filters=[{'Name': 'opt-in-status', 'Values': ['opt-in-not-required', 'opted-in']}]
+    )
+    return sorted(region['RegionName'] for region in response['Regions'])
+
+def get_enabled_regions(force_refresh: bool = False, account_id: Optional[str] = None) -> List[str]:
+    """
+    계정(None 이면 Lambda 실행 계정)에서 활성화된 리전 목록을 반환합니다.
+
+    메모리 캐시 → 파일 캐시(REGION_CACHE_FILE) → describe_regions 순서로 조회하며,
+    캐시는 계정별로 REGION_CACHE_TTL 초 동안 유효합니다. 교차 계정이면 AssumeRole 세션으로 조회합니다.
+    """
+    key = _account_key(account_id)
+    with _lock:
+        now = time.time()
+        if not force_refresh:
+            cached = _cache.get(key)
+            if cached is not None and now - cached[1] < REGION_CACHE_TTL:
+                return list(cached[0])
+            cached = _read_cached_regions(key)
+            if cached is not None:
+                _cache[key] = cached
+                return list(cached[0])
+
+        regions = _describe_enabled_regions(account_id)
+        _cache[key] = (regions, now)
+        _write_cache_file(key, regions, now)
+        return list(regions)
+
+def get_regions(force_refresh: bool = False, account_id: Optional[str] = None) -> List[str]:
+    """
+    계정(None 이면 Lambda 실행 계정)의 스캔 대상 리전 목록을 반환합니다.
+
+    활성화된 리전 중 INCLUDE_REGIONS(지정된 경우)에 포함되고
+    EXCLUDE_REGIONS 에 포함되지 않은 리전만 남깁니다.
+    """
+    regions = get_enabled_regions(force_refresh, account_id)
+    include = _parse_region_list(os.environ.get('INCLUDE_REGIONS', ''))
+    exclude = _parse_region_list(os.environ.get('EXCLUDE_REGIONS', ''))
+    if include:
+        skipped = include.difference(regions)
+        if skipped:
+            log.info("활성화되지 않은 리전은 제외합니다: %s", ', '.join(sorted(skipped)))
+        regions = [region for region in regions if region in include]
+    return [region for region in regions if region not in exclude]
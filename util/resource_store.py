@@ -0,0 +1,83 @@
+import json
+import os
+import secrets
+from typing import Any, Dict, List, Optional
+
+from util.log import get_logger
+from util.storage import KeyValueStore, get_store, is_shared_backend
+
+log = get_logger('resource_store')
+
+# 탐지된 리소스 세트 저장소 설정
+# RESOURCE_STORE_BACKEND: 'none'(기본), 'local', 'sqlite', 's3', 'dynamodb'
+# 버튼 클릭과 삭제는 다른 Lambda 컨테이너에서 실행될 수 있으므로 운영 환경에서는 s3/dynamodb 를 사용하세요.
+RESOURCE_STORE_BACKEND = os.environ.get('RESOURCE_STORE_BACKEND', 'none')
+RESOURCE_SET_TTL = int(os.environ.get('RESOURCE_SET_TTL', '86400'))  # 초
+
+# Slack 버튼 value 최대 길이
+SLACK_BUTTON_VALUE_LIMIT = 2000
+
+def get_resource_store(backend: Optional[str] = None) -> Optional[KeyValueStore]:
+    return get_store(backend if backend is not None else RESOURCE_STORE_BACKEND, 'resource-sets')
+
+def save_resource_set(resources: Dict[str, Dict[str, List[str]]], backend: Optional[str] = None) -> str:
+    """
+    리소스 세트를 저장하고 짧은 스캔 ID를 반환합니다.
+
+    Args:
+        resources: {"리소스 타입": {"리전": [리소스 ID 목록]}} 형식의 딕셔너리
+        backend: 저장소 백엔드 (None이면 RESOURCE_STORE_BACKEND)
+
+    Returns:
+        스캔 ID (예: 'k3J9xQ2mP0aZ')
+    """
+    store = get_resource_store(backend)
+    if store is None:
+        raise ValueError("리소스 세트 저장소가 설정되지 않았습니다.")
+    scan_id = secrets.token_urlsafe(9)
+    store.put(scan_id, {'resources': resources}, ttl=RESOURCE_SET_TTL)
+    log.info("리소스 세트 저장 완료 (scan_id: %s)", scan_id)
+    return scan_id
+
+def load_resource_set(scan_id: str, backend: Optional[str] = None) -> Optional[Dict[str, Dict[str, List[str]]]]:
+    """스캔 ID로 리소스 세트를 불러옵니다. 없거나 만료되었으면 None."""
+    store = get_resource_store(backend)
+    if store is None:
+        return None
+    value = store.get(scan_id)
+    return value['resources'] if value else None
+
+def build_delete_button_value(resources: Dict[str, Dict[str, List[str]]]) -> Dict[str, Any]:
+    """
+    삭제 버튼 value 에 넣을 딕셔너리를 만듭니다.
+
+    저장소가 설정되어 있으면 스캔 ID만 담습니다. 설정되어 있지 않으면 기존처럼 리소스를
+    그대로 담습니다. 버튼 클릭을 처리하는 컨테이너는 탐지한 컨테이너와 다를 수 있으므로
+    컨테이너 로컬 저장소로 대신하지 않습니다.
+
+    Raises:
+        ValueError: 저장소가 없는데 리소스 목록이 Slack 의 value 길이 제한(2000자)을 넘는 경우
+    """
+    if get_resource_store() is not None:
+        if not is_shared_backend(RESOURCE_STORE_BACKEND):
+            log.warning("RESOURCE_STORE_BACKEND=%s 는 컨테이너마다 따로 저장되어 다른 컨테이너의 삭제 요청에서 "
+                        "찾지 못할 수 있습니다. s3 또는 dynamodb 를 사용하세요.", RESOURCE_STORE_BACKEND)
+        return {'scan_id': save_resource_set(resources)}
+
+    inline_value = {'resources': resources}
+    if len(json.dumps(inline_value)) <= SLACK_BUTTON_VALUE_LIMIT:
+        return inline_value
+
+    raise ValueError(
+        f"삭제할 리소스 목록이 Slack 버튼 value 제한({SLACK_BUTTON_VALUE_LIMIT}자)을 넘습니다. "
+        "RESOURCE_STORE_BACKEND 를 s3 또는 dynamodb 로 설정하세요."
+    )
+
+def resolve_resource_set(value: Dict[str, Any]) -> Optional[Dict[str, Dict[str, List[str]]]]:
+    """버튼 value 또는 Lambda 페이로드에서 리소스 세트를 꺼냅니다 (스캔 ID면 저장소에서 조회)."""
+    if value.get('resources'):
+        return value['resources']
+    scan_id = value.get('scan_id')
+    if not scan_id:
+        return None
+    return load_resource_set(scan_id)
@@ -0,0 +1,140 @@
+import os
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple
+
+from util.log import get_logger
+from util.records import ResourceRecord
+
+from ebs.delete import delete_volume
+from ebs.detector import describe_volumes, detect_volumes
+from ebs_snapshot.delete import delete_snapshot
+from ebs_snapshot.detector import describe_snapshots, detect_old_snapshots
+from eip.delete import delete_eip
+from eip.detector import describe_eips, detect_eips
+from elb.delete import delete_load_balancer
+from elb.detector import describe_load_balancers, detect_unused_load_balancers
+from eni.delete import delete_eni
+from eni.detector import describe_enis, detect_enis
+from natgw.delete import delete_nat_gateway
+from natgw.detector import describe_nat_gateways, detect_idle_nat_gateways
+from sg.delete import delete_security_group
+from sg.detector import describe_security_groups, detect_orphaned_security_groups
+
+log = get_logger('resource_types')
+
+# 탐지·삭제할 리소스 타입 (쉼표 구분, 'all' 이면 등록된 모든 타입)
+ENABLED_RESOURCE_TYPES = os.environ.get('ENABLED_RESOURCE_TYPES', 'eips,enis')
+
+
+class ResourceType:
+    """
+    리소스 타입 하나의 탐지 함수, 삭제 함수, 비용 정보를 묶은 정의.
+
+    Attributes:
+        name: 리소스 딕셔너리와 Slack 메시지에 쓰이는 키 (예: 'eips')
+        label: 사람이 읽는 이름
+        service: 탐지·삭제에 사용할 boto3 서비스 이름 (예: 'ec2', 'elbv2')
+        detect: (client, page_size, limit, records) 를 받아 미사용 리소스 ID를 스트리밍하는 함수.
+                records 딕셔너리가 주어지면 ID별 ResourceRecord 를 채웁니다.
+        describe: (client, [리소스 ID]) 를 받아 현재 상태의 {ID: ResourceRecord} 를 반환하는 함수
+                  (삭제 직전 보호 규칙 재확인용)
+        delete: (client, resource_id) 를 받아 리소스를 삭제하는 함수
+        delete_api: 삭제에 사용하는 API 이름 (리전·API별 동시성 제한에 사용)
+        pricing: 비용 정보 {'unit': 'hour'(리소스당 시간 요금), 'gb_month'(GB당 월 요금),
+                 'public_ip_hour'(공인 IP 가 있는 리소스만 시간 요금) 또는 'none'(무료)}
+        timestamped: 탐지된 리소스의 레코드에 생성 또는 연결 시각이 있는지 (보호 규칙 min_age 적용 가능 여부)
+        related_services: 탐지할 때 함께 조회하는 다른 boto3 서비스. 같은 리전·계정의 클라이언트가
+                          detect 에 '<서비스>_client' 키워드 인자로 전달됩니다.
+    """
+
+    def __init__(self, name: str, label: str, service: str,
+                 detect: Callable[..., Iterator[str]],
+                 describe: Callable[[Any, List[str]], Dict[str, ResourceRecord]],
+                 delete: Callable[[Any, str], Any],
+                 delete_api: str, pricing: Dict[str, Any], timestamped: bool = True,
+                 related_services: Tuple[str, ...] = ()):
+        self.name = name
+        self.label = label
+        self.service = service
+        self.detect = detect
+        self.describe = describe
+        self.delete = delete
+        self.delete_api = delete_api
+        self.pricing = pricing
+        self.timestamped = timestamped
+        self.related_services = related_services
+
+    def related_clients(self, region: str, account_id: Optional[str] = None) -> Dict[str, Any]:
+        """detect 에 넘길 related_services 클라이언트 키워드 인자."""
+        from util.aws import get_client
+        return {f"{service}_client": get_client(service, region, account_id) for service in self.related_services}
+
+
+_registry: Dict[str, ResourceType] = {}
+
+def register_resource_type(resource_type: ResourceType) -> None:
+    """리소스 타입을 등록합니다. 같은 이름이 있으면 교체합니다."""
+    _registry[resource_type.name] = resource_type
+
+def get_resource_type(name: str) -> Optional[ResourceType]:
+    """이름으로 등록된 리소스 타입을 반환합니다. 없으면 None."""
+    return _registry.get(name)
+
+def get_resource_types() -> List[ResourceType]:
+    """ENABLED_RESOURCE_TYPES 로 활성화된 리소스 타입 목록을 등록 순서대로 반환합니다."""
+    if ENABLED_RESOURCE_TYPES.strip().lower() == 'all':
+        return list(_registry.values())
+    enabled = {name.strip() for name in ENABLED_RESOURCE_TYPES.split(',') if name.strip()}
+    unknown = enabled - _registry.keys()
+    if unknown:
+        log.warning("등록되지 않은 리소스 타입을 무시합니다: %s", ', '.join(sorted(unknown)))
+    return [resource_type for name, resource_type in _registry.items() if name in enabled]
+
+
+register_resource_type(ResourceType(
+    name='eips', label='Elastic IP', service='ec2',
+    # describe_addresses 는 페이지네이션을 지원하지 않음
+    detect=lambda client, page_size, limit, records=None: detect_eips(client, limit=limit, records=records),
+    describe=describe_eips, delete=delete_eip, delete_api='release_address',
+    pricing={'unit': 'hour'},
+    timestamped=False
+))
+register_resource_type(ResourceType(
+    name='enis', label='Network Interface', service='ec2',
+    detect=detect_enis, describe=describe_enis,
+    delete=delete_eni, delete_api='delete_network_interface',
+    pricing={'unit': 'public_ip_hour'},
+    timestamped=False
+))
+register_resource_type(ResourceType(
+    name='volumes', label='EBS Volume', service='ec2',
+    detect=detect_volumes, describe=describe_volumes,
+    delete=delete_volume, delete_api='delete_volume',
+    pricing={'unit': 'gb_month'}
+))
+register_resource_type(ResourceType(
+    name='snapshots', label='EBS Snapshot', service='ec2',
+    detect=detect_old_snapshots, describe=describe_snapshots,
+    delete=delete_snapshot, delete_api='delete_snapshot',
+    pricing={'unit': 'gb_month'}
+))
+register_resource_type(ResourceType(
+    name='nat_gateways', label='NAT Gateway', service='ec2',
+    detect=detect_idle_nat_gateways, describe=describe_nat_gateways,
+    delete=delete_nat_gateway, delete_api='delete_nat_gateway',
+    pricing={'unit': 'hour'}
+))
+register_resource_type(ResourceType(
+    name='load_balancers', label='Load Balancer', service='elbv2',
+    detect=detect_unused_load_balancers, describe=describe_load_balancers,
+    delete=delete_load_balancer, delete_api='delete_load_balancer',
+    pricing={'unit': 'hour'}
+))
+register_resource_type(ResourceType(
+    name='security_groups', label='Security Group', service='ec2',
+    detect=detect_orphaned_security_groups, describe=describe_security_groups,
+    delete=delete_security_group, delete_api='delete_security_group',
+    pricing={'unit': 'none'},
+    timestamped=False,
+    # 시작 구성(Auto Scaling)이 참조하는 보안 그룹은 사용 중
+    related_services=('autoscaling',)
+))
@@ -1,7 +1,11 @@
 import json
 import base64
 import urllib.parse
-from typing import Dict, Any, Optional, Union
+from typing import Dict, Any, Optional, Tuple, Union
+
+from util.log import get_logger
+
+log = get_logger('simple_parser')
 
 def parse_body(event: Dict[str, Any]) -> Optional[Dict[str, Any]]:
     """
@@ -20,7 +24,7 @@ def parse_body(event: Dict[str, Any]) -> Optional[Dict[str, Any]]:
     if not body:
         # 이미 JSON 객체인지 확인 (Lambda URL로 직접 호출되는 경우 등)
         if event.get('type') == 'block_actions' and event.get('actions'):
-            print("이벤트 객체 자체가 페이로드인 것으로 간주합니다.")
+            log.debug("이벤트 객체 자체가 페이로드인 것으로 간주합니다.")
             return event
         return None
     
@@ -28,47 +32,112 @@ def parse_body(event: Dict[str, Any]) -> Optional[Dict[str, Any]]:
     if event.get('isBase64Encoded', False):
         try:
             body = base64.b64decode(body).decode('utf-8')
-            print("Base64 디코딩 완료.")
+            log.debug("Base64 디코딩 완료.")
         except Exception as e:
-            print(f"Base64 디코딩 실패: {str(e)}")
+            log.warning("Base64 디코딩 실패: %s", e)
             return None
     
     # 3. 컨텐츠 타입 확인
     headers = event.get('headers', {}) or {}
     content_type = headers.get('content-type', '') or headers.get('Content-Type', '')
-    print(f"Content-Type: {content_type}")
+    log.debug("Content-Type: %s", content_type)
     
     # 4. 형식에 맞게 파싱
     try:
         if 'application/json' in content_type:
             # JSON 형식인 경우
             parsed = json.loads(body)
-            print(f"JSON 파싱 결과: {json.dumps(parsed)[:200]}...") # 로그 길이 제한
+            log.payload("JSON 파싱 결과", parsed)
             return parsed
         elif 'application/x-www-form-urlencoded' in content_type:
             # URL 인코딩된 폼 데이터인 경우
             parsed = dict(urllib.parse.parse_qsl(body))
-            print(f"URL 인코딩 파싱 결과: {json.dumps(parsed)[:200]}...") # 로그 길이 제한
+            log.payload("URL 인코딩 파싱 결과", parsed)
             return parsed
         else:
             # 직접 JSON 파싱 시도 (content-type이 명확하지 않거나 없는 경우)
             try:
                 parsed = json.loads(body)
-                print(f"직접 JSON 파싱 결과: {json.dumps(parsed)[:200]}...") # 로그 길이 제한
+                log.payload("직접 JSON 파싱 결과", parsed)
                 return parsed
             except json.JSONDecodeError:
-                print(f"JSON으로 파싱할 수 없는 body입니다. Raw로 처리합니다.")
+                log.debug("JSON으로 파싱할 수 없는 body입니다. Raw로 처리합니다.")
                 return {"raw": body}
             except Exception as e:
-                print(f"직접 JSON 파싱 중 오류: {str(e)}")
+                log.warning("직접 JSON 파싱 중 오류: %s", e)
                 return {"raw": body}
     except Exception as e:
-        print(f"Body 파싱 실패: {str(e)}")
+        log.warning("Body 파싱 실패: %s", e)
         return {"raw": body}
 
+# classify_event 가 반환하는 이벤트 종류
+EVENT_COMMAND = 'command'          # Slack 슬래시 커맨드
+EVENT_INTERACTION = 'interaction'  # Slack 인터랙티브 메시지 (버튼 클릭 등)
+EVENT_INTERNAL = 'internal'        # 자기 자신의 비동기 호출 (source: 'lambda')
+EVENT_UNKNOWN = 'unknown'
+
+def classify_event(event: Dict[str, Any]) -> Tuple[str, Optional[Dict[str, Any]]]:
+    """
+    이벤트 종류를 한 번에 판별하고 해당 페이로드를 반환합니다.
+    내부 비동기 호출은 body 가 없으므로 파싱하지 않고, 그 외에는 body 를 한 번만 파싱합니다.
+
+    Args:
+        event: Lambda 이벤트
+
+    Returns:
+        (이벤트 종류, 페이로드) 튜플. 내부 호출은 event 자체, 알 수 없는 요청은 None
+    """
+    if event.get('source') == 'lambda':
+        return EVENT_INTERNAL, event
+    if event.get('type') == 'block_actions' and event.get('actions'):
+        log.debug("직접 인터랙티브 페이로드 감지됨 (event 객체)")
+        return EVENT_INTERACTION, event
+
+    body_data = parse_body(event)
+    if not body_data:
+        return EVENT_UNKNOWN, None
+    command_payload = _command_from_body(body_data)
+    if command_payload:
+        return EVENT_COMMAND, command_payload
+    interactive_payload = _interaction_from_body(body_data)
+    if interactive_payload:
+        return EVENT_INTERACTION, interactive_payload
+    return EVENT_UNKNOWN, None
+
+def _command_from_body(body_data: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+    # Slack 슬래시 커맨드인지 확인
+    if 'command' in body_data and isinstance(body_data.get('command'), str) and body_data['command'].startswith('/'):
+        return body_data
+    return None
+
+def _interaction_from_body(body_data: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+    # Slack 인터랙티브 메시지인지 확인 (URL 인코딩된 'payload' 키)
+    if 'payload' in body_data:
+        try:
+            payload_str = body_data['payload']
+            # payload_str이 실제 문자열인지 확인
+            if isinstance(payload_str, str):
+                payload = json.loads(payload_str)
+                log.payload("Payload 디코딩 결과", payload)
+                # 타입이 block_actions인지 추가 확인
+                if payload.get('type') == 'block_actions':
+                    return payload
+                else:
+                    log.debug("'payload' 내부의 타입이 'block_actions'가 아님: %s", payload.get('type'))
+            else:
+                log.debug("'payload' 키의 값이 문자열이 아닙니다.")
+        except (json.JSONDecodeError, TypeError) as e:
+            log.warning("Payload 디코딩 실패: %s", e)
+    # body 자체가 인터랙티브 페이로드인 경우 (content-type: application/json)
+    elif body_data.get('type') == 'block_actions' and body_data.get('actions'):
+        log.debug("Body 자체가 인터랙티브 페이로드인 것 감지됨 (파싱된 body)")
+        return body_data
+    return None
+
 def get_slack_command_payload(event: Dict[str, Any]) -> Optional[Dict[str, Any]]:
     """
     API Gateway 이벤트에서 Slack 슬래시 커맨드 페이로드를 추출합니다.
+    이벤트 종류를 모를 때는 body 를 한 번만 파싱하는 classify_event 를 사용하세요.
     
     Args:
         event: API Gateway에서 전달된 Lambda 이벤트
@@ -79,16 +148,12 @@ def get_slack_command_payload(event: Dict[str, Any]) -> Optional[Dict[str, Any]]
     body_data = parse_body(event)
     if not body_data:
         return None
-    
-    # Slack 슬래시 커맨드인지 확인
-    if 'command' in body_data and isinstance(body_data.get('command'), str) and body_data['command'].startswith('/'):
-        return body_data
-    
-    return None
+    return _command_from_body(body_data)
 
 def get_slack_interactive_payload(event: Dict[str, Any]) -> Optional[Dict[str, Any]]:
     """
     API Gateway 이벤트에서 Slack 인터랙티브 페이로드(버튼 클릭 등)를 추출합니다.
+    이벤트 종류를 모를 때는 body 를 한 번만 파싱하는 classify_event 를 사용하세요.
     
     Args:
         event: API Gateway에서 전달된 Lambda 이벤트
@@ -98,36 +163,13 @@ def get_slack_interactive_payload(event: Dict[str, Any]) -> Optional[Dict[str, A
     """
     # 직접 Lambda URL로 호출된 경우 또는 body가 이미 파싱된 경우
     if event.get('type') == 'block_actions' and event.get('actions'):
-        print("직접 인터랙티브 페이로드 감지됨 (event 객체)")
+        log.debug("직접 인터랙티브 페이로드 감지됨 (event 객체)")
         return event
     
     body_data = parse_body(event)
     if not body_data:
         return None
-    
-    # Slack 인터랙티브 메시지인지 확인 (URL 인코딩된 'payload' 키)
-    if 'payload' in body_data:
-        try:
-            payload_str = body_data['payload']
-            # payload_str이 실제 문자열인지 확인
-            if isinstance(payload_str, str):
-                payload = json.loads(payload_str)
-                print(f"Payload 디코딩 결과: {json.dumps(payload)[:200]}...") # 로그 길이 제한
-                # 타입이 block_actions인지 추가 확인
-                if payload.get('type') == 'block_actions':
-                    return payload
-                else:
-                    print(f"'payload' 내부의 타입이 'block_actions'가 아님: {payload.get('type')}")
-            else:
-                print("'payload' 키의 값이 문자열이 아닙니다.")
-        except (json.JSONDecodeError, TypeError) as e:
-            print(f"Payload 디코딩 실패: {str(e)}")
-    # body 자체가 인터랙티브 페이로드인 경우 (content-type: application/json)
-    elif body_data.get('type') == 'block_actions' and body_data.get('actions'):
-        print("Body 자체가 인터랙티브 페이로드인 것 감지됨 (파싱된 body)")
-        return body_data
-    
-    return None
+    return _interaction_from_body(body_data)
 
 def get_action_id(payload: Optional[Dict[str, Any]]) -> Optional[str]:
     """
@@ -142,19 +184,19 @@ def get_action_id(payload: Optional[Dict[str, Any]]) -> Optional[str]:
     """
     try:
         if not payload:
-            print("Action ID 추출 실패: 입력 페이로드가 없습니다.")
+            log.debug("Action ID 추출 실패: 입력 페이로드가 없습니다.")
             return None
 
         # 'payload' 키가 있는지 확인 (URL 인코딩된 경우)
         if 'payload' in payload and isinstance(payload['payload'], str):
-            print("'payload' 키에서 JSON 파싱 시도...")
+            log.debug("'payload' 키에서 JSON 파싱 시도...")
             payload_dict = json.loads(payload['payload'])
         # body 자체가 페이로드인 경우 (application/json 또는 직접 호출)
         elif payload.get('type') == 'block_actions' and 'actions' in payload:
-            print("입력 페이로드 자체가 block_actions 타입입니다.")
+            log.debug("입력 페이로드 자체가 block_actions 타입입니다.")
             payload_dict = payload
         else:
-            print("Action ID 추출 실패: 유효한 인터랙티브 페이로드 형식이 아닙니다.")
+            log.debug("Action ID 추출 실패: 유효한 인터랙티브 페이로드 형식이 아닙니다.")
             return None
 
         # action_id 추출
@@ -164,18 +206,18 @@ def get_action_id(payload: Optional[Dict[str, Any]]) -> Optional[str]:
             if isinstance(first_action, dict):
                 action_id = first_action.get('action_id')
                 if action_id and isinstance(action_id, str):
-                    print(f"Action ID 추출 성공: {action_id}")
+                    log.debug("Action ID 추출 성공: %s", action_id)
                     return action_id
         
-        print("Action ID 추출 실패: actions 구조에서 action_id를 찾을 수 없습니다.")
+        log.debug("Action ID 추출 실패: actions 구조에서 action_id를 찾을 수 없습니다.")
         return None
 
     except (json.JSONDecodeError, KeyError, IndexError, TypeError) as e:
-        print(f"Action ID 추출 중 오류 발생: {type(e).__name__} - {str(e)}")
+        log.warning("Action ID 추출 중 오류 발생: %s - %s", type(e).__name__, e)
         return None
     except Exception as e:
         # 예상치 못한 다른 오류 처리
-        print(f"Action ID 추출 중 예상치 못한 오류 발생: {type(e).__name__} - {str(e)}")
+        log.error("Action ID 추출 중 예상치 못한 오류 발생: %s - %s", type(e).__name__, e)
         return None
 
 def create_slack_response(text: str, ephemeral: bool = True) -> Dict[str, Any]:
@@ -1,62 +1,216 @@
+import http.client
 import json
 import os
-import urllib.request
-from typing import Dict, Any, Optional, List, Union
+import random
+import threading
+import time
+import urllib.parse
+from typing import Dict, Any, Optional, List, Tuple, Union
 
-def send_slack_block_response(response_url: str, blocks: Optional[List[Dict[str, Any]]] = None) -> bool:
-    
+from util.log import get_logger
+from util.metrics import count, timed, timer
+
+log = get_logger('slack')
+
+# Slack 전송 설정
+SLACK_TIMEOUT = float(os.environ.get('SLACK_TIMEOUT', '5'))              # 요청당 타임아웃(초)
+SLACK_MAX_RETRIES = int(os.environ.get('SLACK_MAX_RETRIES', '3'))
+SLACK_SEND_BUDGET = float(os.environ.get('SLACK_SEND_BUDGET', '20'))     # 메시지 하나에 쓸 수 있는 최대 시간(초, 재시도 포함)
+SLACK_MAX_RETRY_AFTER = float(os.environ.get('SLACK_MAX_RETRY_AFTER', '10'))
+
+# 재시도할 응답 상태 코드
+RETRYABLE_STATUS = {429, 500, 502, 503, 504}
+# 응답을 받기 전에 실패해도 다시 보낼 수 있는 메서드
+IDEMPOTENT_METHODS = {'GET', 'HEAD', 'OPTIONS'}
+
+
+class SlackClient:
+    """
+    호스트별 HTTP(S) 연결을 유지(keep-alive)하며 재사용하는 Slack 전송 클라이언트.
+
+    쉬고 있는 연결은 호스트별 풀에 두고 요청마다 하나씩 꺼내 쓰므로, 느린 요청이
+    다른 스레드의 전송을 막지 않습니다. 연결·전송 실패와 429/5xx 응답은 지수 백오프
+    (또는 Retry-After)로 재시도하며, 요청마다 타임아웃과 전체 시간 예산을 적용합니다.
+    """
+
+    def __init__(self, timeout: float = SLACK_TIMEOUT, max_retries: int = SLACK_MAX_RETRIES,
+                 send_budget: float = SLACK_SEND_BUDGET):
+        self.timeout = timeout
+        self.max_retries = max_retries
+        self.send_budget = send_budget
+        self.idle: Dict[Tuple[str, str], List[http.client.HTTPConnection]] = {}
+        self.lock = threading.Lock()
+
+    def _checkout(self, scheme: str, netloc: str) -> Tuple[http.client.HTTPConnection, bool]:
+        """쉬고 있는 연결을 꺼내거나 새 연결을 만듭니다. (연결, 재사용 여부) 를 반환합니다."""
+        with self.lock:
+            idle = self.idle.get((scheme, netloc))
+            if idle:
+                return idle.pop(), True
+        if scheme == 'https':
+            return http.client.HTTPSConnection(netloc, timeout=self.timeout), False
+        return http.client.HTTPConnection(netloc, timeout=self.timeout), False
+
+    def _checkin(self, scheme: str, netloc: str, connection: http.client.HTTPConnection) -> None:
+        with self.lock:
+            self.idle.setdefault((scheme, netloc), []).append(connection)
+
+    @staticmethod
+    def _can_resend(method: str, reused: bool, error: Exception) -> bool:
+        """
+        요청을 보낸 뒤 응답을 받기 전에 실패했을 때 다시 보내도 되는지 여부.
+
+        서버가 이미 처리했을 수 있으므로(읽기 타임아웃 등) 멱등 요청만 다시 보냅니다.
+        재사용한 keep-alive 연결이 응답 없이 끊긴 경우는 서버가 유휴 연결을 닫은 것이므로 예외입니다.
+        """
+        return method in IDEMPOTENT_METHODS or (reused and isinstance(error, http.client.RemoteDisconnected))
+
+    def request(self, method: str, url: str, body: Optional[bytes] = None,
+                headers: Optional[Dict[str, str]] = None) -> Tuple[int, bytes]:
+        """
+        요청을 보내고 (상태 코드, 응답 본문)을 반환합니다.
+
+        Raises:
+            Exception: 재시도 횟수나 시간 예산을 모두 쓴 뒤에도 실패했거나,
+                       POST 를 보낸 뒤 응답을 기다리다 실패한 경우 (중복 전송 방지)
+        """
+        parsed = urllib.parse.urlsplit(url)
+        path = parsed.path or '/'
+        if parsed.query:
+            path = f"{path}?{parsed.query}"
+        started = time.monotonic()
+        attempt = 0
+
+        while True:
+            retry_after = None
+            connection, reused = self._checkout(parsed.scheme, parsed.netloc)
+            sent = False
+            try:
+                connection.request(method, path, body=body, headers=headers or {})
+                sent = True
+                response = connection.getresponse()
+                data = response.read()
+            except (http.client.HTTPException, OSError) as e:
+                connection.close()
+                if sent and not self._can_resend(method, reused, e):
+                    raise
+                # 연결·전송 실패나 유휴 상태에서 끊긴 keep-alive 연결: 새 연결로 재시도
+                error: Exception = e
+            else:
+                status = response.status
+                if response.will_close:
+                    connection.close()
+                else:
+                    self._checkin(parsed.scheme, parsed.netloc, connection)
+                if status not in RETRYABLE_STATUS:
+                    return status, data
+                retry_after = response.getheader('Retry-After')
+                error = RuntimeError(f"HTTP {status}: {data[:200]!r}")
+
+            delay = self._retry_delay(attempt, retry_after)
+            if attempt >= self.max_retries or time.monotonic() - started + delay > self.send_budget:
+                raise error
+            log.warning("⏳ Slack 요청 재시도 %s/%s (%s, %.2fs 대기)", attempt + 1, self.max_retries, error, delay)
+            count('SlackRetries')
+            time.sleep(delay)
+            attempt += 1
+
+    @staticmethod
+    def _retry_delay(attempt: int, retry_after: Optional[str]) -> float:
+        if retry_after:
+            try:
+                return min(SLACK_MAX_RETRY_AFTER, max(0.0, float(retry_after)))
+            except ValueError:
+                pass
+        return random.uniform(0, min(SLACK_MAX_RETRY_AFTER, 0.5 * (2 ** attempt)))
+
+    def post_json(self, url: str, payload: Dict[str, Any], headers: Optional[Dict[str, str]] = None) -> Tuple[int, bytes]:
+        return self.request(
+            "POST",
+            url,
+            body=json.dumps(payload).encode("utf-8"),
+            headers={"Content-Type": "application/json; charset=utf-8", **(headers or {})}
+        )
+
+    def close(self) -> None:
+        with self.lock:
+            for connections in self.idle.values():
+                for connection in connections:
+                    connection.close()
+            self.idle.clear()
+
+
+# 웜 컨테이너에서 호출 간에 재사용되는 공유 클라이언트
+_client: Optional[SlackClient] = None
+_client_lock = threading.Lock()
+
+def get_slack_client() -> SlackClient:
+    global _client
+    with _client_lock:
+        if _client is None:
+            _client = SlackClient()
+        return _client
+
+
+def _post_to_response_url(response_url: str, slack_message: Dict[str, Any]) -> bool:
     if not response_url:
-        print("❌ No response_url provided")
+        log.error("❌ No response_url provided")
         return False
-    
+    try:
+        with timer('SlackPostLatency'):
+            status, data = get_slack_client().post_json(response_url, slack_message)
+    except Exception as e:
+        log.error("❌ Failed to send Slack message: %s", e)
+        count('SlackErrors')
+        return False
+    if status >= 400:
+        log.error("❌ Failed to send Slack message: HTTP %s %r", status, data[:200])
+        count('SlackErrors')
+        return False
+    log.debug("✅ Successfully sent message to Slack")
+    count('SlackMessages')
+    return True
+
+
+def send_slack_block_response(response_url: str, blocks: Optional[List[Dict[str, Any]]] = None,
+                              replace_original: bool = False) -> bool:
     # 메시지 데이터 구성
     slack_message = {
         "response_type": "ephemeral",
         "blocks": blocks
     }
-    
-    req = urllib.request.Request(
-        response_url,
-        data=json.dumps(slack_message).encode("utf-8"),
-        headers={"Content-Type": "application/json"},
-        method="POST"
-    )
-    try:
-        with urllib.request.urlopen(req) as res:
-            res.read()
-            print("✅ Successfully sent message to Slack")
-    except Exception as e:
-        print("❌ Failed to send Slack message:", e)
+    if replace_original:
+        # 같은 response_url 로 보낸 이전 메시지를 제자리에서 교체
+        slack_message["replace_original"] = True
+    return _post_to_response_url(response_url, slack_message)
+
+
+@timed('SlackDeliveryTime')
+def send_slack_block_messages(response_url: str, messages: List[List[Dict[str, Any]]],
+                              replace_original: bool = False) -> bool:
+    """
+    여러 메시지로 나뉜 블록을 순서대로 전송합니다 (첫 메시지 이후는 후속 메시지).
+    모든 메시지는 공유 클라이언트의 같은 연결로 전송됩니다.
+    replace_original 이면 첫 메시지가 이전 메시지(진행 상황 등)를 교체합니다.
+    """
+    ok = True
+    for i, blocks in enumerate(messages):
+        ok = send_slack_block_response(response_url, blocks, replace_original=replace_original and i == 0) and ok
+    return ok
 
 
 def send_slack_text_response(response_url: str, message: str, ephemeral: bool = True) -> bool:
-    if not response_url:
-        print("❌ No response_url provided")
-        return False
-    
     # 메시지 데이터 구성
     slack_message = {
         "response_type": "ephemeral",
         "text": message
     }
-    
-    req = urllib.request.Request(
-        response_url,
-        data=json.dumps(slack_message).encode("utf-8"),
-        headers={"Content-Type": "application/json"},
-        method="POST"
-    )
-    try:
-        with urllib.request.urlopen(req) as res:
-            res.read()
-            print("✅ Successfully sent message to Slack")
-    except Exception as e:
-        print("❌ Failed to send Slack message:", e)
+    return _post_to_response_url(response_url, slack_message)
 
 
 def return_slack_response(message: str, ephemeral: bool = True) -> None:
-   
-    
+
+
     return {
         "statusCode": 200,
         "headers": {
@@ -70,3 +224,51 @@ def return_slack_response(message: str, ephemeral: bool = True) -> None:
         })
     }
 
+
+@timed('SlackUploadTime')
+def upload_slack_file(channel_id: str, filename: str, content: str, title: Optional[str] = None) -> bool:
+    """
+    봇 토큰(SLACK_BOT_TOKEN)으로 채널에 텍스트 파일을 업로드합니다.
+    메시지 제한을 넘는 전체 목록을 첨부할 때 사용합니다.
+    """
+    token = os.environ.get('SLACK_BOT_TOKEN', '')
+    if not token or not channel_id:
+        log.error("❌ SLACK_BOT_TOKEN 또는 channel_id가 없어 파일을 업로드할 수 없습니다.")
+        return False
+
+    client = get_slack_client()
+    data = content.encode("utf-8")
+    auth_header = {"Authorization": f"Bearer {token}"}
+    try:
+        # 1. 업로드 URL 발급
+        query = urllib.parse.urlencode({"filename": filename, "length": len(data)})
+        _, body = client.request("GET", f"https://slack.com/api/files.getUploadURLExternal?{query}", headers=auth_header)
+        upload = json.loads(body)
+        if not upload.get("ok"):
+            log.error("❌ Failed to get Slack upload URL: %s", upload.get("error"))
+            return False
+
+        # 2. 파일 내용 업로드
+        status, body = client.request("POST", upload["upload_url"], body=data)
+        if status >= 400:
+            log.error("❌ Failed to upload Slack file content: HTTP %s %r", status, body[:200])
+            return False
+
+        # 3. 업로드 완료 및 채널 공유
+        _, body = client.post_json(
+            "https://slack.com/api/files.completeUploadExternal",
+            {
+                "files": [{"id": upload["file_id"], "title": title or filename}],
+                "channel_id": channel_id
+            },
+            headers=auth_header
+        )
+        completed = json.loads(body)
+        if not completed.get("ok"):
+            log.error("❌ Failed to complete Slack file upload: %s", completed.get("error"))
+            return False
+        log.info("✅ Successfully uploaded file to Slack")
+        return True
+    except Exception as e:
+        log.error("❌ Failed to upload Slack file: %s", e)
+        return False
@@ -1,86 +1,192 @@
-from typing import Dict, Any, List, Optional
+from typing import Dict, Any, Iterable, Iterator, List, Optional, Tuple
 import json
+import os
+import time
 
-def create_resource_detect_blocks(resources: Dict[str, Dict[str, List[str]]], 
-                                  response_url: Optional[str] = None,
-                                  title: str = "리소스 목록", 
-                                  show_delete_button: bool = True) -> List[Dict[str, Any]]:
+from util.metrics import timed
+from util.pricing import format_usd
+from util.records import ResourceRecord
+
+# Slack Block Kit 제한
+SECTION_TEXT_LIMIT = 3000   # section 블록 text 최대 길이
+MESSAGE_BLOCK_LIMIT = 50    # 메시지당 최대 블록 수
+DETAIL_TEXT_LIMIT = 40      # 목록에 덧붙이는 설명·이름 태그 최대 길이
+# response_url 은 30분 동안 최대 5번까지 사용할 수 있습니다.
+SLACK_MAX_MESSAGES = int(os.environ.get('SLACK_MAX_MESSAGES', '5'))
+
+def _header_block(title: str) -> Dict[str, Any]:
+    return {
+        "type": "header",
+        "text": {
+            "type": "plain_text",
+            "text": title,
+            "emoji": True
+        }
+    }
+
+def _section_block(text: str) -> Dict[str, Any]:
+    return {
+        "type": "section",
+        "text": {
+            "type": "mrkdwn",
+            "text": text
+        }
+    }
+
+def iter_list_sections(title: str, lines: Iterable[str], limit: int = SECTION_TEXT_LIMIT) -> Iterator[Dict[str, Any]]:
     """
-    리전별 리소스 목록을 받아 Slack 블록을 생성합니다.
-        
-    Args:
-        resources: 리소스 정보를 담은 딕셔너리 (형식: {"리전": {"리소스 유형": [리소스 ID 목록]}})
-                  예: {"ap-northeast-2": {"eips": ["eip-1", "eip-2"], "enis": ["eni-1"]}}
-        response_url: 슬랙 응답 URL (현재 버튼 value에는 사용 안 함)
-        title: 블록 상단에 표시될 타이틀
-        show_delete_button: 삭제 버튼 표시 여부
-        
+    제목 아래 항목을 나열하는 section 블록을 text 길이 제한에 맞춰 나눠서 생성합니다.
+    이어지는 블록의 제목에는 '(계속)'이 붙습니다.
+    """
+    text = f"{title}\n"
+    continued = f"{title} (계속)\n"
+    has_lines = False
+    for line in lines:
+        line = f"{line}\n"[:limit - len(continued)]
+        if has_lines and len(text) + len(line) > limit:
+            yield _section_block(text)
+            text = continued
+        text += line
+        has_lines = True
+    yield _section_block(text)
+
+def _pivot_by_region(resources: Dict[str, Dict[str, List[str]]]) -> Dict[str, Dict[str, List[str]]]:
+    """{"리소스 타입": {"리전": [...]}} 을 {"리전": {"리소스 타입": [...]}} 으로 바꿉니다."""
+    by_region: Dict[str, Dict[str, List[str]]] = {}
+    for resource_type, regions in resources.items():
+        for region, resource_list in regions.items():
+            if resource_list:
+                by_region.setdefault(region, {})[resource_type] = resource_list
+    return by_region
+
+def _sort_by_cost(resources: Dict[str, Dict[str, List[str]]],
+                  costs: Dict[str, Any]) -> Dict[str, Dict[str, List[str]]]:
+    """리전·리소스 타입·리소스 ID를 예상 월 절감액이 큰 순서로 정렬한 {"리전": {"리소스 타입": [...]}} 를 반환합니다."""
+    by_region = _pivot_by_region(resources)
+    ordered: Dict[str, Dict[str, List[str]]] = {}
+    for region in sorted(by_region, key=lambda r: -costs['by_location'].get(r, 0.0)):
+        resource_types = by_region[region]
+        ordered[region] = {}
+        for resource_type in sorted(resource_types, key=lambda t: -costs['by_group'].get(t, {}).get(region, 0.0)):
+            per_resource = costs['by_resource'].get(resource_type, {}).get(region, {})
+            ordered[region][resource_type] = sorted(
+                resource_types[resource_type], key=lambda resource_id: -per_resource.get(resource_id, 0.0)
+            )
+    return ordered
+
+def _escape_mrkdwn(text: str) -> str:
+    """사용자가 정한 문자열(태그, 설명)을 mrkdwn 에 넣기 전에 Slack 제어 문자(&, <, >)를 이스케이프합니다."""
+    return text.replace('&', '&amp;').replace('<', '&lt;').replace('>', '&gt;')
+
+def _cost_suffix(amount: float) -> str:
+    return f" — {format_usd(amount)}/월" if amount else ""
+
+def _record_details(record: Optional[ResourceRecord], now: float) -> str:
+    """레코드에서 목록에 함께 보여줄 짧은 설명(타입, 이름 태그, 설명, 공인 IP, 크기, 경과 일수)을 만듭니다."""
+    if record is None:
+        return ""
+    parts = []
+    if record.interface_type and record.interface_type != 'interface':
+        parts.append(record.interface_type)
+    if record.requester_managed:
+        parts.append("관리형")
+    name = record.tag('Name')
+    if name:
+        parts.append(f"Name={_escape_mrkdwn(name[:DETAIL_TEXT_LIMIT])}")
+    if record.description:
+        parts.append(_escape_mrkdwn(record.description[:DETAIL_TEXT_LIMIT]))
+    if record.public_ip:
+        parts.append(record.public_ip)
+    if record.size:
+        parts.append(f"{record.size:g} GB")
+    if record.created_at:
+        parts.append(f"생성 {int((now - record.created_at) // 86400)}일 전")
+    elif record.attached_at:
+        parts.append(f"연결 {int((now - record.attached_at) // 86400)}일 전")
+    return f" ({' · '.join(parts)})" if parts else ""
+
+def iter_resource_detect_sections(resources: Dict[str, Dict[str, List[str]]],
+                                  costs: Optional[Dict[str, Any]] = None,
+                                  records: Optional[Dict[str, Dict[str, Dict[str, ResourceRecord]]]] = None
+                                  ) -> Iterator[Dict[str, Any]]:
+    """
+    리전별·리소스 유형별 목록 블록을 필요할 때마다 하나씩 생성합니다.
+    costs(estimate_savings 결과)가 주어지면 절감액이 큰 순서로 정렬하고 금액을 함께 표시하며,
+    records 가 주어지면 리소스마다 스캔에서 수집한 메타데이터를 덧붙입니다.
+    """
+    by_region = _sort_by_cost(resources, costs) if costs is not None else _pivot_by_region(resources)
+    records = records or {}
+    now = time.time()
+    for region, resource_types in by_region.items():
+        # 리전 이름 추가
+        location_cost = costs['by_location'].get(region, 0.0) if costs else 0.0
+        yield _section_block(f"*리전: {region}*{_cost_suffix(location_cost)}")
+        # 리소스 유형별로 처리
+        for resource_type, resource_list in resource_types.items():
+            group_cost = costs['by_group'].get(resource_type, {}).get(region, 0.0) if costs else 0.0
+            per_resource = costs['by_resource'].get(resource_type, {}).get(region, {}) if costs else {}
+            location_records = records.get(resource_type, {}).get(region, {})
+            yield from iter_list_sections(
+                f"*{resource_type}*:{_cost_suffix(group_cost)}",
+                (
+                    f"• `{resource_id}`{_record_details(location_records.get(resource_id), now)}"
+                    f"{_cost_suffix(per_resource.get(resource_id, 0.0))}"
+                    for resource_id in resource_list
+                )
+            )
+
+def _cost_summary_block(costs: Dict[str, Any]) -> Dict[str, Any]:
+    return _section_block(f"*예상 월 절감액:* {format_usd(costs['total'])}")
+
+def paginate_blocks(header: List[Dict[str, Any]],
+                    blocks: Iterable[Dict[str, Any]],
+                    footer: Optional[List[Dict[str, Any]]] = None,
+                    continuation_title: Optional[str] = None,
+                    max_messages: int = SLACK_MAX_MESSAGES) -> Tuple[List[List[Dict[str, Any]]], int]:
+    """
+    블록 스트림을 메시지당 50블록 제한에 맞춰 여러 메시지로 나눕니다.
+
+    첫 메시지에는 header 를, 마지막 메시지에는 footer(삭제 버튼 등)를 붙이며,
+    이어지는 메시지는 continuation_title 헤더로 시작합니다.
+    max_messages 를 넘는 블록은 만들지 않고 건너뛴 블록 수만 셉니다.
+
     Returns:
-        Slack Block Kit 형식의 메시지 블록 리스트
+        (메시지별 블록 리스트, 생략된 블록 수) 튜플
     """
-    blocks = [
+    footer = footer or []
+    # 마지막 메시지에 붙일 footer 와 생략 안내 블록 자리를 모든 메시지에서 남겨 둠
+    capacity = MESSAGE_BLOCK_LIMIT - len(footer) - 1
+    messages: List[List[Dict[str, Any]]] = []
+    current = list(header)
+    omitted = 0
+
+    for block in blocks:
+        if len(current) >= capacity:
+            if len(messages) + 1 >= max_messages:
+                omitted += 1
+                continue
+            messages.append(current)
+            current = [_header_block(continuation_title)] if continuation_title else []
+        current.append(block)
+
+    if omitted:
+        current.append(_section_block(
+            f"_Slack 메시지 제한으로 목록 섹션 {omitted}개를 생략했습니다._"
+        ))
+    current.extend(footer)
+    messages.append(current)
+    return messages, omitted
+
+def _delete_button_footer(resources: Dict[str, Dict[str, List[str]]],
+                          button_value: Optional[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    # 버튼 value에는 스캔 ID 또는 resources만 포함
+    if button_value is None:
+        button_value = {"resources": resources}
+    return [
         {
-            "type": "header",
-            "text": {
-                "type": "plain_text",
-                "text": title,
-                "emoji": True
-            }
+            "type": "divider"
         },
         {
-            "type": "divider"
-        }
-    ]
-    
-    # 리전별로 처리
-    empty = True
-    for region, resource_types in resources.items():
-        # 리전에 리소스가 있는지 확인
-        if any(resource_list for resource_list in resource_types.values()):
-            empty = False
-            # 리전 이름 추가
-            blocks.append({
-                "type": "section",
-                "text": {
-                    "type": "mrkdwn",
-                    "text": f"*리전: {region}*"
-                }
-            })
-            
-            # 리소스 유형별로 처리
-            for resource_type, resource_list in resource_types.items():
-                if resource_list:  # 리소스가 있는 경우만 표시
-                    resource_text = f"*{resource_type}*:\n"
-                    for resource_id in resource_list:
-                        resource_text += f"• `{resource_id}`\n"
-                    
-                    blocks.append({
-                        "type": "section",
-                        "text": {
-                            "type": "mrkdwn",
-                            "text": resource_text
-                        }
-                    })
-    
-    # 리소스가 없는 경우
-    if empty:
-        blocks.append({
-            "type": "section",
-            "text": {
-                "type": "mrkdwn",
-                "text": "표시할 리소스가 없습니다."
-            }
-        })
-    # 삭제 버튼 추가
-    elif show_delete_button:
-        blocks.append({
-            "type": "divider"
-        })
-        
-        # 버튼 value에는 resources만 포함
-        button_value = {"resources": resources}
-            
-        blocks.append({
             "type": "actions",
             "elements": [
                 {
@@ -91,69 +197,192 @@ def create_resource_detect_blocks(resources: Dict[str, Dict[str, List[str]]],
                         "emoji": True
                     },
                     "style": "danger",
-                    "value": json.dumps(button_value), # resources만 포함
+                    "value": json.dumps(button_value), # 스캔 ID 또는 resources만 포함
                     "action_id": "delete"
                 }
             ]
-        })
-    
+        }
+    ]
+
+def _delete_confirm_dialog(resources: Dict[str, Dict[str, List[str]]]) -> Dict[str, Any]:
+    total = sum(len(ids) for locations in resources.values() for ids in locations.values())
+    return {
+        "title": {"type": "plain_text", "text": "리소스 삭제"},
+        "text": {
+            "type": "mrkdwn",
+            "text": f"메시지에 표시되지 않은 리소스를 포함해 *총 {total}개*를 삭제합니다.\n전체 목록은 첨부된 파일을 확인하세요."
+        },
+        "confirm": {"type": "plain_text", "text": "삭제"},
+        "deny": {"type": "plain_text", "text": "취소"},
+        "style": "danger"
+    }
+
+@timed('RenderTime', Report='detect')
+def create_resource_detect_messages(resources: Dict[str, Dict[str, List[str]]],
+                                    title: str = "리소스 목록",
+                                    show_delete_button: bool = True,
+                                    button_value: Optional[Dict[str, Any]] = None,
+                                    max_messages: int = SLACK_MAX_MESSAGES,
+                                    costs: Optional[Dict[str, Any]] = None,
+                                    records: Optional[Dict[str, Dict[str, Dict[str, ResourceRecord]]]] = None,
+                                    notice: Optional[str] = None
+                                    ) -> Tuple[List[List[Dict[str, Any]]], int]:
+    """
+    탐지 결과를 Slack 제한(섹션 3000자, 메시지 50블록, 메시지 수)에 맞춰 여러 메시지로 나눕니다.
+    삭제 버튼은 마지막 메시지에만 붙습니다. costs 가 주어지면 예상 월 절감액을 첫 메시지에 표시하고
+    절감액이 큰 리소스부터 나열하므로, 메시지 제한으로 생략되는 것은 절감액이 작은 리소스입니다.
+    notice 가 주어지면 마지막 메시지 끝(삭제 버튼 자리)에 안내 문구를 붙입니다.
+    목록 일부가 생략되면 삭제 버튼에 전체 리소스 수를 알리는 확인 창을 붙입니다.
+
+    Returns:
+        (메시지별 블록 리스트, 메시지 제한으로 생략된 블록 수) 튜플
+    """
+    header = [_header_block(title), {"type": "divider"}]
+    if not _pivot_by_region(resources):
+        # 리소스가 없는 경우
+        return [header + [_section_block("표시할 리소스가 없습니다.")]], 0
+
+    if costs is not None:
+        header.append(_cost_summary_block(costs))
+    footer = _delete_button_footer(resources, button_value) if show_delete_button else []
+    if notice:
+        footer = [{"type": "divider"}, _section_block(notice)]
+    messages, omitted = paginate_blocks(
+        header,
+        iter_resource_detect_sections(resources, costs, records),
+        footer=footer,
+        continuation_title=f"{title} (계속)",
+        max_messages=max_messages
+    )
+    if omitted and show_delete_button and not notice:
+        # 버튼은 메시지에서 생략된 리소스까지 삭제하므로 누르기 전에 전체 개수를 확인받음
+        footer[-1]["elements"][0]["confirm"] = _delete_confirm_dialog(resources)
+    return messages, omitted
+
+@timed('RenderTime', Report='detect')
+def create_resource_detect_blocks(resources: Dict[str, Dict[str, List[str]]],
+                                  response_url: Optional[str] = None,
+                                  title: str = "리소스 목록",
+                                  show_delete_button: bool = True,
+                                  button_value: Optional[Dict[str, Any]] = None,
+                                  costs: Optional[Dict[str, Any]] = None,
+                                  records: Optional[Dict[str, Dict[str, Dict[str, ResourceRecord]]]] = None
+                                  ) -> List[Dict[str, Any]]:
+    """
+    리전별 리소스 목록을 받아 Slack 블록을 생성합니다.
+    섹션은 3000자 단위로 나뉘지만 블록 수는 제한하지 않으므로,
+    전송할 때는 create_resource_detect_messages 를 사용하세요.
+
+    Args:
+        resources: 리소스 정보를 담은 딕셔너리 (형식: {"리소스 유형": {"리전": [리소스 ID 목록]}})
+                  예: {"eips": {"ap-northeast-2": ["eip-1", "eip-2"]}, "enis": {"ap-northeast-2": ["eni-1"]}}
+        response_url: 슬랙 응답 URL (현재 버튼 value에는 사용 안 함)
+        title: 블록 상단에 표시될 타이틀
+        show_delete_button: 삭제 버튼 표시 여부
+        button_value: 삭제 버튼 value 에 담을 딕셔너리 (예: {"scan_id": "..."}).
+                      None이면 resources 를 그대로 담습니다.
+        costs: estimate_savings 결과. 주어지면 예상 월 절감액과 리소스별 금액을 표시합니다.
+        records: 스캔에서 수집한 {"리소스 유형": {"리전": {ID: ResourceRecord}}}. 주어지면 리소스별 메타데이터를 표시합니다.
+
+    Returns:
+        Slack Block Kit 형식의 메시지 블록 리스트
+    """
+    blocks = [_header_block(title), {"type": "divider"}]
+    sections = list(iter_resource_detect_sections(resources, costs, records))
+    # 리소스가 없는 경우
+    if not sections:
+        blocks.append(_section_block("표시할 리소스가 없습니다."))
+        return blocks
+    if costs is not None:
+        blocks.append(_cost_summary_block(costs))
+    blocks.extend(sections)
+    # 삭제 버튼 추가
+    if show_delete_button:
+        blocks.extend(_delete_button_footer(resources, button_value))
     return blocks
 
-def create_resource_delete_blocks(results: Dict[str, str], 
-                                  
-                                title: str = "리소스 목록", 
-                                show_delete_button: bool = True) -> List[Dict[str, Any]]:
-    
+def _record_columns(record: Optional[ResourceRecord]) -> List[str]:
+    if record is None:
+        return [""] * 6
+    created_at = record.created_at or record.attached_at
+    return [
+        time.strftime('%Y-%m-%dT%H:%M:%SZ', time.gmtime(created_at)) if created_at else "",
+        record.interface_type or "",
+        record.tag('Name') or "",
+        (record.description or "").replace("\t", " ").replace("\n", " "),
+        record.public_ip or "",
+        record.vpc_id or ""
+    ]
+
+def format_resource_listing(resources: Dict[str, Dict[str, List[str]]],
+                            costs: Optional[Dict[str, Any]] = None,
+                            records: Optional[Dict[str, Dict[str, Dict[str, ResourceRecord]]]] = None) -> str:
+    """
+    첨부 파일용 전체 리소스 목록 텍스트를 만듭니다 (한 줄에 '리전<TAB>유형<TAB>ID').
+    costs 가 주어지면 절감액이 큰 순서로 정렬하고 '<TAB>월 예상 비용(USD)' 열을,
+    records 가 주어지면 '<TAB>생성(연결) 시각<TAB>타입<TAB>Name 태그<TAB>설명<TAB>공인 IP<TAB>VPC' 열을 붙입니다.
+    """
+    by_region = _sort_by_cost(resources, costs) if costs is not None else _pivot_by_region(resources)
+    lines = []
+    for region, resource_types in by_region.items():
+        for resource_type, resource_list in resource_types.items():
+            per_resource = costs['by_resource'].get(resource_type, {}).get(region, {}) if costs else {}
+            location_records = (records or {}).get(resource_type, {}).get(region, {})
+            for resource_id in resource_list:
+                columns = [region, resource_type, resource_id]
+                if costs is not None:
+                    columns.append(f"{per_resource.get(resource_id, 0.0):.2f}")
+                if records is not None:
+                    columns.extend(_record_columns(location_records.get(resource_id)))
+                lines.append("\t".join(columns) + "\n")
+    return "".join(lines)
+
+def _delete_summary_blocks(results: Dict[str, List[str]]) -> List[Dict[str, Any]]:
     # 삭제 결과 메시지 생성
     total_success = len(results["success"])
     total_failed = len(results["failed"])
-
-    # 슬랙 메시지 블록 구성
-    blocks = [
-        {
-            "type": "header",
-            "text": {
-                "type": "plain_text",
-                "text": "🗑️ 리소스 삭제 결과",
-                "emoji": True
-            }
-        },
-        {
-            "type": "section",
-            "text": {
-                "type": "mrkdwn",
-                "text": f"*성공:* {total_success}개 리소스 삭제됨\n*실패:* {total_failed}개 리소스 삭제 실패"
-            }
-        }
+    return [
+        _header_block("🗑️ 리소스 삭제 결과"),
+        _section_block(f"*성공:* {total_success}개 리소스 삭제됨\n*실패:* {total_failed}개 리소스 삭제 실패")
     ]
 
+def iter_resource_delete_sections(results: Dict[str, List[str]]) -> Iterator[Dict[str, Any]]:
+    """실패·성공 리소스 목록 블록을 필요할 때마다 하나씩 생성합니다."""
     # 실패한 리소스가 있는 경우 상세 정보 표시
-    if total_failed > 0:
-        failed_text = "*실패한 리소스 목록:*\n"
-        for i, resource_id in enumerate(results["failed"], 1):
-            failed_text += f"{i}. `{resource_id}`\n"
-        
-        blocks.append({
-            "type": "section",
-            "text": {
-                "type": "mrkdwn",
-                "text": failed_text
-            }
-        })
-
-    if total_success > 0:
-        success_text = "*성공한 리소스 목록:*\n"
-        for i, resource_id in enumerate(results["success"], 1):
-            success_text += f"{i}. `{resource_id}`\n"
-        
-        blocks.append({
-            "type": "section",
-            "text": {
-                "type": "mrkdwn",
-                "text": success_text
-            }
-        })
-        
-        
+    if results["failed"]:
+        yield from iter_list_sections(
+            "*실패한 리소스 목록:*",
+            (f"{i}. `{resource_id}`" for i, resource_id in enumerate(results["failed"], 1))
+        )
+    if results["success"]:
+        yield from iter_list_sections(
+            "*성공한 리소스 목록:*",
+            (f"{i}. `{resource_id}`" for i, resource_id in enumerate(results["success"], 1))
+        )
 
-    return blocks
+@timed('RenderTime', Report='delete')
+def create_resource_delete_messages(results: Dict[str, List[str]],
+                                    max_messages: int = SLACK_MAX_MESSAGES) -> Tuple[List[List[Dict[str, Any]]], int]:
+    """
+    삭제 결과를 Slack 제한에 맞춰 여러 메시지로 나눕니다.
+
+    Returns:
+        (메시지별 블록 리스트, 메시지 제한으로 생략된 블록 수) 튜플
+    """
+    return paginate_blocks(
+        _delete_summary_blocks(results),
+        iter_resource_delete_sections(results),
+        continuation_title="🗑️ 리소스 삭제 결과 (계속)",
+        max_messages=max_messages
+    )
+
+@timed('RenderTime', Report='delete')
+def create_resource_delete_blocks(results: Dict[str, str],
+
+                                title: str = "리소스 목록",
+                                show_delete_button: bool = True) -> List[Dict[str, Any]]:
+    """
+    삭제 결과를 Slack 블록으로 만듭니다. 목록 섹션은 3000자 단위로 나뉩니다.
+    전송할 때는 블록 수 제한을 지키는 create_resource_delete_messages 를 사용하세요.
+    """
+    return _delete_summary_blocks(results) + list(iter_resource_delete_sections(results))
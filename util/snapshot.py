@@ -0,0 +1,128 @@
+import os
+import threading
+import time
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+
+from util.log import get_logger
+from util.records import ResourceRecord, records_from_json, records_to_json
+from util.storage import KeyValueStore, get_store, is_shared_backend
+
+log = get_logger('snapshot')
+
+# 인벤토리 스냅샷 설정
+# SNAPSHOT_BACKEND: 'none'(기본), 'local', 'sqlite', 's3', 'dynamodb'
+SNAPSHOT_BACKEND = os.environ.get('SNAPSHOT_BACKEND', 'none')
+SNAPSHOT_MAX_AGE = int(os.environ.get('SNAPSHOT_MAX_AGE', '300'))  # 초, 이 시간 안의 스냅샷은 재스캔 없이 사용
+SNAPSHOT_VERIFY_DELETE = os.environ.get('SNAPSHOT_VERIFY_DELETE', 'true').lower() != 'false'
+
+_update_lock = threading.Lock()
+
+def get_snapshot_store() -> Optional[KeyValueStore]:
+    """설정된 스냅샷 저장소를 반환합니다. 비활성화되어 있으면 None."""
+    return get_store(SNAPSHOT_BACKEND, 'snapshots')
+
+def _snapshot_key(location: str, resource_type: str) -> str:
+    return f"{location}/{resource_type}"
+
+def load_snapshot(location: str, resource_type: str) -> Optional[Dict]:
+    """
+    위치(리전 또는 "<계정 ID>/<리전>")·리소스 타입별 스냅샷을 반환합니다.
+
+    Returns:
+        {"ids": [...], "scanned_at": epoch 초[, "records": [레코드 리스트...]]} 또는 None
+        records 는 util.records.records_from_json 으로 복원합니다.
+    """
+    store = get_snapshot_store()
+    if store is None:
+        return None
+    try:
+        return store.get(_snapshot_key(location, resource_type))
+    except Exception as e:
+        log.warning("스냅샷 조회 실패 (%s/%s): %s", location, resource_type, e)
+        return None
+
+def load_fresh_snapshot(location: str, resource_type: str, max_age: int = SNAPSHOT_MAX_AGE) -> Optional[Dict]:
+    """max_age 초 이내에 저장된 스냅샷이 있으면 스냅샷을, 없으면 None 을 반환합니다."""
+    snapshot = load_snapshot(location, resource_type)
+    if snapshot and time.time() - snapshot.get('scanned_at', 0) < max_age:
+        return snapshot
+    return None
+
+def save_snapshot(location: str, resource_type: str, ids: List[str], scanned_at: Optional[float] = None,
+                  records: Optional[Dict[str, ResourceRecord]] = None) -> None:
+    """스캔 결과를 스냅샷으로 저장합니다. 저장 실패는 스캔 결과에 영향을 주지 않습니다."""
+    store = get_snapshot_store()
+    if store is None:
+        return
+    snapshot = {
+        'ids': ids,
+        'scanned_at': scanned_at if scanned_at is not None else time.time()
+    }
+    if records:
+        snapshot['records'] = records_to_json(records)
+    try:
+        store.put(_snapshot_key(location, resource_type), snapshot)
+    except Exception as e:
+        log.warning("스냅샷 저장 실패 (%s/%s): %s", location, resource_type, e)
+
+def verify_against_snapshot(location: str, resource_type: str, ids: Iterable[str],
+                            live_unused: Optional[Callable[[], Iterable[str]]] = None) -> Tuple[List[str], List[str]]:
+    """
+    삭제 요청 ID를 스냅샷과 대조합니다.
+
+    스냅샷 저장소가 비활성화되어 있거나 SNAPSHOT_VERIFY_DELETE=false 이면 모든 ID를 허용합니다.
+    활성화되어 있으면 마지막 스캔에서 미사용으로 확인된 ID만 허용합니다.
+
+    스냅샷이 없거나 조회에 실패했거나, 컨테이너마다 따로 저장되는 백엔드(local, sqlite)라서
+    스냅샷을 믿을 수 없으면 "스냅샷에 없는 ID" 와 구분해 live_unused(현재 미사용 ID 를 다시 탐지하는 함수)로
+    검증합니다. live_unused 가 없거나 실패하면 모든 ID를 거부합니다.
+
+    Returns:
+        (허용된 ID 목록, 거부된 ID 목록)
+    """
+    ids = list(ids)
+    store = get_snapshot_store()
+    if not SNAPSHOT_VERIFY_DELETE or store is None:
+        return ids, []
+
+    snapshot = None
+    if not is_shared_backend(SNAPSHOT_BACKEND):
+        reason = f"SNAPSHOT_BACKEND={SNAPSHOT_BACKEND} 는 컨테이너마다 따로 저장되어 삭제 검증에 사용할 수 없습니다"
+    else:
+        try:
+            snapshot = store.get(_snapshot_key(location, resource_type))
+            reason = "스냅샷이 없습니다"
+        except Exception as e:
+            reason = f"스냅샷 조회 실패: {e}"
+
+    if snapshot is not None:
+        known = set(snapshot['ids'])
+    elif live_unused is None:
+        log.error("%s/%s 삭제 요청을 검증할 수 없어 모두 거부합니다 (%s).", location, resource_type, reason)
+        return [], ids
+    else:
+        log.warning("%s/%s: %s. 현재 미사용 리소스를 다시 조회해 검증합니다.", location, resource_type, reason)
+        try:
+            known = set(live_unused())
+        except Exception as e:
+            log.error("%s/%s 삭제 요청을 검증할 수 없어 모두 거부합니다 (미사용 리소스 조회 실패: %s).",
+                      location, resource_type, e)
+            return [], ids
+    allowed = [resource_id for resource_id in ids if resource_id in known]
+    rejected = [resource_id for resource_id in ids if resource_id not in known]
+    return allowed, rejected
+
+def remove_from_snapshot(location: str, resource_type: str, ids: Iterable[str]) -> None:
+    """삭제된 리소스를 스냅샷에서 제거하여 이후 스냅샷 응답에 다시 나타나지 않도록 합니다."""
+    store = get_snapshot_store()
+    if store is None:
+        return
+    removed = set(ids)
+    with _update_lock:
+        snapshot = load_snapshot(location, resource_type)
+        if not snapshot:
+            return
+        snapshot['ids'] = [resource_id for resource_id in snapshot['ids'] if resource_id not in removed]
+        records = records_from_json(snapshot.get('records'))
+        kept = {resource_id: record for resource_id, record in records.items() if resource_id not in removed}
+        save_snapshot(location, resource_type, snapshot['ids'], snapshot.get('scanned_at'), kept)
@@ -0,0 +1,325 @@
+import json
+import os
+import sqlite3
+import threading
+import time
+import urllib.parse
+from typing import Any, Dict, Optional
+
+from util.throttle import get_error_code
+
+# 저장소 백엔드 공통 설정
+STORE_LOCAL_DIR = os.environ.get('STORE_LOCAL_DIR', '/tmp/delete-unattach')
+STORE_SQLITE_PATH = os.environ.get('STORE_SQLITE_PATH', '/tmp/delete-unattach.db')
+STORE_S3_BUCKET = os.environ.get('STORE_S3_BUCKET', '')
+STORE_S3_PREFIX = os.environ.get('STORE_S3_PREFIX', 'delete-unattach/')
+STORE_DYNAMODB_TABLE = os.environ.get('STORE_DYNAMODB_TABLE', '')
+
+# TTL 이 지정된 값에 함께 저장되는 만료 시각(epoch 초) 키
+EXPIRES_AT_KEY = '_expires_at'
+
+
+class KeyValueStore:
+    """
+    JSON 직렬화 가능한 딕셔너리를 키 단위로 저장하는 저장소 인터페이스.
+
+    백엔드는 _read/_write/delete 와 원자적 생성(put_if_absent)을 구현하며, 키는 네임스페이스가 붙은 문자열입니다.
+    TTL 은 값에 만료 시각을 함께 저장하고 읽을 때 확인하는 방식으로 모든 백엔드에 적용됩니다.
+    """
+
+    def __init__(self, namespace: str):
+        self.namespace = namespace
+
+    def _key(self, key: str) -> str:
+        return f"{self.namespace}/{key}"
+
+    def _read(self, key: str) -> Optional[Dict[str, Any]]:
+        raise NotImplementedError
+
+    def _write(self, key: str, value: Dict[str, Any]) -> None:
+        raise NotImplementedError
+
+    def delete(self, key: str) -> None:
+        raise NotImplementedError
+
+    def put_if_absent(self, key: str, value: Dict[str, Any], ttl: Optional[int] = None) -> bool:
+        """
+        키가 없거나 만료된 경우에만 값을 저장합니다 (여러 호출이 동시에 시도해도 하나만 성공).
+
+        Returns:
+            저장했으면 True, 이미 유효한 값이 있으면 False
+        """
+        raise NotImplementedError
+
+    @staticmethod
+    def _with_ttl(value: Dict[str, Any], ttl: Optional[int]) -> Dict[str, Any]:
+        if ttl is None:
+            return value
+        value = dict(value)
+        value[EXPIRES_AT_KEY] = int(time.time() + ttl)
+        return value
+
+    @staticmethod
+    def _is_expired(value: Dict[str, Any]) -> bool:
+        expires_at = value.get(EXPIRES_AT_KEY)
+        return expires_at is not None and expires_at <= time.time()
+
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        """값을 반환합니다. 없거나 만료되었으면 None."""
+        value = self._read(key)
+        if value is None:
+            return None
+        if self._is_expired(value):
+            self.delete(key)
+            return None
+        value.pop(EXPIRES_AT_KEY, None)
+        return value
+
+    def put(self, key: str, value: Dict[str, Any], ttl: Optional[int] = None) -> None:
+        """값을 저장합니다. ttl(초)이 주어지면 그 이후에는 get 에서 None 을 반환합니다."""
+        self._write(key, self._with_ttl(value, ttl))
+
+
+class LocalJsonStore(KeyValueStore):
+    """키마다 JSON 파일 하나를 쓰는 로컬 백엔드 (Lambda 에서는 /tmp, 같은 컨테이너 안에서만 공유)."""
+
+    def __init__(self, namespace: str, directory: str = STORE_LOCAL_DIR):
+        super().__init__(namespace)
+        self.directory = os.path.join(directory, namespace)
+        os.makedirs(self.directory, exist_ok=True)
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.directory, urllib.parse.quote(key, safe='') + '.json')
+
+    def _read(self, key: str) -> Optional[Dict[str, Any]]:
+        try:
+            with open(self._path(key), 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except FileNotFoundError:
+            return None
+
+    def _write(self, key: str, value: Dict[str, Any]) -> None:
+        path = self._path(key)
+        tmp_path = f"{path}.{threading.get_ident()}.tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(value, f)
+        os.replace(tmp_path, path)
+
+    def put_if_absent(self, key: str, value: Dict[str, Any], ttl: Optional[int] = None) -> bool:
+        path = self._path(key)
+        tmp_path = f"{path}.{threading.get_ident()}.tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(self._with_ttl(value, ttl), f)
+        try:
+            for _ in range(2):
+                try:
+                    # 하드 링크 생성은 대상이 이미 있으면 실패하므로 원자적 생성으로 사용
+                    os.link(tmp_path, path)
+                    return True
+                except FileExistsError:
+                    # 만료된 값이면 get 이 지우므로 한 번 더 시도
+                    if self.get(key) is not None:
+                        return False
+            return False
+        finally:
+            os.remove(tmp_path)
+
+    def delete(self, key: str) -> None:
+        try:
+            os.remove(self._path(key))
+        except FileNotFoundError:
+            pass
+
+
+class SqliteStore(KeyValueStore):
+    """단일 SQLite 파일에 저장하는 로컬 백엔드."""
+
+    def __init__(self, namespace: str, path: str = STORE_SQLITE_PATH):
+        super().__init__(namespace)
+        self.path = path
+        self.lock = threading.Lock()
+        with self.lock, self._connect() as conn:
+            conn.execute('CREATE TABLE IF NOT EXISTS kv (key TEXT PRIMARY KEY, value TEXT NOT NULL)')
+
+    def _connect(self) -> sqlite3.Connection:
+        return sqlite3.connect(self.path, timeout=10)
+
+    def _read(self, key: str) -> Optional[Dict[str, Any]]:
+        with self.lock, self._connect() as conn:
+            row = conn.execute('SELECT value FROM kv WHERE key = ?', (self._key(key),)).fetchone()
+        return json.loads(row[0]) if row else None
+
+    def _write(self, key: str, value: Dict[str, Any]) -> None:
+        with self.lock, self._connect() as conn:
+            conn.execute(
+                'INSERT OR REPLACE INTO kv (key, value) VALUES (?, ?)',
+                (self._key(key), json.dumps(value))
+            )
+
+    def put_if_absent(self, key: str, value: Dict[str, Any], ttl: Optional[int] = None) -> bool:
+        with self.lock, self._connect() as conn:
+            # 다른 프로세스와의 경합을 막기 위해 쓰기 잠금을 먼저 잡음
+            conn.execute('BEGIN IMMEDIATE')
+            row = conn.execute('SELECT value FROM kv WHERE key = ?', (self._key(key),)).fetchone()
+            if row and not self._is_expired(json.loads(row[0])):
+                return False
+            conn.execute(
+                'INSERT OR REPLACE INTO kv (key, value) VALUES (?, ?)',
+                (self._key(key), json.dumps(self._with_ttl(value, ttl)))
+            )
+            return True
+
+    def delete(self, key: str) -> None:
+        with self.lock, self._connect() as conn:
+            conn.execute('DELETE FROM kv WHERE key = ?', (self._key(key),))
+
+
+class S3Store(KeyValueStore):
+    """
+    S3 객체 하나에 키 하나를 저장하는 백엔드 (여러 Lambda 컨테이너 간 공유).
+    만료된 객체 정리는 버킷의 수명 주기 규칙으로 설정하세요.
+    """
+
+    def __init__(self, namespace: str, bucket: str = STORE_S3_BUCKET, prefix: str = STORE_S3_PREFIX):
+        super().__init__(namespace)
+        if not bucket:
+            raise ValueError("STORE_S3_BUCKET 이 설정되지 않았습니다.")
+        self.bucket = bucket
+        self.prefix = prefix
+
+    def _client(self):
+        from util.aws import get_client
+        return get_client('s3')
+
+    def _object_key(self, key: str) -> str:
+        return f"{self.prefix}{self._key(key)}.json"
+
+    def _read(self, key: str) -> Optional[Dict[str, Any]]:
+        client = self._client()
+        try:
+            response = client.get_object(Bucket=self.bucket, Key=self._object_key(key))
+        except client.exceptions.NoSuchKey:
+            return None
+        return json.loads(response['Body'].read())
+
+    def _write(self, key: str, value: Dict[str, Any]) -> None:
+        self._client().put_object(
+            Bucket=self.bucket,
+            Key=self._object_key(key),
+            Body=json.dumps(value).encode('utf-8'),
+            ContentType='application/json'
+        )
+
+    def put_if_absent(self, key: str, value: Dict[str, Any], ttl: Optional[int] = None) -> bool:
+        for _ in range(2):
+            try:
+                # S3 조건부 쓰기: 같은 키의 객체가 있으면 PreconditionFailed
+                self._client().put_object(
+                    Bucket=self.bucket,
+                    Key=self._object_key(key),
+                    Body=json.dumps(self._with_ttl(value, ttl)).encode('utf-8'),
+                    ContentType='application/json',
+                    IfNoneMatch='*'
+                )
+                return True
+            except Exception as e:
+                if get_error_code(e) not in ('PreconditionFailed', 'ConditionalRequestConflict'):
+                    raise
+                # 만료된 값이면 get 이 지우므로 한 번 더 시도
+                if self.get(key) is not None:
+                    return False
+        return False
+
+    def delete(self, key: str) -> None:
+        self._client().delete_object(Bucket=self.bucket, Key=self._object_key(key))
+
+
+class DynamoDBStore(KeyValueStore):
+    """
+    파티션 키 'pk'(문자열) 하나를 가진 DynamoDB 테이블에 저장하는 백엔드.
+    TTL 이 있는 값은 'expires_at' 속성도 기록하므로 테이블 TTL 속성으로 지정하면 자동 삭제됩니다.
+    """
+
+    def __init__(self, namespace: str, table: str = STORE_DYNAMODB_TABLE):
+        super().__init__(namespace)
+        if not table:
+            raise ValueError("STORE_DYNAMODB_TABLE 이 설정되지 않았습니다.")
+        self.table = table
+
+    def _client(self):
+        from util.aws import get_client
+        return get_client('dynamodb')
+
+    def _read(self, key: str) -> Optional[Dict[str, Any]]:
+        response = self._client().get_item(
+            TableName=self.table,
+            Key={'pk': {'S': self._key(key)}},
+            ConsistentRead=True
+        )
+        item = response.get('Item')
+        return json.loads(item['value']['S']) if item else None
+
+    def _item(self, key: str, value: Dict[str, Any]) -> Dict[str, Any]:
+        item = {'pk': {'S': self._key(key)}, 'value': {'S': json.dumps(value)}}
+        if EXPIRES_AT_KEY in value:
+            item['expires_at'] = {'N': str(value[EXPIRES_AT_KEY])}
+        return item
+
+    def _write(self, key: str, value: Dict[str, Any]) -> None:
+        self._client().put_item(TableName=self.table, Item=self._item(key, value))
+
+    def put_if_absent(self, key: str, value: Dict[str, Any], ttl: Optional[int] = None) -> bool:
+        try:
+            self._client().put_item(
+                TableName=self.table,
+                Item=self._item(key, self._with_ttl(value, ttl)),
+                # 항목이 없거나 TTL 이 지났지만 아직 테이블 TTL 로 지워지지 않은 경우만 저장
+                ConditionExpression='attribute_not_exists(pk) OR expires_at <= :now',
+                ExpressionAttributeValues={':now': {'N': str(int(time.time()))}}
+            )
+            return True
+        except Exception as e:
+            if get_error_code(e) == 'ConditionalCheckFailedException':
+                return False
+            raise
+
+    def delete(self, key: str) -> None:
+        self._client().delete_item(TableName=self.table, Key={'pk': {'S': self._key(key)}})
+
+
+BACKENDS = {
+    'local': LocalJsonStore,
+    'json': LocalJsonStore,
+    'sqlite': SqliteStore,
+    's3': S3Store,
+    'dynamodb': DynamoDBStore,
+}
+
+# 여러 Lambda 컨테이너가 같은 값을 볼 수 있는 백엔드 (local/sqlite 는 컨테이너의 /tmp 에만 저장됨)
+SHARED_BACKENDS = {'s3', 'dynamodb'}
+
+def is_shared_backend(backend: str) -> bool:
+    """백엔드가 여러 Lambda 컨테이너 간에 공유되는지 여부."""
+    return (backend or '').lower() in SHARED_BACKENDS
+
+_stores: Dict[tuple, KeyValueStore] = {}
+_stores_lock = threading.Lock()
+
+def get_store(backend: str, namespace: str) -> Optional[KeyValueStore]:
+    """
+    백엔드 이름과 네임스페이스로 저장소를 반환합니다 (컨테이너 수명 동안 캐시).
+
+    Args:
+        backend: 'local'(또는 'json'), 'sqlite', 's3', 'dynamodb' 중 하나. 비어 있거나 'none' 이면 None
+        namespace: 키 네임스페이스 (예: 'snapshots')
+    """
+    backend = (backend or '').lower()
+    if backend in ('', 'none'):
+        return None
+    if backend not in BACKENDS:
+        raise ValueError(f"지원되지 않는 저장소 백엔드: {backend}")
+    with _stores_lock:
+        key = (backend, namespace)
+        if key not in _stores:
+            _stores[key] = BACKENDS[backend](namespace)
+        return _stores[key]
@@ -0,0 +1,209 @@
+import os
+import random
+import threading
+import time
+import weakref
+from typing import Any, Dict, Iterator, Tuple
+
+from util.log import get_logger
+from util.metrics import count
+
+log = get_logger('throttle')
+
+# 재시도 대상 오류 코드
+THROTTLE_ERROR_CODES = {
+    'RequestLimitExceeded',
+    'Throttling',
+    'ThrottlingException',
+    'RequestThrottled',
+    'RequestThrottledException',
+    'TooManyRequestsException',
+}
+TRANSIENT_ERROR_CODES = {
+    'InternalError',
+    'InternalFailure',
+    'ServiceUnavailable',
+    'Unavailable',
+}
+
+# EC2 API 토큰 버킷 기본값 (EC2 의 계정·리전별 버킷 크기 / 초당 보충량 기준)
+DESCRIBE_RATE = float(os.environ.get('EC2_DESCRIBE_RATE', '20'))    # describe_* 초당 호출 수
+DESCRIBE_BURST = float(os.environ.get('EC2_DESCRIBE_BURST', '100'))
+MUTATE_RATE = float(os.environ.get('EC2_MUTATE_RATE', '5'))         # 변경 API 초당 호출 수
+MUTATE_BURST = float(os.environ.get('EC2_MUTATE_BURST', '50'))
+
+MAX_RETRIES = int(os.environ.get('EC2_MAX_RETRIES', '6'))
+BACKOFF_BASE = float(os.environ.get('EC2_BACKOFF_BASE', '0.2'))     # 초
+BACKOFF_CAP = float(os.environ.get('EC2_BACKOFF_CAP', '10'))        # 초
+
+
+class TokenBucket:
+    """
+    적응형 토큰 버킷.
+
+    스로틀링이 발생하면 보충 속도를 절반으로 줄이고(multiplicative decrease),
+    성공할 때마다 조금씩 원래 속도까지 회복합니다(additive increase).
+    """
+
+    def __init__(self, rate: float, capacity: float):
+        self.max_rate = rate
+        self.min_rate = max(rate / 32, 0.1)
+        self.rate = rate
+        self.capacity = capacity
+        self.tokens = capacity
+        self.updated = time.monotonic()
+        self.lock = threading.Lock()
+
+    def _refill(self, now: float) -> None:
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+
+    def acquire(self) -> None:
+        """토큰 하나를 얻을 때까지 대기합니다."""
+        while True:
+            with self.lock:
+                self._refill(time.monotonic())
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    return
+                wait = (1 - self.tokens) / self.rate
+            time.sleep(wait)
+
+    def on_throttle(self) -> None:
+        with self.lock:
+            self.rate = max(self.min_rate, self.rate / 2)
+            # 남은 버스트도 비워서 다른 스레드가 즉시 재시도하지 않도록 함
+            self.tokens = min(self.tokens, 0)
+
+    def on_success(self) -> None:
+        if self.rate >= self.max_rate:
+            return
+        with self.lock:
+            self.rate = min(self.max_rate, self.rate + self.max_rate / 20)
+
+
+_buckets: Dict[Tuple[str, str, str], TokenBucket] = {}
+_buckets_lock = threading.Lock()
+
+# 클라이언트별 스로틀링 범위 (교차 계정 클라이언트는 계정 ID)
+# EC2 API 한도는 계정·리전 단위이므로 계정마다 별도의 버킷을 사용합니다.
+_client_scopes: 'weakref.WeakKeyDictionary[Any, str]' = weakref.WeakKeyDictionary()
+
+def register_client_scope(client, scope: str) -> None:
+    """클라이언트가 사용할 토큰 버킷 범위(계정 ID 등)를 등록합니다."""
+    _client_scopes[client] = scope
+
+def get_bucket(region: str, api_name: str, scope: str = '') -> TokenBucket:
+    """범위·리전·API별 토큰 버킷을 반환합니다. 없으면 생성합니다."""
+    key = (scope, region, api_name)
+    with _buckets_lock:
+        bucket = _buckets.get(key)
+        if bucket is None:
+            if api_name.startswith('describe_'):
+                bucket = TokenBucket(DESCRIBE_RATE, DESCRIBE_BURST)
+            else:
+                bucket = TokenBucket(MUTATE_RATE, MUTATE_BURST)
+            _buckets[key] = bucket
+        return bucket
+
+def get_error_code(error: Exception) -> str:
+    """botocore ClientError 형태의 예외에서 오류 코드를 추출합니다."""
+    response = getattr(error, 'response', None)
+    if isinstance(response, dict):
+        return response.get('Error', {}).get('Code', '') or ''
+    return ''
+
+def is_throttle_error(error: Exception) -> bool:
+    return get_error_code(error) in THROTTLE_ERROR_CODES
+
+def is_retryable_error(error: Exception) -> bool:
+    code = get_error_code(error)
+    return code in THROTTLE_ERROR_CODES or code in TRANSIENT_ERROR_CODES
+
+def backoff_delay(attempt: int) -> float:
+    """지수 백오프 + full jitter 대기 시간(초)을 계산합니다."""
+    return random.uniform(0, min(BACKOFF_CAP, BACKOFF_BASE * (2 ** attempt)))
+
+def _handle_retry(bucket: TokenBucket, region: str, api_name: str, error: Exception, attempt: int) -> None:
+    """재시도 가능한 오류면 대기하고, 아니면 예외를 다시 발생시킵니다."""
+    if is_throttle_error(error):
+        count('Throttles', Region=region)
+    if not is_retryable_error(error) or attempt >= MAX_RETRIES:
+        raise error
+    if is_throttle_error(error):
+        bucket.on_throttle()
+    delay = backoff_delay(attempt)
+    log.info("⏳ %s %s 재시도 %s/%s (%s, %.2fs 대기)", region, api_name, attempt + 1, MAX_RETRIES, get_error_code(error), delay)
+    time.sleep(delay)
+
+def call_with_retry(client, api_name: str, **kwargs) -> Dict[str, Any]:
+    """
+    리전·API별 토큰 버킷을 거쳐 AWS API를 호출하고, 스로틀링/일시적 오류는 재시도합니다.
+
+    Args:
+        client: boto3 클라이언트
+        api_name: 호출할 메서드 이름 (예: 'release_address')
+        **kwargs: API 파라미터
+
+    Returns:
+        API 응답 딕셔너리
+
+    Raises:
+        Exception: 재시도 불가능한 오류이거나 재시도 횟수를 초과한 경우
+    """
+    region = client.meta.region_name
+    bucket = get_bucket(region, api_name, _client_scopes.get(client, ''))
+    method = getattr(client, api_name)
+    attempt = 0
+    while True:
+        bucket.acquire()
+        count('ApiCalls', Region=region)
+        try:
+            response = method(**kwargs)
+            bucket.on_success()
+            return response
+        except Exception as e:
+            _handle_retry(bucket, region, api_name, e, attempt)
+            attempt += 1
+
+def paginate_with_retry(client, api_name: str, **kwargs) -> Iterator[Dict[str, Any]]:
+    """
+    boto3 paginator 를 페이지 단위로 순회하며 페이지마다 토큰을 소비합니다.
+
+    스로틀링이 발생하면 마지막으로 받은 NextToken 부터 다시 이어서 조회하므로
+    이미 yield 한 페이지를 중복으로 반환하지 않습니다.
+
+    Args:
+        client: boto3 클라이언트
+        api_name: 페이지네이션할 메서드 이름 (예: 'describe_network_interfaces')
+        **kwargs: paginate() 파라미터 (PaginationConfig 포함)
+
+    Yields:
+        응답 페이지 딕셔너리
+    """
+    region = client.meta.region_name
+    bucket = get_bucket(region, api_name, _client_scopes.get(client, ''))
+    paginator = client.get_paginator(api_name)
+    config = dict(kwargs.pop('PaginationConfig', None) or {})
+    attempt = 0
+    while True:
+        pages = iter(paginator.paginate(PaginationConfig=config, **kwargs))
+        try:
+            while True:
+                bucket.acquire()
+                count('ApiCalls', Region=region)
+                try:
+                    page = next(pages)
+                except StopIteration:
+                    return
+                bucket.on_success()
+                attempt = 0
+                # EC2 는 NextToken, ELBv2 는 NextMarker 로 다음 페이지를 알려줌
+                next_token = page.get('NextToken') or page.get('NextMarker')
+                yield page
+                if not next_token:
+                    return
+                config['StartingToken'] = next_token
+        except Exception as e:
+            _handle_retry(bucket, region, api_name, e, attempt)
+            attempt += 1